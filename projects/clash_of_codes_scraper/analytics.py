@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Precomputed contest analytics for the Clash of Codes scraper.
+
+Each saved contest is turned into participant x problem matrices (status:
+none / tried / solved, and first accepted time), and every statistic the
+frontend charts is computed from them with NumPy in one pass:
+
+    per problem   solved and tried counts, solve and acceptance rate,
+                  first solve, mean and percentile solve times
+    per contest   how many participants solved 0..n problems, and solves
+                  over time (per ANALYTICS_BIN_SECONDS bin), total and
+                  per problem
+
+They are written to ANALYTICS_DIR/contest_<id>.json, plus group.json with
+the same charts summed over every contest and pooled by problem letter.
+A contest's file is only recomputed when its snapshot was rewritten
+(manifest savedAt); group.json is built from the per-contest files.
+
+Usage:
+    python analytics.py              # bring the stats files up to date
+    python analytics.py --full       # recompute every contest
+"""
+
+import sys
+import json
+import time
+import warnings
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+import config
+import utils
+from contest_io import atomic_write
+from manifest import get_manifest
+from ratings import contest_order
+from utils import logger
+
+ANALYTICS_VERSION = 1
+
+# Cell values of the status matrix
+NONE = 0
+TRIED = 1
+SOLVED = 2
+
+PERCENTILES = (25, 50, 75, 90)
+
+
+class ContestMatrices:
+    """
+    One contest as arrays: rows are participants (best rank first), columns
+    are problems (in label order).
+    
+    status[i, j] is NONE, TRIED or SOLVED; time[i, j] is the first accepted
+    time in seconds, or -1 when the problem was not solved.
+    """
+    
+    def __init__(self, contest_data: Dict[str, Any]):
+        participants = contest_data.get('participants', {})
+        # Unranked (0) rows go last; ties keep their file order
+        self.handles: List[str] = sorted(
+            participants, key=lambda handle: participants[handle].get('rank', 0) or sys.maxsize)
+        self.ranks = np.array([participants[handle].get('rank', 0) for handle in self.handles], dtype=np.int32)
+        
+        rows = []
+        labels = []
+        codes = []
+        times = []
+        for row, handle in enumerate(self.handles):
+            for event in participants[handle].get('solveTimeline', []):
+                rows.append(row)
+                labels.append(event['problem'])
+                solved = event.get('status') == 'AC'
+                codes.append(SOLVED if solved else TRIED)
+                times.append((event.get('time') or 0) if solved else np.iinfo(np.int32).max)
+        
+        self.problems: List[str] = sorted(set(labels))
+        column = {problem: position for position, problem in enumerate(self.problems)}
+        cells = (np.array(rows, dtype=np.intp), np.array([column[label] for label in labels], dtype=np.intp))
+        shape = (len(self.handles), len(self.problems))
+        
+        # Several events per cell (per-attempt timelines): best status, first accepted time
+        self.status = np.zeros(shape, dtype=np.int8)
+        np.maximum.at(self.status, cells, np.array(codes, dtype=np.int8))
+        self.time = np.full(shape, np.iinfo(np.int32).max, dtype=np.int32)
+        np.minimum.at(self.time, cells, np.array(times, dtype=np.int32))
+        self.time[self.status != SOLVED] = -1
+
+
+def _number(value) -> Optional[float]:
+    """A float rounded for JSON, or None for NaN."""
+    return None if np.isnan(value) else round(float(value), 1)
+
+
+def _histogram(groups: np.ndarray, bins: np.ndarray, group_count: int, length: int) -> np.ndarray:
+    """Counts of (group, bin) pairs as a group_count x length matrix, in one bincount."""
+    return np.bincount(groups * length + bins, minlength=group_count * length).reshape(group_count, length)
+
+
+def contest_stats(contest_data: Dict[str, Any], bin_seconds: int = None) -> Dict[str, Any]:
+    """
+    Every precomputed statistic of one contest.
+    
+    Args:
+        contest_data: Contest in the normalized JSON shape
+        bin_seconds: Width of the solves-over-time bins
+    
+    Returns:
+        The contest's stats file contents (without savedAt)
+    """
+    bin_seconds = bin_seconds or config.ANALYTICS_BIN_SECONDS
+    matrices = ContestMatrices(contest_data)
+    n, problem_count = matrices.status.shape
+    
+    solved = matrices.status == SOLVED
+    solved_counts = solved.sum(axis=0)
+    tried_counts = (matrices.status != NONE).sum(axis=0)
+    times = np.where(solved, matrices.time, np.nan)
+    with warnings.catch_warnings():
+        # Problems nobody solved give NaN, which is what we want
+        warnings.simplefilter('ignore', RuntimeWarning)
+        means = np.nanmean(times, axis=0) if n else np.full(problem_count, np.nan)
+        percentiles = (np.nanpercentile(times, PERCENTILES, axis=0) if n
+                       else np.full((len(PERCENTILES), problem_count), np.nan))
+        solve_rates = solved_counts / n if n else np.zeros(problem_count)
+        acceptance_rates = np.where(tried_counts > 0, solved_counts / np.maximum(tried_counts, 1), np.nan)
+    # Rows are in rank order, so argmin breaks first-solve ties by rank
+    first_rows = np.argmin(np.where(solved, matrices.time, np.iinfo(np.int32).max), axis=0) if n else []
+    
+    solver_rows, solver_columns = np.nonzero(solved)
+    solve_times = matrices.time[solver_rows, solver_columns]
+    bins = solve_times // bin_seconds
+    length = int(bins.max()) + 1 if len(bins) else 0
+    by_problem = _histogram(solver_columns, bins, problem_count, length)
+    total = by_problem.sum(axis=0)
+    
+    problems = []
+    for column, problem in enumerate(matrices.problems):
+        first = None
+        if solved_counts[column]:
+            row = first_rows[column]
+            first = {'handle': matrices.handles[row], 'time': int(matrices.time[row, column])}
+        problems.append({
+            'problem': problem,
+            'solved': int(solved_counts[column]),
+            'tried': int(tried_counts[column]),
+            'solveRate': round(float(solve_rates[column]), 4),
+            'acceptanceRate': None if np.isnan(acceptance_rates[column]) else round(float(acceptance_rates[column]), 4),
+            'firstSolve': first,
+            'meanTime': _number(means[column]),
+            'percentiles': {f"p{q}": _number(percentiles[i, column]) for i, q in enumerate(PERCENTILES)},
+        })
+    
+    return {
+        'version': ANALYTICS_VERSION,
+        'contestId': str(contest_data.get('contestId')),
+        'title': contest_data.get('title'),
+        'participants': n,
+        'binSeconds': bin_seconds,
+        'problems': problems,
+        'solvedDistribution': np.bincount(solved.sum(axis=1), minlength=problem_count + 1).tolist(),
+        'solveTimes': {
+            'solves': len(solve_times),
+            'meanTime': _number(solve_times.mean()) if len(solve_times) else None,
+            'percentiles': {f"p{q}": _number(value) for q, value in zip(
+                PERCENTILES, np.percentile(solve_times, PERCENTILES) if len(solve_times)
+                else [np.nan] * len(PERCENTILES))},
+        },
+        'solvesOverTime': {
+            'total': total.tolist(),
+            'cumulative': np.cumsum(total).tolist(),
+            'byProblem': {problem: by_problem[column].tolist() for column, problem in enumerate(matrices.problems)},
+        },
+    }
+
+
+def _padded_sum(histograms: List[List[int]]) -> np.ndarray:
+    length = max((len(histogram) for histogram in histograms), default=0)
+    total = np.zeros(length, dtype=np.int64)
+    for histogram in histograms:
+        total[:len(histogram)] += np.asarray(histogram, dtype=np.int64)
+    return total
+
+
+def group_stats(contests: List[Dict[str, Any]], bin_seconds: int = None) -> Dict[str, Any]:
+    """
+    Group-wide stats from per-contest stats (contest_stats() results).
+    
+    Problems are pooled by label across contests. Pooled solve-time
+    percentiles come from the summed histogram, so they are bin upper
+    edges (resolution binSeconds).
+    """
+    bin_seconds = bin_seconds or config.ANALYTICS_BIN_SECONDS
+    labels: Dict[str, np.ndarray] = {}
+    summaries = []
+    for stats in contests:
+        for problem in stats['problems']:
+            counts = labels.setdefault(problem['problem'], np.zeros(3, dtype=np.int64))
+            counts += (problem['solved'], problem['tried'], stats['participants'])
+        hardest = min(stats['problems'], key=lambda problem: (problem['solveRate'], problem['problem']), default=None)
+        summaries.append({
+            'contestId': stats['contestId'],
+            'title': stats['title'],
+            'participants': stats['participants'],
+            'solves': stats['solveTimes']['solves'],
+            'averageSolved': (round(stats['solveTimes']['solves'] / stats['participants'], 2)
+                              if stats['participants'] else None),
+            'hardestProblem': hardest['problem'] if hardest else None,
+        })
+    
+    total = _padded_sum([stats['solvesOverTime']['total'] for stats in contests])
+    cumulative = np.cumsum(total)
+    percentiles = {}
+    for q in PERCENTILES:
+        if len(cumulative) and cumulative[-1]:
+            position = int(np.searchsorted(cumulative, cumulative[-1] * q / 100))
+            percentiles[f"p{q}"] = (position + 1) * bin_seconds
+        else:
+            percentiles[f"p{q}"] = None
+    
+    return {
+        'version': ANALYTICS_VERSION,
+        'generatedAt': round(time.time(), 3),
+        'contests': len(contests),
+        'participantEntries': sum(stats['participants'] for stats in contests),
+        'binSeconds': bin_seconds,
+        'contestSummaries': summaries,
+        'problems': {
+            label: {'solved': int(solved), 'tried': int(tried), 'participants': int(participants),
+                    'solveRate': round(solved / participants, 4) if participants else 0.0}
+            for label, (solved, tried, participants) in sorted(labels.items())
+        },
+        'solveTimes': {'solves': int(cumulative[-1]) if len(cumulative) else 0, 'percentiles': percentiles},
+        'solvesOverTime': {'total': total.tolist(), 'cumulative': cumulative.tolist()},
+    }
+
+
+def stats_path(contest_id: str, analytics_dir: str = None) -> Path:
+    return Path(analytics_dir or config.ANALYTICS_DIR) / f"contest_{contest_id}.json"
+
+
+def _load_stats(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path: Path, data: Dict[str, Any]):
+    atomic_write(path, json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def rebuild(output_dir: str = None, analytics_dir: str = None, full: bool = False) -> Dict[str, int]:
+    """
+    Bring the per-contest stats files and group.json up to date.
+    
+    A contest's stats are reused while their savedAt matches the manifest
+    (and the format and bin width are unchanged); the others are loaded
+    and recomputed.
+    
+    Returns:
+        {'computed': contests recomputed, 'reused': stats files kept}
+    """
+    output_dir = output_dir or config.OUTPUT_DIR
+    analytics_dir = analytics_dir or config.ANALYTICS_DIR
+    manifest = get_manifest(output_dir)
+    saved = sorted(utils.load_existing_contests(output_dir), key=contest_order)
+    
+    contests = []
+    computed = 0
+    for contest_id in saved:
+        saved_at = (manifest.get(contest_id) or {}).get('savedAt')
+        path = stats_path(contest_id, analytics_dir)
+        stats = None if full else _load_stats(path)
+        if (stats is None or stats.get('version') != ANALYTICS_VERSION or saved_at is None
+                or stats.get('savedAt') != saved_at or stats.get('binSeconds') != config.ANALYTICS_BIN_SECONDS):
+            contest_data = utils.load_contest(contest_id, output_dir)
+            if contest_data is None:
+                continue
+            stats = dict(contest_stats(contest_data), savedAt=saved_at)
+            _write_json(path, stats)
+            computed += 1
+        contests.append(stats)
+    
+    _write_json(Path(analytics_dir) / 'group.json', group_stats(contests))
+    logger.info(f"✓ Analytics: {computed} contests computed, {len(contests) - computed} reused")
+    return {'computed': computed, 'reused': len(contests) - computed}
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Precompute contest and group analytics")
+    parser.add_argument('--full', action='store_true', help="Recompute every contest's stats")
+    args = parser.parse_args(argv)
+    utils.setup_logging()
+    rebuild(full=args.full)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for the in-memory contest model (models.py).
+
+Builds a synthetic group history (a shared pool of handles, per-contest
+fields, solve timelines with tags and profile fields), encodes every
+contest as the scraper would write it, then loads the whole history twice
+and reports traced memory (tracemalloc) after each load:
+
+    json    json.loads of every contest file, as the aggregation jobs do today
+    models  Contest.from_json of every file, one file's dicts alive at a time
+
+Every contest is also converted back with to_json() and must encode to
+the same bytes as the original file.
+
+Usage:
+    python benchmark_models.py
+    python benchmark_models.py --contests 500 --participants 400 --handles 5000
+"""
+
+import sys
+import gc
+import json
+import time
+import random
+import argparse
+import tracemalloc
+from typing import List
+
+import contest_io
+from models import Contest
+
+TAGS = ('math', 'greedy', 'dp', 'implementation', 'graphs', 'strings', 'brute force', 'sortings')
+TITLES = ('newbie', 'pupil', 'specialist', 'expert', 'candidate master', 'master')
+
+
+def synthetic_group(contests: int, participants: int, handles: int, problems: int,
+                    seed: int = 0) -> List[bytes]:
+    """Every synthetic contest encoded as a JSON contest file."""
+    rng = random.Random(seed)
+    pool = [f"user_{i:06d}" for i in range(handles)]
+    blobs = []
+    for contest in range(contests):
+        labels = [chr(ord('A') + i) for i in range(problems)]
+        tags = {label: sorted(rng.sample(TAGS, rng.randint(0, 3))) for label in labels}
+        data = {'contestId': str(600000 + contest), 'title': f"Weekly Contest {contest + 1}", 'participants': {}}
+        for rank, handle in enumerate(rng.sample(pool, min(participants, handles)), 1):
+            timeline = []
+            for label in labels:
+                roll = rng.random()
+                if roll < 0.5:
+                    timeline.append({'problem': label, 'time': rng.randrange(60, 7200),
+                                     'status': 'AC', 'tags': list(tags[label])})
+                elif roll < 0.65:
+                    timeline.append({'problem': label, 'time': 0, 'status': 'WA', 'tags': list(tags[label])})
+            participant = {
+                'rank': rank,
+                'solved': sum(event['status'] == 'AC' for event in timeline),
+                'attempted': len(timeline),
+                'solveTimeline': timeline,
+            }
+            if rng.random() < 0.8:
+                participant['rating'] = rng.randrange(800, 2600)
+                participant['rankTitle'] = rng.choice(TITLES)
+                participant['avatar'] = "https://userpic.codeforces.org/no-title.jpg"
+            data['participants'][handle] = participant
+        data['type'] = 'weekly'
+        blobs.append(contest_io.encode_json(data))
+    return blobs
+
+
+def traced(load):
+    """(result, traced bytes still allocated after load(), seconds)."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = load()
+    seconds = time.perf_counter() - start
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-memory contest model benchmarks")
+    parser.add_argument('--contests', type=int, default=200)
+    parser.add_argument('--participants', type=int, default=300, help="Participants per contest")
+    parser.add_argument('--handles', type=int, default=3000, help="Size of the handle pool")
+    parser.add_argument('--problems', type=int, default=7, help="Problems per contest")
+    args = parser.parse_args()
+    
+    blobs = synthetic_group(args.contests, args.participants, args.handles, args.problems)
+    events = sum(blob.count(b'"problem"') for blob in blobs)
+    print(f"{len(blobs)} contests, {args.contests * min(args.participants, args.handles)} participant entries, "
+          f"{events} solve events ({sum(map(len, blobs)) / 1e6:.1f} MB of JSON)\n")
+    
+    dicts, dict_bytes, dict_seconds = traced(lambda: [json.loads(blob) for blob in blobs])
+    del dicts
+    models, model_bytes, model_seconds = traced(lambda: [Contest.from_json(json.loads(blob)) for blob in blobs])
+    
+    print(f"{'json':<8} {dict_bytes / 1e6:>9.1f} MB  {dict_bytes / events:>7.1f} B/event  {dict_seconds:>7.2f}s")
+    print(f"{'models':<8} {model_bytes / 1e6:>9.1f} MB  {model_bytes / events:>7.1f} B/event  {model_seconds:>7.2f}s  "
+          f"({dict_bytes / model_bytes:.1f}x smaller)")
+    
+    mismatches = sum(1 for contest, blob in zip(models, blobs) if contest_io.encode_json(contest.to_json()) != blob)
+    if mismatches:
+        print(f"\n✗ {mismatches} contests did not round-trip to the same JSON")
+        return 1
+    print("\n✓ Every contest round-trips to identical JSON")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
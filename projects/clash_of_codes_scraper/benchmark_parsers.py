@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Offline parser micro-benchmarks for the Clash of Codes scraper.
+
+Times and memory-profiles parse_standings and extract_contest_list on the
+committed debug HTML fixtures and on synthetic standings pages, then
+compares the results with a stored baseline.
+
+Memory is the peak resident set size a case adds, measured in a fresh
+child process, so it includes what lxml allocates in C (tracemalloc only
+sees Python objects). Speeds are compared as multiples of a fixed
+pure-Python calibration loop timed in the same run, so a baseline saved on
+one machine still means something on another.
+
+Usage:
+    python benchmark_parsers.py                     # run and compare with baseline
+    python benchmark_parsers.py --save-baseline     # run and store a new baseline
+    python benchmark_parsers.py --sizes 1000 --engines lxml
+    python benchmark_parsers.py --large             # also 50k-row pages (bs4: ~80 s, ~1.8 GB)
+    python benchmark_parsers.py --sizes 10000 --profile   # cProfile/tracemalloc report per case
+"""
+
+import sys
+import json
+import time
+import logging
+import argparse
+import tracemalloc
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import profiling
+import utils
+
+FIXTURE_DIR = Path(__file__).parent
+BASELINE_PATH = FIXTURE_DIR / 'benchmark_baseline.json'
+DEFAULT_SIZES = [1000, 10000]
+HUGE_SIZES = [50000]  # only with --large: bs4 alone needs over a minute and ~1.8 GB per page
+LARGE_SIZE = 10000  # synthetic pages this big are timed once, not best-of-N
+PROBLEMS = ['A', 'B', 'C', 'D', 'E', 'F']
+
+SYNTHETIC_ROW = """<tr participantId="{pid}">
+    <td>
+            {rank}
+    </td>
+    <td class="contestant-cell" style="text-align:left;padding-left:1em;">
+        <a href="/profile/user{pid}" title="Newbie user{pid}" class="rated-user user-gray">user{pid}</a>
+    </td>
+    <td>{solved}</td>
+        <td>
+                    {penalty}
+        </td>
+{cells}
+</tr>
+"""
+
+ACCEPTED_CELL = """    <td contestId="1" problemId="{problem}" acceptedSubmissionId="{pid}{problem}">
+        <span class="cell-accepted">+</span>
+        <span class="cell-time">{minutes:02d}:{seconds:02d}</span>
+    </td>
+"""
+REJECTED_CELL = """    <td contestId="1" problemId="{problem}">
+<span class="cell-rejected">-{tries}</span>
+    </td>
+"""
+EMPTY_CELL = """    <td contestId="1" problemId="{problem}">
+    </td>
+"""
+
+
+def synthetic_standings_html(rows: int) -> str:
+    """Build a standings page with the given number of participant rows."""
+    headers = ''.join(
+        f'<th class="top standings-cell_problem-header" style="width:4em;">'
+        f'<a href="/contest/1/problem/{p}">{p}</a></th>\n'
+        for p in PROBLEMS
+    )
+    body = []
+    for pid in range(rows):
+        solved = 0
+        cells = []
+        for i, problem in enumerate(PROBLEMS):
+            kind = (pid + i) % 3
+            if kind == 0:
+                solved += 1
+                cells.append(ACCEPTED_CELL.format(problem=problem, pid=pid,
+                                                  minutes=(pid + i) % 60, seconds=i * 7 % 60))
+            elif kind == 1:
+                cells.append(REJECTED_CELL.format(problem=problem, tries=i % 3 + 1))
+            else:
+                cells.append(EMPTY_CELL.format(problem=problem))
+        body.append(SYNTHETIC_ROW.format(pid=pid, rank=pid + 1, solved=solved,
+                                         penalty=solved * 17, cells=''.join(cells)))
+    return (
+        "<html><head><title>Synthetic Standings - Codeforces</title></head><body>\n"
+        '<table class="standings">\n<tr><th>#</th><th>Who</th><th>=</th><th>Penalty</th>\n'
+        f"{headers}</tr>\n{''.join(body)}</table>\n</body></html>\n"
+    )
+
+
+def calibrate(repeat: int = 15) -> float:
+    """
+    Speed of this machine as iterations/sec of a fixed pure-Python loop
+    (string, dict and int work, like the parsers' own Python side).
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        counts: Dict[str, int] = {}
+        for i in range(200000):
+            key = f"user{i % 997}"
+            counts[key] = counts.get(key, 0) + len(key.strip())
+        best = min(best, time.perf_counter() - start)
+    return round(200000 / best, 1)
+
+
+def _peak_rss_mb() -> float:
+    """This process's peak resident set size in MB since start or the last reset."""
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _reset_peak_rss():
+    """
+    Lower the peak RSS mark to the current RSS where Linux allows it. A new
+    process otherwise inherits the high-water mark of the one that forked it.
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def _peak_rss_of_case(spec: Tuple[str, str, object]) -> float:
+    """Run one case in this (fresh) process; MB its run added to the peak RSS."""
+    utils.setup_logging(logging.WARNING)
+    func = case_function(spec)
+    _reset_peak_rss()
+    before = _peak_rss_mb()
+    func()
+    return _peak_rss_mb() - before
+
+
+def peak_rss_mb(spec: Tuple[str, str, object]) -> Optional[float]:
+    """
+    Peak resident memory one run of a case adds, measured in a new process
+    so earlier cases' high-water mark does not hide it. The input HTML is
+    built before the measurement starts. None on Windows, which lacks
+    the resource module.
+    """
+    if sys.platform == 'win32':
+        return None
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return round(pool.submit(_peak_rss_of_case, spec).result(), 3)
+
+
+def measure(func: Callable[[], int], spec: Tuple[str, str, object], repeat: int,
+            calibration: float) -> Dict[str, float]:
+    """
+    Time func (best of `repeat` runs) and record its peak RSS.
+    
+    func must return the number of rows it produced. Memory is measured in a
+    child process running the same case, so the timing runs are undisturbed.
+    """
+    best = float('inf')
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = func()
+        best = min(best, time.perf_counter() - start)
+    
+    rows_per_sec = rows / best if best > 0 else 0.0
+    return {
+        'rows': rows,
+        'seconds': round(best, 6),
+        'rows_per_sec': round(rows_per_sec, 1),
+        # Rows parsed per million calibration-loop iterations
+        'relative_speed': round(rows_per_sec / calibration * 1e6, 1),
+        'peak_rss_mb': peak_rss_mb(spec),
+    }
+
+
+def case_function(spec: Tuple[str, str, object]) -> Callable[[], int]:
+    """
+    The callable of a case spec: (function, engine, fixture file name or
+    synthetic row count). It takes no arguments and returns the number of
+    rows produced.
+    """
+    function, engine, source = spec
+    if isinstance(source, int):
+        html = synthetic_standings_html(source)
+    else:
+        html = (FIXTURE_DIR / source).read_text(encoding='utf-8')
+    if function == 'extract_contest_list':
+        return lambda: len(utils.extract_contest_list(html))
+    return lambda: len(utils.parse_standings(html, 'bench', engine=engine)['participants'])
+
+
+def build_cases(sizes: List[int], engines: List[str]) -> Dict[str, Tuple[Tuple[str, str, object], bool]]:
+    """
+    Map benchmark names to (case spec, is_large) pairs; see case_function.
+    """
+    cases = {}
+    for engine in engines:
+        cases[f'parse_standings[{engine}]/debug_standings.html'] = (
+            ('parse_standings', engine, 'debug_standings.html'), False)
+    cases['extract_contest_list/debug_contests.html'] = (
+        ('extract_contest_list', None, 'debug_contests.html'), False)
+    
+    for size in sizes:
+        for engine in engines:
+            cases[f'parse_standings[{engine}]/synthetic_{size}'] = (
+                ('parse_standings', engine, size), size >= LARGE_SIZE)
+    
+    return cases
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> int:
+    """
+    Print the change in relative speed against the baseline and return the
+    number of regressions.
+    """
+    regressions = 0
+    print()
+    print(f"{'Benchmark':<50} {'relative':>12} {'baseline':>12} {'change':>8}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or not base.get('relative_speed'):
+            print(f"{name:<50} {result['relative_speed']:>12,.0f} {'-':>12} {'new':>8}")
+            continue
+        change = result['relative_speed'] / base['relative_speed'] - 1
+        flag = ''
+        if change < -tolerance:
+            regressions += 1
+            flag = '  ✗ slower'
+        print(f"{name:<50} {result['relative_speed']:>12,.0f} {base['relative_speed']:>12,.0f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline parser benchmarks")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="Synthetic standings sizes in rows")
+    parser.add_argument('--large', action='store_true',
+                        help=f"Also run the {', '.join(map(str, HUGE_SIZES))}-row pages")
+    parser.add_argument('--engines', nargs='+', choices=['lxml', 'bs4'], default=['lxml', 'bs4'])
+    parser.add_argument('--repeat', type=int, default=3,
+                        help=f"Timed runs per benchmark, best is kept (pages of {LARGE_SIZE}+ rows run once)")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Allowed relative speed drop against the baseline before failing")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="Store these results as the new baseline (cases not run keep their old entry)")
+    parser.add_argument('--profile', action='store_true',
+                        help="Also profile one extra run of each case (phases named after the cases)")
+    args = parser.parse_args()
+    
+    # Per-parse INFO lines would drown the report
+    utils.setup_logging(logging.WARNING)
+    
+    calibration = calibrate()
+    print(f"Calibration: {calibration:,.0f} loop iterations/s\n")
+    
+    profiler = profiling.Profiler() if args.profile else None
+    results = {}
+    sizes = args.sizes + [size for size in HUGE_SIZES if args.large and size not in args.sizes]
+    for name, (spec, is_large) in build_cases(sizes, args.engines).items():
+        func = case_function(spec)
+        results[name] = measure(func, spec, 1 if is_large else args.repeat, calibration)
+        r = results[name]
+        peak = f"{r['peak_rss_mb']:>8.2f} MB peak RSS" if r['peak_rss_mb'] is not None else ''
+        print(f"{name:<50} {r['rows']:>7} rows  {r['seconds']:>9.4f}s  "
+              f"{r['rows_per_sec']:>12,.0f} rows/s  {peak}")
+        if profiler is not None:
+            # Separate from the timed runs, which must not pay the profiler's overhead
+            profiler.call(name.replace('/', '_').replace(' ', '_'), func)
+            tracemalloc.stop()  # the profiler leaves tracing on; the next timed runs need it off
+    
+    if profiler is not None:
+        print(f"\nProfile written to {profiler.write()}/summary.txt")
+    
+    if args.save_baseline:
+        # A quick run must not drop the --large entries from the baseline
+        saved = {}
+        if args.baseline.exists():
+            with open(args.baseline, encoding='utf-8') as f:
+                saved = json.load(f)
+        saved.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(saved, f, indent=2)
+            f.write('\n')
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+    
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n✗ {regressions} benchmark(s) more than {args.tolerance:.0%} slower than baseline")
+        return 1
+    print("\n✓ No regressions against baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
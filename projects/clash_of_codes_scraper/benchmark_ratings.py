@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Offline benchmarks for the club rating engine (ratings.py).
+
+Builds a synthetic contest history (a pool of handles with hidden skill,
+random fields per contest, ranks from noisy performances) and times:
+
+    full        rating every contest from scratch with the vectorized engine
+    incremental applying one more contest to the rated history
+    reference   a pure-Python pairwise implementation of the same formulas,
+                on the first few contests, whose deltas must match
+
+Usage:
+    python benchmark_ratings.py
+    python benchmark_ratings.py --contests 1000 --participants 500 --handles 20000
+"""
+
+import sys
+import math
+import time
+import argparse
+from typing import List, Tuple
+
+import numpy as np
+
+import ratings
+
+
+def synthetic_history(contests: int, participants: int, handles: int,
+                      seed: int = 0) -> List[Tuple[str, List[str], np.ndarray]]:
+    """(contest ID, handles, ranks) of each synthetic contest, in order."""
+    rng = np.random.default_rng(seed)
+    names = [f"user{i}" for i in range(handles)]
+    skill = rng.normal(1500, 350, handles)
+    history = []
+    for contest in range(contests):
+        field = rng.choice(handles, size=min(participants, handles), replace=False)
+        performance = skill[field] + rng.normal(0, 200, len(field))
+        order = np.argsort(-performance)
+        ranks = np.empty(len(field), dtype=np.int64)
+        ranks[order] = np.arange(1, len(field) + 1)
+        history.append((str(100000 + contest), [names[i] for i in field], ranks))
+    return history
+
+
+def reference_deltas(old: List[float], ranks: List[int]) -> List[int]:
+    """rating_deltas() written pair by pair in plain Python."""
+    n = len(old)
+    if n < 2:
+        return [0] * n
+    
+    def win(a: float, b: float) -> float:
+        return 1.0 / (1.0 + 10.0 ** ((b - a) / 400.0))
+    
+    deltas = []
+    for i in range(n):
+        seed = 1.0 + sum(win(old[j], old[i]) for j in range(n) if j != i)
+        target = math.sqrt(seed * ranks[i])
+        low, high = ratings.SEARCH_RANGE
+        for _ in range(ratings.BISECTION_STEPS):
+            middle = (low + high) / 2
+            if 1.0 + sum(win(old[j], middle) for j in range(n) if j != i) < target:
+                high = middle
+            else:
+                low = middle
+        deltas.append(((low + high) / 2 - old[i]) / 2)
+    
+    shift = -sum(deltas) / n - 1
+    deltas = [delta + shift for delta in deltas]
+    top_count = min(n, 4 * int(round(math.sqrt(n))))
+    top = sorted(range(n), key=lambda i: -old[i])[:top_count]
+    shift = min(max(-sum(deltas[i] for i in top) / top_count, -10.0), 0.0)
+    return [int(np.round(delta + shift)) for delta in deltas]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rating engine benchmarks")
+    parser.add_argument('--contests', type=int, default=300)
+    parser.add_argument('--participants', type=int, default=300, help="Participants per contest")
+    parser.add_argument('--handles', type=int, default=5000, help="Size of the handle pool")
+    parser.add_argument('--reference-contests', type=int, default=3,
+                        help="Contests rated by the pure-Python reference as well")
+    args = parser.parse_args()
+    
+    history = synthetic_history(args.contests + 1, args.participants, args.handles)
+    *past, latest = history
+    
+    engine = ratings.RatingEngine(1500)
+    start = time.perf_counter()
+    for contest_id, handles, ranks in past:
+        engine.apply(contest_id, handles, ranks)
+    full_seconds = time.perf_counter() - start
+    print(f"{'full':<12} {len(past):>6} contests  {full_seconds:>9.3f}s  "
+          f"{len(past) / full_seconds:>9.1f} contests/s  ({len(engine.handles)} handles)")
+    
+    start = time.perf_counter()
+    engine.apply(*latest)
+    incremental_seconds = time.perf_counter() - start
+    print(f"{'incremental':<12} {1:>6} contest   {incremental_seconds:>9.4f}s  "
+          f"{full_seconds / incremental_seconds:>9.0f}x faster than a full recompute")
+    
+    # Same contests through both implementations, from the same starting ratings
+    check = ratings.RatingEngine(1500)
+    mismatches = 0
+    reference_seconds = 0.0
+    vectorized_seconds = 0.0
+    for contest_id, handles, ranks in history[:args.reference_contests]:
+        positions = check._indices(handles)
+        old = check.rating[positions].astype(float).tolist()
+        start = time.perf_counter()
+        expected = reference_deltas(old, ranks.tolist())
+        reference_seconds += time.perf_counter() - start
+        start = time.perf_counter()
+        deltas = check.apply(contest_id, handles, ranks)
+        vectorized_seconds += time.perf_counter() - start
+        mismatches += sum(1 for a, b in zip(deltas.tolist(), expected) if abs(a - b) > 1)
+    print(f"{'reference':<12} {args.reference_contests:>6} contests  {reference_seconds:>9.3f}s  "
+          f"{reference_seconds / vectorized_seconds:>9.0f}x slower than vectorized")
+    
+    if mismatches:
+        print(f"\n✗ {mismatches} deltas differ from the reference by more than 1")
+        return 1
+    print("\n✓ Vectorized deltas match the reference")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Codeforces JSON API client for the Clash of Codes scraper.
+Fetches standings with the official contest.standings method and maps
+them onto the same contestId/title/participants/solveTimeline schema the
+HTML parser produces, so no standings HTML has to be downloaded or parsed.
+
+Private group contests need a signed request: create an API key in the
+Codeforces settings of a group member and set CF_API_KEY/CF_API_SECRET.
+
+Usage:
+    python cf_api.py <contestId>          # print one contest in the output schema
+    python cf_api.py <contestId> --save   # save it like the scraper would
+"""
+
+import sys
+import json
+import time
+import random
+import string
+import hashlib
+import argparse
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+import config
+import metrics
+import utils
+from rate_limiter import RateLimiter, backoff_delay, parse_retry_after
+from utils import logger
+
+# Failure comments that mean "slow down" rather than "bad request"
+THROTTLE_COMMENTS = ('call limit exceeded',)
+
+
+class CodeforcesAPIError(Exception):
+    """The API answered with status FAILED for a reason retrying will not fix."""
+
+
+class CodeforcesAPI:
+    """Minimal, rate-limited client for the Codeforces JSON API."""
+    
+    def __init__(self, key: str = None, secret: str = None, base_url: str = None,
+                 rate_limiter: RateLimiter = None):
+        self.key = config.CF_API_KEY if key is None else key
+        self.secret = config.CF_API_SECRET if secret is None else secret
+        self.base_url = (base_url or config.CF_API_BASE_URL).rstrip('/')
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': config.USER_AGENT})
+        # The API allows far fewer calls than the website, so it gets its own bucket
+        self.rate_limiter = rate_limiter or RateLimiter(
+            rate=config.CF_API_RPS, burst=1, max_rate=config.CF_API_RPS
+        )
+    
+    def sign(self, method: str, params: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Add apiKey, time and apiSig to the parameters of a method call.
+        
+        apiSig is six random characters followed by the SHA-512 hex digest of
+        "<rand>/<method>?<params sorted by name, then value>#<secret>".
+        """
+        signed = {name: str(value) for name, value in params.items()}
+        signed['apiKey'] = self.key
+        signed['time'] = str(int(time.time()))
+        query = '&'.join(f"{name}={value}" for name, value in sorted(signed.items()))
+        rand = ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
+        digest = hashlib.sha512(f"{rand}/{method}?{query}#{self.secret}".encode('utf-8')).hexdigest()
+        signed['apiSig'] = rand + digest
+        return signed
+    
+    def call(self, method: str, max_retries: int = None, **params) -> Any:
+        """
+        Call an API method and return its 'result'.
+        
+        Requests are signed when a key and secret are configured. Throttling
+        (429/503 or "Call limit exceeded") slows the limiter down and is
+        retried, as are network errors.
+        
+        Raises:
+            CodeforcesAPIError: The API rejected the call, or every attempt failed
+        """
+        max_retries = max_retries or config.MAX_RETRIES
+        url = f"{self.base_url}/{method}"
+        last_error = 'no response'
+        
+        for attempt in range(max_retries):
+            if attempt:
+                metrics.registry.inc('request_retries', kind='api')
+            query = self.sign(method, params) if self.key and self.secret else params
+            try:
+                with metrics.timed('rate_limit_wait_seconds', source='api'):
+                    self.rate_limiter.acquire()
+                with metrics.timed('request_seconds', kind='api'):
+                    response = self.session.get(url, params=query, timeout=config.REQUEST_TIMEOUT)
+                metrics.registry.inc('requests', kind='api', status=str(response.status_code))
+                metrics.registry.observe('response_bytes', len(response.content), kind='api')
+                try:
+                    payload = response.json()
+                except ValueError:
+                    payload = {}
+                
+                if response.status_code == 200 and payload.get('status') == 'OK':
+                    self.rate_limiter.on_success()
+                    return payload['result']
+                
+                last_error = payload.get('comment') or f"status {response.status_code}"
+                if response.status_code in (429, 503) or last_error.lower().startswith(THROTTLE_COMMENTS):
+                    metrics.registry.inc('throttled', source='api')
+                    self.rate_limiter.on_throttle(parse_retry_after(response.headers.get('Retry-After')))
+                    logger.warning(f"API throttled ({last_error}), slowing down to {self.rate_limiter.rate:.2f} req/s")
+                elif payload.get('status') == 'FAILED':
+                    raise CodeforcesAPIError(f"{method}: {last_error}")
+                else:
+                    logger.warning(f"API request failed with {last_error}")
+            
+            except requests.RequestException as e:
+                metrics.registry.inc('request_errors', kind='api')
+                last_error = str(e)
+                logger.warning(f"API request error (attempt {attempt + 1}/{max_retries}): {e}")
+            
+            if attempt < max_retries - 1:
+                time.sleep(backoff_delay(attempt))
+        
+        raise CodeforcesAPIError(f"{method}: {last_error}")
+    
+    def contest_status(self, contest_id: str, first: int = 1, count: int = None) -> List[Dict[str, Any]]:
+        """
+        One page of a contest's submissions, newest first (contest.status).
+        
+        Args:
+            contest_id: Contest to list
+            first: 1-based index of the first submission to return
+            count: Number of submissions to return (default: all)
+        
+        Raises:
+            CodeforcesAPIError: The call failed
+        """
+        params = {'contestId': contest_id, 'from': first}
+        if count:
+            params['count'] = count
+        return self.call('contest.status', **params)
+    
+    def contest_standings(self, contest_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a contest's standings in the scraper's output schema.
+        
+        Returns:
+            Contest dict, or None if the API call failed
+        """
+        try:
+            result = self.call('contest.standings', contestId=contest_id, showUnofficial='false')
+        except CodeforcesAPIError as e:
+            logger.error(f"✗ API error for contest {contest_id}: {e}")
+            return None
+        
+        contest_data = standings_to_contest(result, contest_id)
+        logger.info(f"Fetched {len(contest_data['participants'])} participants for contest {contest_id} from the API")
+        return contest_data
+
+
+def _party_handle(party: Dict[str, Any]) -> Optional[str]:
+    """Name shown in the standings for a party: the team name or the member handle."""
+    if party.get('teamName'):
+        return party['teamName']
+    members = party.get('members') or []
+    return members[0].get('handle') if members else None
+
+
+def standings_to_contest(result: Dict[str, Any], contest_id: str) -> Dict[str, Any]:
+    """
+    Convert a contest.standings result into the scraper's contest dict.
+    
+    Matches the HTML parser field for field: 'solved' is the points column,
+    'attempted' counts problems with any submission, accepted problems get
+    an AC event at bestSubmissionTimeSeconds and rejected-only problems a WA
+    event at time 0. The first row of a handle wins.
+    
+    Args:
+        result: The 'result' object of a contest.standings response
+        contest_id: Contest ID for reference
+    
+    Returns:
+        Dict with normalized contest data
+    """
+    contest = result.get('contest', {})
+    problems = [problem['index'] for problem in result.get('problems', [])]
+    participants = {}
+    
+    for row in result.get('rows', []):
+        handle = _party_handle(row.get('party', {}))
+        if not handle or handle in participants:
+            continue
+        
+        solve_timeline = []
+        attempted = 0
+        for problem_index, problem_result in zip(problems, row.get('problemResults', [])):
+            accepted = problem_result.get('points', 0) > 0 and 'bestSubmissionTimeSeconds' in problem_result
+            if accepted:
+                attempted += 1
+                solve_timeline.append({
+                    'problem': problem_index,
+                    'time': problem_result['bestSubmissionTimeSeconds'],
+                    'status': 'AC',
+                    'tags': []
+                })
+            elif problem_result.get('rejectedAttemptCount', 0) > 0:
+                attempted += 1
+                solve_timeline.append({
+                    'problem': problem_index,
+                    'time': 0,
+                    'status': 'WA',
+                    'tags': []
+                })
+        
+        participants[handle] = {
+            'rank': row.get('rank', 0),
+            'solved': int(row.get('points', 0)),
+            'attempted': attempted,
+            'solveTimeline': solve_timeline
+        }
+    
+    return {
+        'contestId': str(contest_id),
+        'title': contest.get('name') or f"Contest {contest_id}",
+        'participants': participants
+    }
+
+
+def contest_to_standings(contest_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build a contest.standings result from a contest dict.
+    
+    The inverse of standings_to_contest, used by the local stub server.
+    """
+    problems: List[str] = []
+    for data in contest_data.get('participants', {}).values():
+        for event in data.get('solveTimeline', []):
+            if event['problem'] not in problems:
+                problems.append(event['problem'])
+    problems.sort()
+    
+    rows = []
+    for handle, data in contest_data.get('participants', {}).items():
+        events: Dict[str, Tuple[str, int]] = {
+            event['problem']: (event['status'], event['time']) for event in data.get('solveTimeline', [])
+        }
+        problem_results = []
+        for problem_index in problems:
+            status, solve_time = events.get(problem_index, (None, 0))
+            problem_result = {'points': 0.0, 'rejectedAttemptCount': 0, 'type': 'FINAL'}
+            if status == 'AC':
+                problem_result.update(points=1.0, bestSubmissionTimeSeconds=solve_time)
+            elif status is not None:
+                problem_result['rejectedAttemptCount'] = 1
+            problem_results.append(problem_result)
+        
+        rows.append({
+            'party': {'contestId': int(contest_data['contestId']), 'members': [{'handle': handle}],
+                      'participantType': 'CONTESTANT'},
+            'rank': data['rank'],
+            'points': float(data['solved']),
+            'penalty': 0,
+            'problemResults': problem_results
+        })
+    
+    return {
+        'contest': {'id': int(contest_data['contestId']), 'name': contest_data['title'], 'type': 'ICPC'},
+        'problems': [{'contestId': int(contest_data['contestId']), 'index': index, 'name': index}
+                     for index in problems],
+        'rows': rows
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch contest standings from the Codeforces API")
+    parser.add_argument('contest_id')
+    parser.add_argument('--save', action='store_true', help=f"Save to {config.OUTPUT_DIR} instead of printing")
+    args = parser.parse_args()
+    utils.setup_logging()
+    
+    contest_data = CodeforcesAPI().contest_standings(args.contest_id)
+    if contest_data is None:
+        return 1
+    
+    if args.save:
+        return 0 if utils.write_contest(contest_data, parser=utils.parser_version('api')) else 1
+    
+    print(json.dumps(contest_data, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Codeforces API, for exercising the API data source
+without network access or API keys.
+
+Serves contest.standings for every contest saved in the output directory,
+converted back into the API's response format. With --key/--secret it
+also checks apiSig the same way Codeforces does.
+
+Usage:
+    python cf_api_stub.py [--port 8765] [--data-dir ./data/] [--key K --secret S]
+    
+    # in another shell
+    CF_API_BASE_URL=http://127.0.0.1:8765/api python cf_api.py 666730
+"""
+
+import sys
+import json
+import hashlib
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import config
+import utils
+from cf_api import contest_to_standings
+
+
+def signature_is_valid(method: str, params: dict, key: str, secret: str) -> bool:
+    """Check apiKey/apiSig the way Codeforces does."""
+    signature = params.get('apiSig', '')
+    if params.get('apiKey') != key or len(signature) != 6 + 128:
+        return False
+    rand = signature[:6]
+    unsigned = {name: value for name, value in params.items() if name != 'apiSig'}
+    query = '&'.join(f"{name}={value}" for name, value in sorted(unsigned.items()))
+    expected = hashlib.sha512(f"{rand}/{method}?{query}#{secret}".encode('utf-8')).hexdigest()
+    return signature[6:] == expected
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers /api/contest.standings from saved contest files."""
+    
+    data_dir = None
+    key = None
+    secret = None
+    
+    def _reply(self, status: int, payload: dict):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json;charset=UTF-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _fail(self, comment: str):
+        self._reply(400, {'status': 'FAILED', 'comment': comment})
+    
+    def do_GET(self):
+        url = urlsplit(self.path)
+        method = url.path.rsplit('/', 1)[-1]
+        params = dict(parse_qsl(url.query))
+        
+        if self.key and not signature_is_valid(method, params, self.key, self.secret):
+            return self._fail('apiSig: Incorrect signature')
+        if method != 'contest.standings':
+            return self._fail(f'Method {method} is not supported by the stub')
+        
+        contest_id = params.get('contestId', '')
+        contest = utils.load_contest_file(contest_id, self.data_dir)
+        if contest is None:
+            return self._fail(f'contestId: Contest with id {contest_id} not found')
+        self._reply(200, {'status': 'OK', 'result': contest_to_standings(contest)})
+    
+    def log_message(self, format, *args):
+        utils.logger.info(f"stub: {format % args}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Codeforces API stub")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--data-dir', default=None, help="Directory of saved contests to serve (default: OUTPUT_DIR)")
+    parser.add_argument('--key', default=None, help="Require requests signed with this API key")
+    parser.add_argument('--secret', default=None, help="Secret of --key")
+    args = parser.parse_args()
+    utils.setup_logging()
+    
+    StubHandler.data_dir = args.data_dir or config.OUTPUT_DIR
+    StubHandler.key = args.key
+    StubHandler.secret = args.secret
+    
+    server = ThreadingHTTPServer((args.host, args.port), StubHandler)
+    print(f"Serving the Codeforces API stub at http://{args.host}:{args.port}/api")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
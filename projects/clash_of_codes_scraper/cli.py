@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Command-line interface for the Clash of Codes scraper.
+
+Every subcommand imports only what it needs: 'status' and 'export' work
+from saved files and never load requests, BeautifulSoup or lxml, so they
+start fast enough to run from cron or shell prompts. 'status' reads the
+manifest only and opens no contest files, and it never writes anything:
+without a manifest it indexes the contest files in memory instead.
+
+Usage:
+    python cli.py scrape [scraper options]      # same as python scraper.py
+    python cli.py watch [watch options]         # same as python watch.py
+    python cli.py status [--list] [--verify [--deep]]   # what has been scraped
+    python cli.py reparse [IDS ...] [--force]   # re-parse cached standings pages offline
+    python cli.py export --format jsonl [IDS ...] [--out contests.jsonl]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from typing import List
+
+import config
+import contest_io
+import utils
+from manifest import Manifest, get_manifest, hash_source
+from utils import logger
+
+
+def _contest_order(contest_id: str):
+    """Sort key placing numeric contest IDs first, oldest first."""
+    return (not contest_id.isdigit(), int(contest_id) if contest_id.isdigit() else 0, contest_id)
+
+
+def _selected_ids(ids: List[str]) -> List[str]:
+    """The given contest IDs, or every saved contest (oldest first)."""
+    if ids:
+        return ids
+    return sorted(utils.load_existing_contests(config.OUTPUT_DIR), key=_contest_order)
+
+
+def _age(seconds: float) -> str:
+    """Human-readable age like '3m' or '2h'."""
+    for unit, size in (('d', 86400), ('h', 3600), ('m', 60)):
+        if seconds >= size:
+            return f"{int(seconds // size)}{unit}"
+    return f"{int(seconds)}s"
+
+
+def cmd_scrape(args: argparse.Namespace) -> int:
+    import scraper
+    
+    scraper.main(args.scraper_args)
+    return 0
+
+
+def cmd_watch(args: argparse.Namespace) -> int:
+    import watch
+    
+    return watch.main(args.watch_args)
+
+
+def _read_only_manifest(output_dir: str) -> Manifest:
+    """
+    The output directory's manifest, or, if it has none yet, a separate
+    in-memory index of its contest files that is never written.
+    """
+    manifest = get_manifest(output_dir)
+    if manifest.exists:
+        return manifest
+    manifest = Manifest(output_dir)
+    manifest.rebuild_from_files(flush=False)
+    return manifest
+
+
+def _sqlite_contest_count(db_path: str) -> int:
+    """Contests in the SQLite store, read without migrating or otherwise writing it."""
+    import sqlite3
+    
+    conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        return conn.execute('SELECT COUNT(*) FROM contests').fetchone()[0]
+    finally:
+        conn.close()
+
+
+def cmd_status(args: argparse.Namespace) -> int:
+    output_dir = Path(config.OUTPUT_DIR)
+    manifest = _read_only_manifest(config.OUTPUT_DIR)
+    # Same rule as utils.load_existing_contests: contests whose files changed size do not count
+    contest_ids = sorted((contest_id for contest_id in manifest.contest_ids() if not manifest.verify(contest_id)),
+                         key=_contest_order)
+    entries = [manifest.get(contest_id) for contest_id in contest_ids]
+    json_files = sum(1 for entry in entries for name in entry['files'] if name.endswith('.json'))
+    compact_files = sum(1 for entry in entries for name in entry['files'] if name.endswith(contest_io.COMPACT_SUFFIX))
+    
+    print(f"Output directory: {output_dir}")
+    if not manifest.exists:
+        print("Manifest:         none yet, counted from the contest files (the next scrape writes it)")
+    print(f"Contests saved:   {len(contest_ids)} ({json_files} json, {compact_files} compact)")
+    if contest_ids:
+        print(f"Newest contest:   {contest_ids[-1]}")
+        newest_fetch = max(entry['fetchedAt'] for entry in entries)
+        print(f"Last fetched:     {_age(time.time() - newest_fetch)} ago")
+    
+    if config.STORAGE_BACKEND in ('sqlite', 'both') and Path(config.SQLITE_PATH).exists():
+        print(f"SQLite store:     {_sqlite_contest_count(config.SQLITE_PATH)} contests in {config.SQLITE_PATH}")
+    
+    rewind_directory = Path(config.REWIND_DIR) / 'index.json'
+    if rewind_directory.exists():
+        with open(rewind_directory, 'r', encoding='utf-8') as f:
+            print(f"Rewind index:     {len(json.load(f)['handles'])} handles")
+    
+    cache_path = Path(config.CONTEST_LIST_CACHE_PATH)
+    if cache_path.exists():
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        print(f"Contest list:     {len(cached['contests'])} contests, "
+              f"discovered {_age(time.time() - cached['discoveredAt'])} ago")
+    
+    if args.list:
+        print()
+        for contest_id, entry in zip(contest_ids, entries):
+            participants = entry['participants'] if entry['participants'] is not None else '?'
+            print(f"{contest_id:>8}  {participants:>5} participants  "
+                  f"{entry.get('type', ''):<7} {entry['title'] or ''}")
+    
+    if args.verify:
+        # contest_ids already left out contests whose files changed size
+        damaged = {contest_id: manifest.verify(contest_id, deep=args.deep) for contest_id in manifest.contest_ids()}
+        damaged = {contest_id: problems for contest_id, problems in damaged.items() if problems}
+        print()
+        for contest_id, problems in damaged.items():
+            for problem in problems:
+                print(f"✗ {contest_id}: {problem}")
+        if damaged:
+            print(f"✗ {len(damaged)} damaged contests (they are scraped again on the next run)")
+            return 1
+        print(f"✓ All {len(manifest.contest_ids())} contests intact")
+    return 0
+
+
+def cmd_reparse(args: argparse.Namespace) -> int:
+    import submissions
+    from http_cache import ResponseCache
+    
+    cache = ResponseCache()
+    group_id = utils.extract_group_id(config.GROUP_URL)
+    manifest = get_manifest(config.OUTPUT_DIR)
+    parser = utils.parser_version(args.engine)
+    reparsed = unchanged = failed = 0
+    
+    for contest_id in _selected_ids(args.ids):
+        if group_id:
+            url = f"https://codeforces.com/group/{group_id}/contest/{contest_id}/standings"
+        else:
+            url = f"https://codeforces.com/contest/{contest_id}/standings"
+        
+        first_page = cache.text(url)
+        if first_page is None:
+            logger.error(f"✗ Standings of contest {contest_id} are not in the HTTP cache")
+            failed += 1
+            continue
+        pages = [first_page] + [cache.text(page_url) for page_url in utils.extract_standings_page_urls(first_page, url)]
+        if not all(page is not None for page in pages):
+            logger.error(f"✗ Some standings pages of contest {contest_id} are not in the HTTP cache")
+            failed += 1
+            continue
+        
+        # Submission logs from earlier --enrich-submissions runs are applied again
+        log = submissions.load_log(contest_id)
+        source_hash = hash_source(pages + ([str(log['lastSubmissionId'])] if log['submissions'] else []))
+        if not args.force and manifest.source_unchanged(contest_id, source_hash, parser):
+            unchanged += 1
+            continue
+        
+        contest_data = utils.parse_contest_pages(pages, contest_id, args.engine)
+        if log['submissions']:
+            submissions.apply_log(contest_data, log)
+        if utils.write_contest(contest_data, refresh=True, source_hash=source_hash, parser=parser):
+            reparsed += 1
+        else:
+            failed += 1
+    manifest.flush()
+    
+    if config.REWIND_INDEX_ENABLED and reparsed:
+        import rewind_index
+        rewind_index.rebuild(config.OUTPUT_DIR)
+    
+    print(f"✓ Re-parsed {reparsed} contests"
+          + (f", {unchanged} already up to date" if unchanged else "")
+          + (f", ✗ {failed} failed" if failed else ""))
+    return 1 if failed else 0
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    contests = []
+    for contest_id in _selected_ids(args.ids):
+        contest_data = utils.load_contest(contest_id, config.OUTPUT_DIR)
+        if contest_data is None:
+            logger.error(f"✗ Contest {contest_id} is not saved")
+            return 1
+        contests.append(contest_data)
+    
+    if args.format == 'jsonl':
+        lines = ''.join(json.dumps(contest, ensure_ascii=False) + '\n' for contest in contests)
+        if args.out in (None, '-'):
+            sys.stdout.write(lines)
+        else:
+            contest_io.atomic_write(Path(args.out), lines.encode('utf-8'))
+    else:
+        if not args.out:
+            logger.error("✗ --out DIR is required for the json and compact formats")
+            return 1
+        compact = args.format == 'compact'
+        encode = contest_io.encode_compact if compact else contest_io.encode_json
+        for contest in contests:
+            contest_io.atomic_write(contest_io.contest_path(args.out, contest['contestId'], compact), encode(contest))
+    
+    if args.out not in (None, '-'):
+        print(f"✓ Exported {len(contests)} contests to {args.out}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Clash of Codes contest scraper")
+    parser.add_argument('--env-file', default=None, help="Read settings from this file instead of .env")
+    parser.add_argument('--output-dir', default=None, help="Override OUTPUT_DIR")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    scrape = commands.add_parser('scrape', help="Scrape new contests (takes the scraper.py options)")
+    scrape.add_argument('scraper_args', nargs=argparse.REMAINDER)
+    scrape.set_defaults(func=cmd_scrape)
+    
+    watch = commands.add_parser('watch', help="Keep snapshots fresh with a polling daemon (takes the watch.py options)")
+    watch.add_argument('watch_args', nargs=argparse.REMAINDER)
+    watch.set_defaults(func=cmd_watch)
+    
+    status = commands.add_parser('status', help="Show what has been scraped")
+    status.add_argument('--list', action='store_true', help="List every saved contest")
+    status.add_argument('--verify', action='store_true', help="Check saved files against their recorded sizes")
+    status.add_argument('--deep', action='store_true', help="With --verify, also compare file hashes")
+    status.set_defaults(func=cmd_status)
+    
+    reparse = commands.add_parser('reparse', help="Re-parse standings from the HTTP cache without fetching")
+    reparse.add_argument('ids', nargs='*', help="Contest IDs (default: every saved contest)")
+    reparse.add_argument('--engine', choices=['lxml', 'bs4'], default=None, help="Parser engine")
+    reparse.add_argument('--force', action='store_true',
+                         help="Re-parse even contests whose pages and parser version are unchanged")
+    reparse.set_defaults(func=cmd_reparse)
+    
+    export = commands.add_parser('export', help="Export saved contests")
+    export.add_argument('ids', nargs='*', help="Contest IDs (default: every saved contest)")
+    export.add_argument('--format', choices=['jsonl', 'json', 'compact'], default='jsonl')
+    export.add_argument('--out', default=None, help="Output file for jsonl (default: stdout), directory otherwise")
+    export.set_defaults(func=cmd_export)
+    
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    
+    # Set before the settings load, so paths derived from it follow
+    if args.output_dir:
+        os.environ['OUTPUT_DIR'] = args.output_dir
+    if args.env_file:
+        config.load(args.env_file)
+    if args.command not in ('scrape', 'watch'):
+        utils.setup_logging()
+    
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
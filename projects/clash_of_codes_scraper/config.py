@@ -1,60 +1,253 @@
 """
 Configuration file for the Clash of Codes scraper.
 Loads settings from environment variables and provides defaults.
+
+Nothing is read at import time. The first access to a setting (for example
+config.OUTPUT_DIR) loads .env and the environment; settings assigned on the
+module before that are kept. Other programs can instead build a Settings
+object explicitly and install it with configure().
+
+Output paths in DERIVED_PATHS that are not set explicitly follow OUTPUT_DIR:
+they are computed from its current value whenever they are read, so
+configure(OUTPUT_DIR=...) or assigning config.OUTPUT_DIR moves them too.
 """
 
 import os
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
-
-# Required Configuration
-GROUP_URL = os.getenv('GROUP_URL', 'https://codeforces.com/group/GROUPID/contests')
-
-# Authentication - Cookie-based (recommended)
-CODEFORCES_SESSION = os.getenv('CODEFORCES_SESSION', '')
-CODEFORCES_39CE7 = os.getenv('CODEFORCES_39CE7', '')
-CODEFORCES_CF_CLEARANCE = os.getenv('CODEFORCES_CF_CLEARANCE', '')
-
-# Authentication - Username/Password (legacy, not recommended)
-USERNAME = os.getenv('USERNAME', '')
-PASSWORD = os.getenv('PASSWORD', '')
-
-# Optional Configuration
-OUTPUT_DIR = os.getenv('OUTPUT_DIR', './data/')
-CONTEST_IDS = os.getenv('CONTEST_IDS', '')  # Comma-separated list, e.g., "1234,1235,1236"
-
-# Parse contest IDs if provided
-if CONTEST_IDS:
-    CONTEST_IDS = [id.strip() for id in CONTEST_IDS.split(',') if id.strip()]
-else:
-    CONTEST_IDS = None  # Scrape all contests
-
-# Contest Type Configuration (manually configure weekly vs battle)
-WEEKLY_CONTEST_IDS = os.getenv('WEEKLY_CONTEST_IDS', '')
-if WEEKLY_CONTEST_IDS:
-    WEEKLY_CONTEST_IDS = set(id.strip() for id in WEEKLY_CONTEST_IDS.split(',') if id.strip())
-else:
-    WEEKLY_CONTEST_IDS = set()
-
-BATTLE_CONTEST_IDS = os.getenv('BATTLE_CONTEST_IDS', '')
-if BATTLE_CONTEST_IDS:
-    BATTLE_CONTEST_IDS = set(id.strip() for id in BATTLE_CONTEST_IDS.split(',') if id.strip())
-else:
-    BATTLE_CONTEST_IDS = set()
-
-# Scraping Configuration
-MAX_RETRIES = int(os.getenv('MAX_RETRIES', '3'))
-REQUEST_TIMEOUT = int(os.getenv('REQUEST_TIMEOUT', '30'))
-RETRY_DELAY = int(os.getenv('RETRY_DELAY', '2'))  # seconds
-
-# Headers for requests
-USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+from types import SimpleNamespace
+from typing import Mapping
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# Settings that default to a path inside OUTPUT_DIR
+DERIVED_PATHS = {
+    'SQLITE_PATH': 'contests.db',
+    'REWIND_DIR': 'rewind',
+    'RATINGS_PATH': 'ratings.json',
+    'ANALYTICS_DIR': 'analytics',
+}
+
+
+class Settings(SimpleNamespace):
+    """Every scraper setting, as attributes named like the module constants."""
+    
+    def __getattr__(self, name: str):
+        # Only reached for attributes that are not set, i.e. derived paths left to their default
+        if name in DERIVED_PATHS:
+            return os.path.join(self.OUTPUT_DIR, DERIVED_PATHS[name])
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+    
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] = None) -> 'Settings':
+        """
+        Read settings from environment variables.
+        
+        Args:
+            environ: Mapping to read instead of os.environ (no .env is loaded)
+        
+        Returns:
+            Settings with a value (or default) for every setting
+        """
+        getenv = (os.environ if environ is None else environ).get
+        
+        # Required Configuration
+        GROUP_URL = getenv('GROUP_URL', 'https://codeforces.com/group/GROUPID/contests')
+        
+        # Authentication - Cookie-based (recommended)
+        CODEFORCES_SESSION = getenv('CODEFORCES_SESSION', '')
+        CODEFORCES_39CE7 = getenv('CODEFORCES_39CE7', '')
+        CODEFORCES_CF_CLEARANCE = getenv('CODEFORCES_CF_CLEARANCE', '')
+        
+        # Authentication - Username/Password (legacy, not recommended)
+        USERNAME = getenv('USERNAME', '')
+        PASSWORD = getenv('PASSWORD', '')
+        
+        # Optional Configuration
+        OUTPUT_DIR = getenv('OUTPUT_DIR', './data/')
+        CONTEST_IDS = getenv('CONTEST_IDS', '')  # Comma-separated list, e.g., "1234,1235,1236"
+        CF_TIMEZONE = getenv('CF_TIMEZONE', 'UTC')  # time zone of the Codeforces account, e.g. "Asia/Kolkata"
+        
+        # Storage Configuration
+        STORAGE_BACKEND = getenv('STORAGE_BACKEND', 'json')  # 'json' (files), 'sqlite' or 'both'
+        OUTPUT_FORMAT = getenv('OUTPUT_FORMAT', 'json')  # file format: 'json', 'compact' or 'both'
+        SQLITE_PATH = getenv('SQLITE_PATH')  # None: OUTPUT_DIR/contests.db
+        MANIFEST_FLUSH_INTERVAL = int(getenv('MANIFEST_FLUSH_INTERVAL', '10'))  # min seconds between manifest.json writes during a run
+        
+        # Rewind Index Configuration (per-handle aggregates written after each run)
+        REWIND_INDEX_ENABLED = getenv('REWIND_INDEX', 'true').lower() in ('1', 'true', 'yes')
+        REWIND_DIR = getenv('REWIND_DIR')  # None: OUTPUT_DIR/rewind
+        
+        # Club Rating (ratings.py, brought up to date after each run)
+        RATINGS_ENABLED = getenv('RATINGS', 'true').lower() in ('1', 'true', 'yes')
+        RATINGS_PATH = getenv('RATINGS_PATH')  # None: OUTPUT_DIR/ratings.json
+        RATING_INITIAL = int(getenv('RATING_INITIAL', '1500'))  # rating of a handle before its first contest
+        
+        # Analytics (per-contest and group stats files for the frontend)
+        ANALYTICS_ENABLED = getenv('ANALYTICS', 'true').lower() in ('1', 'true', 'yes')
+        ANALYTICS_DIR = getenv('ANALYTICS_DIR')  # None: OUTPUT_DIR/analytics
+        ANALYTICS_BIN_SECONDS = int(getenv('ANALYTICS_BIN_SECONDS', '300'))  # width of the solves-over-time bins
+        
+        # Parse contest IDs if provided
+        if CONTEST_IDS:
+            CONTEST_IDS = [id.strip() for id in CONTEST_IDS.split(',') if id.strip()]
+        else:
+            CONTEST_IDS = None  # Scrape all contests
+        
+        # Contest Type Configuration (manually configure weekly vs battle)
+        WEEKLY_CONTEST_IDS = getenv('WEEKLY_CONTEST_IDS', '')
+        if WEEKLY_CONTEST_IDS:
+            WEEKLY_CONTEST_IDS = set(id.strip() for id in WEEKLY_CONTEST_IDS.split(',') if id.strip())
+        else:
+            WEEKLY_CONTEST_IDS = set()
+        
+        BATTLE_CONTEST_IDS = getenv('BATTLE_CONTEST_IDS', '')
+        if BATTLE_CONTEST_IDS:
+            BATTLE_CONTEST_IDS = set(id.strip() for id in BATTLE_CONTEST_IDS.split(',') if id.strip())
+        else:
+            BATTLE_CONTEST_IDS = set()
+        
+        # Scraping Configuration
+        MAX_RETRIES = int(getenv('MAX_RETRIES', '3'))
+        REQUEST_TIMEOUT = int(getenv('REQUEST_TIMEOUT', '30'))
+        RETRY_DELAY = int(getenv('RETRY_DELAY', '2'))  # seconds
+        MAX_CONCURRENCY = int(getenv('MAX_CONCURRENCY', '4'))  # contests fetched in parallel
+        PARSE_WORKERS = int(getenv('PARSE_WORKERS', str(os.cpu_count() or 1)))  # parser processes, 0 = in-process
+        PIPELINE_QUEUE_SIZE = int(getenv('PIPELINE_QUEUE_SIZE', '8'))  # contests buffered between stages
+        BACKOFF_MAX = int(getenv('BACKOFF_MAX', '60'))  # cap on a single retry delay, seconds
+        
+        # Rate Limiting (shared token bucket, requests per second)
+        RATE_LIMIT_RPS = float(getenv('RATE_LIMIT_RPS', '2'))  # starting rate
+        RATE_LIMIT_MIN_RPS = float(getenv('RATE_LIMIT_MIN_RPS', '0.2'))
+        RATE_LIMIT_MAX_RPS = float(getenv('RATE_LIMIT_MAX_RPS', '5'))
+        RATE_LIMIT_BURST = int(getenv('RATE_LIMIT_BURST', '4'))
+        RATE_LIMIT_DECREASE_FACTOR = 0.5  # rate multiplier on a 429/503
+        RATE_LIMIT_INCREASE_RPS = 0.25  # rate added after a healthy streak
+        RATE_LIMIT_RECOVERY_STREAK = 10  # healthy responses needed before speeding up
+        
+        # Contest List Discovery (paginated, stops at the first known contest)
+        CONTEST_LIST_TTL = int(getenv('CACHE_TTL_CONTEST_LIST', '600'))  # seconds the discovered list is reused
+        CONTEST_LIST_CACHE_PATH = getenv('CONTEST_LIST_CACHE', './.cache/contest_list.json')
+        
+        # HTTP Cache Configuration (conditional GETs with ETag/Last-Modified)
+        HTTP_CACHE_ENABLED = getenv('HTTP_CACHE', 'true').lower() in ('1', 'true', 'yes')
+        HTTP_CACHE_DIR = getenv('HTTP_CACHE_DIR', './.cache/http/')
+        HTTP_CACHE_DEFAULT_TTL = 0  # seconds; 0 = always revalidate
+        # (URL regex, TTL in seconds) - first match wins
+        HTTP_CACHE_TTLS = [
+            (r'/contests(/page/\d+)?/?$', CONTEST_LIST_TTL),
+            (r'/standings', int(getenv('CACHE_TTL_STANDINGS', '0'))),
+        ]
+        
+        # Data Source Configuration
+        DATA_SOURCE = getenv('DATA_SOURCE', 'html')  # 'html' (standings pages) or 'api' (contest.standings)
+        CF_API_BASE_URL = getenv('CF_API_BASE_URL', 'https://codeforces.com/api')
+        CF_API_KEY = getenv('CF_API_KEY', '')  # key + secret sign requests for private group contests
+        CF_API_SECRET = getenv('CF_API_SECRET', '')
+        CF_API_RPS = float(getenv('CF_API_RPS', '0.5'))  # Codeforces allows one API call per 2 seconds
+        
+        # Submission Enrichment (per-attempt timelines from contest status pages)
+        SUBMISSIONS_ENABLED = getenv('ENRICH_SUBMISSIONS', 'false').lower() in ('1', 'true', 'yes')
+        SUBMISSIONS_DIR = getenv('SUBMISSIONS_DIR', './.cache/submissions/')  # per-contest submission logs
+        SUBMISSIONS_API_PAGE_SIZE = int(getenv('SUBMISSIONS_API_PAGE_SIZE', '1000'))  # contest.status page size
+        
+        # Problem Metadata (tags joined into solve timelines)
+        PROBLEM_TAGS_ENABLED = getenv('PROBLEM_TAGS', 'true').lower() in ('1', 'true', 'yes')
+        PROBLEM_CACHE_DIR = getenv('PROBLEM_CACHE_DIR', './.cache/problems/')
+        PROBLEM_CACHE_SIZE = int(getenv('PROBLEM_CACHE_SIZE', '4096'))  # problems kept in memory
+        
+        # Participant Profiles (rating, rank title and avatar from user.info)
+        USER_INFO_ENABLED = getenv('USER_INFO', 'true').lower() in ('1', 'true', 'yes')
+        USER_INFO_CACHE = getenv('USER_INFO_CACHE', './.cache/users.json')
+        USER_INFO_TTL = int(getenv('USER_INFO_TTL', '86400'))  # seconds before a handle is looked up again
+        USER_INFO_BATCH_SIZE = int(getenv('USER_INFO_BATCH_SIZE', '300'))  # handles per user.info call
+        
+        # Run Metrics (JSON run report and Prometheus textfile; '' disables either)
+        METRICS_REPORT = getenv('METRICS_REPORT', './.cache/metrics/run_report.json')
+        METRICS_TEXTFILE = getenv('METRICS_TEXTFILE', './.cache/metrics/clash_scraper.prom')
+        METRICS_INTERVAL = int(getenv('METRICS_INTERVAL', '15'))  # seconds between exports during a run, 0 = end only
+        
+        # Watch Daemon (watch.py polling tiers and change notifications)
+        WATCH_LIVE_INTERVAL = int(getenv('WATCH_LIVE_INTERVAL', '300'))  # seconds between polls of live contests
+        WATCH_LIVE_GRACE = int(getenv('WATCH_LIVE_GRACE', '7200'))  # seconds after the end a contest still counts as live
+        WATCH_RECENT_INTERVAL = int(getenv('WATCH_RECENT_INTERVAL', '3600'))  # seconds between polls of recent contests
+        WATCH_RECENT_DAYS = float(getenv('WATCH_RECENT_DAYS', '7'))  # days after the end a contest counts as recent
+        WATCH_DISCOVERY_INTERVAL = int(getenv('WATCH_DISCOVERY_INTERVAL', '900'))  # seconds between contest-list checks
+        WATCH_RETRY_MAX = int(getenv('WATCH_RETRY_MAX', '21600'))  # longest wait before retrying a contest never saved
+        WATCH_NOTIFY_FILE = getenv('WATCH_NOTIFY_FILE', './.cache/watch_events.jsonl')  # '' disables
+        WATCH_NOTIFY_SOCKET = getenv('WATCH_NOTIFY_SOCKET', '')  # Unix datagram socket path, '' disables
+        
+        # Run Journal (per-contest states of the last run, for --resume)
+        JOURNAL_PATH = getenv('JOURNAL_PATH', './.cache/journal.jsonl')
+        
+        # Profiling (--profile: per-phase cProfile and tracemalloc reports)
+        PROFILE_DIR = getenv('PROFILE_DIR', './.cache/profile/')  # one timestamped directory per run
+        PROFILE_TOP_N = int(getenv('PROFILE_TOP_N', '25'))  # functions and allocation sites per phase in summary.txt
+        
+        # Parsing Configuration
+        PARSER_ENGINE = getenv('PARSER_ENGINE', 'lxml')  # 'lxml' (fast) or 'bs4' (reference)
+        
+        # Headers for requests
+        USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+        
+        # Every upper-case local above is a setting; unset derived paths are left out
+        return cls(**{name: value for name, value in locals().items()
+                      if name.isupper() and not (name in DERIVED_PATHS and value is None)})
+
+
+_loaded = False
+
+
+def load(env_file: str = None) -> Settings:
+    """
+    Load .env (or env_file) into the environment and install the settings.
+    
+    Settings already assigned on the module, e.g. from command-line flags,
+    keep their value.
+    """
+    global _loaded
+    from dotenv import load_dotenv
+    
+    load_dotenv(env_file) if env_file else load_dotenv()
+    settings = Settings.from_env()
+    for name, value in vars(settings).items():
+        globals().setdefault(name, value)
+    _loaded = True
+    return settings
+
+
+def configure(settings: Settings = None, **overrides):
+    """
+    Install explicit settings, replacing any loaded ones.
+    
+    Args:
+        settings: Full set of settings (defaults to the environment's)
+        **overrides: Individual settings to set on top, e.g. OUTPUT_DIR='/tmp/x'
+    """
+    global _loaded
+    if settings is None:
+        settings = Settings.from_env() if _loaded else load()
+    for name in DERIVED_PATHS:
+        # An explicit path from an earlier configure() must not outlive it
+        globals().pop(name, None)
+    globals().update(vars(settings))
+    globals().update(overrides)
+    _loaded = True
+
+
+def __getattr__(name: str):
+    """Load the settings on first access to any of them."""
+    if name.isupper() and not _loaded:
+        load()
+        if name in globals():
+            return globals()[name]
+    if name in DERIVED_PATHS and _loaded:
+        return os.path.join(globals()['OUTPUT_DIR'], DERIVED_PATHS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Validation
 def validate_config():
     """Validate that required configuration is present."""
+    if not _loaded:
+        load()
     errors = []
     
     if not GROUP_URL:
@@ -67,10 +260,18 @@ def validate_config():
     if not has_cookies and not has_credentials:
         errors.append("Authentication required: Either provide CODEFORCES_SESSION + CODEFORCES_39CE7 cookies, or USERNAME + PASSWORD")
     
+    if DATA_SOURCE not in ('html', 'api'):
+        errors.append(f"DATA_SOURCE must be 'html' or 'api', got '{DATA_SOURCE}'")
+    
+    try:
+        ZoneInfo(CF_TIMEZONE)
+    except (ValueError, ZoneInfoNotFoundError):
+        errors.append(f"CF_TIMEZONE must be an IANA time zone name like 'Asia/Kolkata', got '{CF_TIMEZONE}'")
+    
+    if bool(CF_API_KEY) != bool(CF_API_SECRET):
+        errors.append("CF_API_KEY and CF_API_SECRET must be set together")
+    
     if errors:
         raise ValueError(f"Configuration errors:\n" + "\n".join(f"  - {e}" for e in errors))
     
     return True
-
-# Create output directory if it doesn't exist
-os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -0,0 +1,282 @@
+"""
+Contest snapshot file formats for the Clash of Codes scraper.
+Reads and writes the pretty-printed JSON format and a compact columnar
+binary format, always through an atomic temp-file-and-rename.
+
+Compact format (.ccz) layout:
+    b'CCZ1' + zlib( uint32 header length + header JSON + column arrays )
+
+The header holds the interned string tables (handles, problem indices,
+statuses, tag sets) and the column lengths. The columns are little-endian
+int32/uint32 arrays: rank, solved and attempted per participant, then
+participant, problem, time, status and tag-set indices per solve event.
+A value that is not an int32 (a fractional IOI score, a null time) is
+stored in the header next to the row's other extra keys instead. A record
+that lacks one of the column keys, or has its keys in an unusual order,
+also gets its key list in the header, and decoding restores exactly those
+keys in that order.
+"""
+
+import os
+import sys
+import json
+import stat
+import zlib
+import functools
+import struct
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+COMPACT_MAGIC = b'CCZ1'
+COMPACT_SUFFIX = '.ccz'
+JSON_SUFFIX = '.json'
+
+# Keys encoded as columns; anything else is carried through verbatim
+_CONTEST_KEYS = ('contestId', 'title', 'participants')
+_PARTICIPANT_KEYS = ('rank', 'solved', 'attempted', 'solveTimeline')
+_EVENT_KEYS = ('problem', 'time', 'status', 'tags')
+
+_PARTICIPANT_COLUMNS = ('rank', 'solved', 'attempted')
+_INT32_MIN = -2 ** 31
+_INT32_MAX = 2 ** 31 - 1
+_EVENT_COLUMNS = (('participant', 'I'), ('problem', 'I'), ('time', 'i'), ('status', 'I'), ('tags', 'I'))
+
+
+def atomic_write(path: Path, data: bytes):
+    """
+    Write bytes to path through a temp file in the same directory.
+    
+    The temp file name starts with '.', so contest_* globs never see it, and
+    os.replace makes the new content appear all at once. A crash mid-write
+    leaves the previous file (or no file) instead of a truncated one.
+    
+    The file keeps the mode of the file it replaces, and a new file gets the
+    mode open() would give it (0666 less the umask) rather than mkstemp's
+    0600, so readers such as a web server can still open it.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            if hasattr(os, 'fchmod'):
+                os.fchmod(f.fileno(), _file_mode(path))
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _file_mode(path: Path) -> int:
+    """Permission bits for a file written to path."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_umask()
+
+
+@functools.lru_cache(maxsize=None)
+def _umask() -> int:
+    """The process umask, read once."""
+    # Linux reports it without changing it; setting it, even briefly, races with other threads' writes
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('Umask:'):
+                    return int(line.split()[1], 8)
+    except OSError:
+        pass
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+def encode_json(contest_data: Dict[str, Any]) -> bytes:
+    """Serialize a contest in the human-readable JSON format."""
+    return json.dumps(contest_data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _pack(typecode: str, values: List[int]) -> bytes:
+    column = array(typecode, values)
+    if sys.byteorder == 'big':
+        column.byteswap()
+    return column.tobytes()
+
+
+def _unpack(typecode: str, data: bytes, offset: int, count: int) -> Tuple[array, int]:
+    column = array(typecode)
+    end = offset + count * column.itemsize
+    column.frombytes(data[offset:end])
+    if sys.byteorder == 'big':
+        column.byteswap()
+    return column, end
+
+
+def _column_value(record: Dict[str, Any], name: str, extra: Dict[str, Any]) -> int:
+    """
+    The value of an int32 column. Anything else (a float score, None, a
+    huge number) is carried verbatim in extra, which the decoder applies
+    over the placeholder 0, so it comes back unchanged. A missing key is
+    also 0; the record's key list then tells the decoder to drop it.
+    """
+    if name not in record:
+        return 0
+    value = record[name]
+    if type(value) is int and _INT32_MIN <= value <= _INT32_MAX:
+        return value
+    extra[name] = value
+    return 0
+
+
+def _unusual_keys(record: Dict[str, Any], columns: Tuple[str, ...]) -> Any:
+    """
+    The record's keys if decoding would not rebuild them as they are (all
+    column keys first, then the extra ones in order), otherwise None.
+    """
+    keys = list(record)
+    if keys[:len(columns)] == list(columns) and not any(key in columns for key in keys[len(columns):]):
+        return None
+    return keys
+
+
+def encode_compact(contest_data: Dict[str, Any]) -> bytes:
+    """Serialize a contest in the compact columnar binary format."""
+    handles = []
+    participant_columns = {name: [] for name in _PARTICIPANT_COLUMNS}
+    event_columns = {name: [] for name, _ in _EVENT_COLUMNS}
+    problems: Dict[str, int] = {}
+    statuses: Dict[str, int] = {}
+    tag_sets: Dict[Tuple[str, ...], int] = {}
+    participant_extra = {}
+    event_extra = {}
+    participant_keys = {}
+    event_keys = {}
+    
+    for position, (handle, data) in enumerate(contest_data.get('participants', {}).items()):
+        handles.append(handle)
+        extra = {k: v for k, v in data.items() if k not in _PARTICIPANT_KEYS}
+        for name in _PARTICIPANT_COLUMNS:
+            participant_columns[name].append(_column_value(data, name, extra))
+        if extra:
+            participant_extra[str(position)] = extra
+        keys = _unusual_keys(data, _PARTICIPANT_KEYS)
+        if keys is not None:
+            participant_keys[str(position)] = keys
+        
+        for event in data.get('solveTimeline', []):
+            index = str(len(event_columns['time']))
+            tags = tuple(event.get('tags', []))
+            event_columns['participant'].append(position)
+            # A missing problem or status is looked up as None and dropped again by the key list
+            event_columns['problem'].append(problems.setdefault(event.get('problem'), len(problems)))
+            extra = {k: v for k, v in event.items() if k not in _EVENT_KEYS}
+            event_columns['time'].append(_column_value(event, 'time', extra))
+            event_columns['status'].append(statuses.setdefault(event.get('status'), len(statuses)))
+            event_columns['tags'].append(tag_sets.setdefault(tags, len(tag_sets)))
+            if extra:
+                event_extra[index] = extra
+            keys = _unusual_keys(event, _EVENT_KEYS)
+            if keys is not None:
+                event_keys[index] = keys
+    
+    header = {
+        'contestId': contest_data.get('contestId'),
+        'title': contest_data.get('title'),
+        'keys': list(contest_data.keys()),
+        'extra': {k: v for k, v in contest_data.items() if k not in _CONTEST_KEYS},
+        'handles': handles,
+        'problems': list(problems),
+        'statuses': list(statuses),
+        'tagSets': [list(tags) for tags in tag_sets],
+        'events': len(event_columns['time']),
+        'participantExtra': participant_extra,
+        'eventExtra': event_extra,
+        'participantKeys': participant_keys,
+        'eventKeys': event_keys,
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    
+    payload = [struct.pack('<I', len(header_bytes)), header_bytes]
+    payload += [_pack('i', participant_columns[name]) for name in _PARTICIPANT_COLUMNS]
+    payload += [_pack(typecode, event_columns[name]) for name, typecode in _EVENT_COLUMNS]
+    return COMPACT_MAGIC + zlib.compress(b''.join(payload), 9)
+
+
+def decode_compact(data: bytes) -> Dict[str, Any]:
+    """Rebuild the normal contest dict from the compact binary format."""
+    if data[:len(COMPACT_MAGIC)] != COMPACT_MAGIC:
+        raise ValueError("Not a compact contest file")
+    payload = zlib.decompress(data[len(COMPACT_MAGIC):])
+    
+    (header_length,) = struct.unpack_from('<I', payload, 0)
+    offset = 4 + header_length
+    header = json.loads(payload[4:offset].decode('utf-8'))
+    
+    handles = header['handles']
+    columns = {}
+    for name in _PARTICIPANT_COLUMNS:
+        columns[name], offset = _unpack('i', payload, offset, len(handles))
+    events = {}
+    for name, typecode in _EVENT_COLUMNS:
+        events[name], offset = _unpack(typecode, payload, offset, header['events'])
+    
+    problems = header['problems']
+    statuses = header['statuses']
+    tag_sets = header['tagSets']
+    participant_extra = header['participantExtra']
+    event_extra = header['eventExtra']
+    # Files written before key lists were recorded have none
+    participant_keys = header.get('participantKeys', {})
+    event_keys = header.get('eventKeys', {})
+    
+    timelines: List[List[Dict[str, Any]]] = [[] for _ in handles]
+    for i in range(header['events']):
+        event = {
+            'problem': problems[events['problem'][i]],
+            'time': events['time'][i],
+            'status': statuses[events['status'][i]],
+            'tags': list(tag_sets[events['tags'][i]])
+        }
+        event.update(event_extra.get(str(i), {}))
+        keys = event_keys.get(str(i))
+        if keys is not None:
+            event = {key: event[key] for key in keys}
+        timelines[events['participant'][i]].append(event)
+    
+    participants = {}
+    for position, handle in enumerate(handles):
+        participant = {
+            'rank': columns['rank'][position],
+            'solved': columns['solved'][position],
+            'attempted': columns['attempted'][position],
+            'solveTimeline': timelines[position]
+        }
+        participant.update(participant_extra.get(str(position), {}))
+        keys = participant_keys.get(str(position))
+        if keys is not None:
+            participant = {key: participant[key] for key in keys}
+        participants[handle] = participant
+    
+    values = dict(header['extra'])
+    values.update(contestId=header['contestId'], title=header['title'], participants=participants)
+    return {key: values[key] for key in header['keys']}
+
+
+def read_contest_file(path: Path) -> Dict[str, Any]:
+    """Read a contest file in either format, chosen by its suffix."""
+    path = Path(path)
+    data = path.read_bytes()
+    if path.suffix == COMPACT_SUFFIX:
+        return decode_compact(data)
+    return json.loads(data.decode('utf-8'))
+
+
+def contest_path(output_dir: str, contest_id: str, compact: bool = False) -> Path:
+    """Path of a contest snapshot in the given format."""
+    suffix = COMPACT_SUFFIX if compact else JSON_SUFFIX
+    return Path(output_dir) / f"contest_{contest_id}{suffix}"
@@ -0,0 +1,118 @@
+"""
+Incremental contest-list discovery for the Clash of Codes scraper.
+Walks the group's paginated contest list newest first, stops at the first
+page that reaches the previously discovered (cached) list, and caches the
+merged list for CONTEST_LIST_TTL seconds. Contest info dicts carry the start time
+and duration shown in the list when available.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+import config
+import utils
+from contest_io import atomic_write
+from utils import logger
+
+
+def load_cached_list(group_url: str, cache_path: str = None) -> Optional[Dict[str, Any]]:
+    """The cached discovery result for a group, or None if there is none."""
+    try:
+        with open(Path(cache_path or config.CONTEST_LIST_CACHE_PATH), 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return cached if cached.get('groupUrl') == group_url else None
+
+
+def save_cached_list(group_url: str, contests: List[Dict[str, Any]], cache_path: str = None):
+    """Store the discovered contest list with the time it was discovered."""
+    cached = {'groupUrl': group_url, 'discoveredAt': time.time(), 'contests': contests}
+    atomic_write(Path(cache_path or config.CONTEST_LIST_CACHE_PATH),
+                 json.dumps(cached, ensure_ascii=False, indent=2).encode('utf-8'))
+
+
+def discover_contests(session: utils.CodeforcesSession, group_url: str, group_id: str = None,
+                      wanted_ids: Set[str] = None, use_cache: bool = True) -> Optional[List[Dict[str, Any]]]:
+    """
+    List every contest of the group, newest first.
+    
+    A cached list younger than config.CONTEST_LIST_TTL is returned as is,
+    unless it lacks one of wanted_ids. Otherwise pages are fetched in order
+    until one contains a contest of the cached list, since the cached list
+    was complete and so holds every older contest; the new contests are put
+    in front of the cached ones. Saved contests do not end the walk: they
+    may have been scraped from a filtered or partial list. Without a cached
+    list every page is fetched, or only as many as it takes to see every
+    one of wanted_ids, in which case the list is not cached.
+    
+    Args:
+        session: Authenticated session
+        group_url: URL of the group's contest list
+        group_id: Group ID for URL construction
+        wanted_ids: IDs the caller needs (CONTEST_IDS, refresh targets), if
+            it only needs some contests
+        use_cache: Read and update the discovery cache
+    
+    Returns:
+        List of contest info dicts, or None if the first page could not be fetched
+    """
+    cached = load_cached_list(group_url) if use_cache else None
+    cached_contests = cached['contests'] if cached else []
+    cached_ids = {contest['id'] for contest in cached_contests}
+    if cached and time.time() - cached['discoveredAt'] < config.CONTEST_LIST_TTL:
+        if cached_ids >= set(wanted_ids or ()):
+            logger.info(f"Using cached contest list ({len(cached_contests)} contests)")
+            return cached_contests
+        logger.info("Cached contest list lacks requested contests, rediscovering")
+    
+    discovered: List[Dict[str, Any]] = []
+    seen: Set[str] = set()
+    page = 1
+    last_page = 1
+    pages_fetched = 0
+    complete = True
+    
+    while page <= last_page:
+        url = utils.contest_list_page_url(group_url, page)
+        logger.info(f"Fetching contest list page {page}: {url}")
+        response = session.get(url)
+        if not response:
+            if page == 1:
+                return None
+            logger.warning(f"Failed to fetch contest list page {page}, using what was found so far")
+            # Caching a list with a gap would hide the missing pages from later runs
+            complete = False
+            break
+        pages_fetched += 1
+        
+        if page == 1:
+            last_page = utils.extract_contest_list_page_count(response.text)
+        
+        page_contests = utils.extract_contest_list(response.text, group_id)
+        schedule = utils.extract_contest_schedule(response.text)
+        for contest in page_contests:
+            contest.update(schedule.get(contest['id'], {}))
+            if contest['id'] not in seen:
+                seen.add(contest['id'])
+                discovered.append(contest)
+        
+        if any(contest['id'] in cached_ids for contest in page_contests):
+            if page < last_page:
+                logger.info(f"Reached the cached contest list on page {page} of {last_page}, stopping")
+            break
+        if wanted_ids and seen >= wanted_ids and page < last_page:
+            logger.info(f"Found every requested contest by page {page} of {last_page}, stopping")
+            # Older pages were skipped, so this list must not stand in for the full one
+            complete = False
+            break
+        page += 1
+    
+    contests = discovered + [contest for contest in cached_contests if contest['id'] not in seen]
+    logger.info(f"Discovered {len(discovered)} contests on {pages_fetched} page(s), {len(contests)} in total")
+    
+    if use_cache and complete:
+        save_cached_list(group_url, contests)
+    return contests
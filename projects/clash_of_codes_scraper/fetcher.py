@@ -0,0 +1,46 @@
+"""
+Asyncio fetch engine for the Clash of Codes scraper.
+Runs blocking CodeforcesSession requests on a bounded thread pool so that
+several contests can be downloaded at the same time.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import requests
+
+import config
+import utils
+
+
+class AsyncFetcher:
+    """Concurrency-limited asyncio wrapper around an authenticated CodeforcesSession."""
+    
+    def __init__(self, session: utils.CodeforcesSession, max_concurrency: int = None):
+        self.session = session
+        self.max_concurrency = max(1, max_concurrency or config.MAX_CONCURRENCY)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix='cf-fetch'
+        )
+    
+    async def get(self, url: str) -> Optional[requests.Response]:
+        """
+        Fetch a URL without blocking the event loop.
+        
+        At most max_concurrency requests are in flight at once; the rest
+        wait for a free worker thread.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.session.get, url)
+    
+    def close(self):
+        """Shut down the worker threads."""
+        self._executor.shutdown(wait=True)
+    
+    async def __aenter__(self) -> 'AsyncFetcher':
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
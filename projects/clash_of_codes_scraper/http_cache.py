@@ -0,0 +1,149 @@
+"""
+On-disk HTTP response cache for the Clash of Codes scraper.
+Stores validators and compressed bodies per URL, serves fresh entries
+without a request and revalidates stale ones with conditional GETs.
+"""
+
+from __future__ import annotations
+
+import re
+import json
+import time
+import zlib
+import hashlib
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import config
+import metrics
+from contest_io import atomic_write
+
+if TYPE_CHECKING:
+    import requests
+
+# Response headers kept alongside the cached body
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+class ResponseCache:
+    """URL-keyed response cache with per-URL-pattern TTLs."""
+    
+    def __init__(self, cache_dir: str = None, ttl_rules: List[Tuple[str, int]] = None):
+        self.cache_dir = Path(cache_dir or config.HTTP_CACHE_DIR)
+        rules = config.HTTP_CACHE_TTLS if ttl_rules is None else ttl_rules
+        self.ttl_rules = [(re.compile(pattern), ttl) for pattern, ttl in rules]
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0}
+        self._lock = threading.Lock()
+    
+    def ttl_for(self, url: str) -> int:
+        """Seconds a cached response for this URL is served without revalidation."""
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(url):
+                return ttl
+        return config.HTTP_CACHE_DEFAULT_TTL
+    
+    def _paths(self, url: str) -> Tuple[Path, Path]:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = self.cache_dir / key[:2] / key
+        return base.with_suffix('.json'), base.with_suffix('.body.z')
+    
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Return the cached metadata for a URL, or None if it is not cached."""
+        meta_path, body_path = self._paths(url)
+        if not meta_path.exists() or not body_path.exists():
+            return None
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def is_fresh(self, url: str, entry: Dict) -> bool:
+        """True if the entry is still within its TTL."""
+        return time.time() - entry['storedAt'] < self.ttl_for(url)
+    
+    @staticmethod
+    def conditional_headers(entry: Dict) -> Dict[str, str]:
+        """Validators to send when revalidating a cached entry."""
+        headers = {}
+        stored = entry.get('headers', {})
+        if stored.get('ETag'):
+            headers['If-None-Match'] = stored['ETag']
+        if stored.get('Last-Modified'):
+            headers['If-Modified-Since'] = stored['Last-Modified']
+        return headers
+    
+    def store(self, url: str, response: requests.Response):
+        """Save a 200 response body and its validators."""
+        meta_path, body_path = self._paths(url)
+        entry = {
+            'url': url,
+            'storedAt': time.time(),
+            'encoding': response.encoding,
+            'headers': {h: response.headers[h] for h in STORED_HEADERS if h in response.headers},
+        }
+        atomic_write(body_path, zlib.compress(response.content))
+        atomic_write(meta_path, json.dumps(entry).encode('utf-8'))
+    
+    def refresh(self, url: str, entry: Dict, not_modified: requests.Response) -> Dict:
+        """Restart the TTL of an entry after a 304, taking any new validators."""
+        meta_path, _ = self._paths(url)
+        entry['storedAt'] = time.time()
+        for header in ('ETag', 'Last-Modified'):
+            if header in not_modified.headers:
+                entry['headers'][header] = not_modified.headers[header]
+        atomic_write(meta_path, json.dumps(entry).encode('utf-8'))
+        return entry
+    
+    def _body(self, url: str) -> Optional[bytes]:
+        _, body_path = self._paths(url)
+        try:
+            return zlib.decompress(body_path.read_bytes())
+        except (OSError, zlib.error):
+            return None
+    
+    def text(self, url: str) -> Optional[str]:
+        """
+        Decoded body of a cached URL regardless of its age, or None.
+        
+        Lets cached pages be re-read offline without importing requests.
+        """
+        entry = self.lookup(url)
+        body = self._body(url) if entry else None
+        if body is None:
+            return None
+        return body.decode(entry.get('encoding') or 'utf-8', errors='replace')
+    
+    def to_response(self, url: str, entry: Dict) -> Optional[requests.Response]:
+        """Rebuild a requests.Response from a cache entry."""
+        import requests
+        from requests.structures import CaseInsensitiveDict
+        
+        body = self._body(url)
+        if body is None:
+            return None
+        
+        response = requests.Response()
+        response.status_code = 200
+        response._content = body
+        response.url = url
+        response.encoding = entry.get('encoding')
+        response.headers = CaseInsensitiveDict(entry.get('headers', {}))
+        return response
+    
+    def record(self, outcome: str):
+        """Count a 'hits', 'revalidated' or 'misses' outcome."""
+        metrics.registry.inc('http_cache', result=outcome)
+        with self._lock:
+            self.stats[outcome] += 1
+            if outcome == 'revalidated':
+                self.stats['hits'] += 1
+    
+    def summary(self) -> str:
+        """One-line description of the hit/miss counters."""
+        total = self.stats['hits'] + self.stats['misses']
+        rate = self.stats['hits'] / total if total else 0.0
+        return (f"{self.stats['hits']} hits ({self.stats['revalidated']} revalidated), "
+                f"{self.stats['misses']} misses, {rate:.0%} hit rate")
+
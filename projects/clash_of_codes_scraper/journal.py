@@ -0,0 +1,131 @@
+"""
+Write-ahead job journal for the Clash of Codes scraper.
+
+Every run starts the journal (JOURNAL_PATH) over with a header listing the
+contests it is about to scrape, then appends one JSON line per state
+change of a contest: queued, fetched, parsed, written, or failed with a
+reason. Lines are appended before the pipeline moves on, and written and
+failed are fsynced, so after a crash, Ctrl-C or eviction the journal says
+exactly which contests finished. scraper.py --resume reads it back and
+scrapes only the contests that failed or never finished, without
+discovering the contest list again.
+"""
+
+import os
+import json
+import time
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import config
+from contest_io import atomic_write
+
+# Contest fields kept in the header, enough to fetch the contest again
+CONTEST_FIELDS = ('id', 'title', 'url', 'startTime', 'duration')
+
+
+class Journal:
+    """Append-only JSON Lines log of one run's contest states."""
+    
+    def __init__(self, path: str = None):
+        self.path = Path(path or config.JOURNAL_PATH)
+        self._file = None
+        self._lock = threading.Lock()
+    
+    def start(self, contests: List[Dict[str, Any]], refresh: bool = False) -> str:
+        """
+        Begin a new run: replace the journal with a header and mark every
+        contest queued.
+        
+        Returns:
+            The run ID
+        """
+        run_id = time.strftime('%Y%m%d-%H%M%S')
+        header = {
+            'event': 'run',
+            'runId': run_id,
+            'startedAt': round(time.time(), 3),
+            'refresh': refresh,
+            'source': config.DATA_SOURCE,
+            'contests': [{field: contest[field] for field in CONTEST_FIELDS if field in contest}
+                         for contest in contests],
+        }
+        lines = [header] + [{'id': contest['id'], 'state': 'queued'} for contest in contests]
+        atomic_write(self.path, b''.join(_line(record) for record in lines))
+        return run_id
+    
+    def resume(self):
+        """Continue the run in the journal; later records append to it."""
+        self._append({'event': 'resume', 'at': round(time.time(), 3)}, sync=True)
+    
+    def record(self, contest_id: str, state: str, reason: str = None):
+        """Append a state change of a contest."""
+        record = {'id': str(contest_id), 'state': state, 'at': round(time.time(), 3)}
+        if reason:
+            record['reason'] = reason
+        self._append(record, sync=state in ('written', 'failed'))
+    
+    def _append(self, record: Dict[str, Any], sync: bool = False):
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'ab')
+                if self._file.tell() and not _ends_with_newline(self.path):
+                    # Close off a line torn by a crash so it cannot swallow the next one
+                    self._file.write(b'\n')
+            self._file.write(_line(record))
+            self._file.flush()
+            if sync:
+                os.fsync(self._file.fileno())
+    
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def _ends_with_newline(path: Path) -> bool:
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+
+def _line(record: Dict[str, Any]) -> bytes:
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+def load(path: str = None) -> Optional[Dict[str, Any]]:
+    """
+    Read the journal back.
+    
+    A line torn by a crash mid-write is ignored.
+    
+    Returns:
+        None if there is no journal, else the header plus 'states'
+        (contest ID -> last state) and 'reasons' (contest ID -> failure reason)
+    """
+    try:
+        with open(path or config.JOURNAL_PATH, 'rb') as f:
+            raw_lines = f.read().splitlines()
+    except FileNotFoundError:
+        return None
+    
+    run = None
+    for raw in raw_lines:
+        try:
+            record = json.loads(raw)
+        except ValueError:
+            continue
+        if record.get('event') == 'run':
+            run = dict(record, states={}, reasons={})
+        elif run is not None and 'state' in record:
+            run['states'][record['id']] = record['state']
+            if record['state'] == 'failed':
+                run['reasons'][record['id']] = record.get('reason')
+    return run
+
+
+def unfinished(run: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Contests of a run that were not written: failed, or interrupted at any stage."""
+    return [contest for contest in run['contests'] if run['states'].get(contest['id']) != 'written']
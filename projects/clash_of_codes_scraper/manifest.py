@@ -0,0 +1,273 @@
+"""
+Manifest index of scraped contests for the Clash of Codes scraper.
+
+One JSON file per output directory (manifest.json) records, for every saved
+contest, when it was fetched, a hash of the source pages, the parser that
+produced it, its participant count and the size and hash of each file that
+was written. "Is it already scraped?", "is it stale?" and "is the file
+intact?" are then dictionary lookups plus at most one stat() per file,
+without opening the data files. Changes are kept in memory and the file is
+rewritten atomically by flush(): the scraper calls it when its write queue
+drains (at most every MANIFEST_FLUSH_INTERVAL seconds) and at the end of a
+run, so a backfill of n contests does not rewrite the manifest n times. Any
+unflushed changes are also written at interpreter exit.
+"""
+
+import json
+import time
+import atexit
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import config
+import contest_io
+
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_VERSION = 1
+
+
+def hash_bytes(data: bytes) -> str:
+    """Hex SHA-256 of a byte string."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_source(pages: Iterable[str]) -> str:
+    """Hex SHA-256 over the source pages of a contest, in page order."""
+    digest = hashlib.sha256()
+    for page in pages:
+        digest.update(page.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class Manifest:
+    """In-memory view of manifest.json; changes are written out by flush()."""
+    
+    def __init__(self, output_dir: str = None):
+        self.output_dir = Path(output_dir or config.OUTPUT_DIR)
+        self.path = self.output_dir / MANIFEST_FILE
+        self._lock = threading.Lock()
+        self.exists = self.path.exists()
+        self.dirty = False
+        self.flushed_at = time.monotonic()
+        self.contests: Dict[str, Dict[str, Any]] = {}
+        if self.exists:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.contests = json.load(f).get('contests', {})
+    
+    def _flush(self):
+        data = {'version': MANIFEST_VERSION, 'contests': self.contests}
+        contest_io.atomic_write(self.path, json.dumps(data, ensure_ascii=False, indent=1, sort_keys=True).encode('utf-8'))
+        self.exists = True
+        self.dirty = False
+        self.flushed_at = time.monotonic()
+    
+    def flush(self, min_interval: float = 0) -> bool:
+        """
+        Write pending changes to manifest.json.
+        
+        Args:
+            min_interval: Skip the write if the last one was less than this
+                many seconds ago (the changes stay pending)
+        
+        Returns:
+            True if the file was written
+        """
+        with self._lock:
+            if not self.dirty or time.monotonic() - self.flushed_at < min_interval:
+                return False
+            self._flush()
+            return True
+    
+    def __contains__(self, contest_id: str) -> bool:
+        return str(contest_id) in self.contests
+    
+    def get(self, contest_id: str) -> Optional[Dict[str, Any]]:
+        """The manifest entry of a contest, or None."""
+        return self.contests.get(str(contest_id))
+    
+    def contest_ids(self) -> List[str]:
+        """IDs of every recorded contest."""
+        return list(self.contests)
+    
+    def record(self, contest_data: Dict[str, Any], files: Dict[str, Dict[str, Any]],
+               source_hash: str = None, parser_version: str = None, fetched_at: float = None):
+        """
+        Record a contest that was just saved.
+        
+        Args:
+            contest_data: The saved contest
+            files: File name -> {'bytes', 'sha256'} of every file written
+                (empty when the contest only went to SQLite)
+            source_hash: hash_source() of the pages it was parsed from
+            parser_version: Parser that produced it, e.g. 'lxml/1'
+            fetched_at: When the source was fetched (defaults to now)
+        """
+        contest_id = str(contest_data['contestId'])
+        entry = {
+            'contestId': contest_id,
+            'title': contest_data.get('title'),
+            'fetchedAt': round(fetched_at or time.time(), 3),
+            'savedAt': round(time.time(), 3),
+            'sourceHash': source_hash,
+            'parserVersion': parser_version,
+            'participants': len(contest_data.get('participants', {})),
+            'files': files,
+        }
+        if 'type' in contest_data:
+            entry['type'] = contest_data['type']
+        with self._lock:
+            self.contests[contest_id] = entry
+            self.dirty = True
+    
+    def touch(self, contest_id: str, source_hash: str = None, fetched_at: float = None):
+        """Mark a contest as re-fetched without changes (savedAt stays)."""
+        with self._lock:
+            entry = self.contests.get(str(contest_id))
+            if entry is None:
+                return
+            entry['fetchedAt'] = round(fetched_at or time.time(), 3)
+            if source_hash:
+                entry['sourceHash'] = source_hash
+            self.dirty = True
+    
+    def remove(self, contest_id: str):
+        with self._lock:
+            if self.contests.pop(str(contest_id), None) is not None:
+                self.dirty = True
+    
+    def is_stale(self, contest_id: str, max_age: float) -> bool:
+        """True if the contest is missing or was fetched more than max_age seconds ago."""
+        entry = self.get(contest_id)
+        return entry is None or time.time() - entry['fetchedAt'] > max_age
+    
+    def source_unchanged(self, contest_id: str, source_hash: str, parser_version: str) -> bool:
+        """True if the saved contest came from the same pages through the same parser."""
+        entry = self.get(contest_id)
+        return (entry is not None and entry.get('sourceHash') == source_hash
+                and entry.get('parserVersion') == parser_version)
+    
+    def verify(self, contest_id: str, deep: bool = False) -> List[str]:
+        """
+        Check that a contest's files are intact.
+        
+        The quick check compares each file's size with the recorded one (one
+        stat() per file). deep=True also re-hashes the contents.
+        
+        Returns:
+            List of problems found (empty if the contest is intact)
+        """
+        entry = self.get(contest_id)
+        if entry is None:
+            return [f"contest {contest_id} is not in the manifest"]
+        
+        problems = []
+        for name, recorded in entry['files'].items():
+            path = self.output_dir / name
+            try:
+                size = path.stat().st_size
+            except FileNotFoundError:
+                problems.append(f"{name} is missing")
+                continue
+            if size != recorded['bytes']:
+                problems.append(f"{name} is {size} bytes, expected {recorded['bytes']}")
+            elif deep and recorded.get('sha256') and hash_bytes(path.read_bytes()) != recorded['sha256']:
+                problems.append(f"{name} does not match its recorded hash")
+        return problems
+    
+    def rebuild_from_files(self, stored: Dict[str, Dict[str, Any]] = None, stored_at: float = None,
+                           flush: bool = True) -> int:
+        """
+        Create entries for contest files saved before the manifest existed.
+        
+        Each file is read once; fetchedAt and savedAt are its modification
+        time and the source hash and parser version are unknown.
+        
+        Args:
+            stored: Contests that only exist in another backend (e.g. SQLite),
+                as contest ID -> {'title', 'participants'} plus optional 'type'
+            stored_at: When that backend was last written (its fetchedAt and
+                savedAt; defaults to now)
+            flush: Write the manifest right away; False only builds the
+                entries in memory
+        
+        Returns:
+            Number of contests added
+        """
+        added = 0
+        with self._lock:
+            paths = sorted(self.output_dir.glob('contest_*.json')) + \
+                sorted(self.output_dir.glob(f'contest_*{contest_io.COMPACT_SUFFIX}'))
+            for path in paths:
+                try:
+                    data = path.read_bytes()
+                    contest_data = (contest_io.decode_compact(data) if path.suffix == contest_io.COMPACT_SUFFIX
+                                    else json.loads(data.decode('utf-8')))
+                except Exception:
+                    # Unreadable (e.g. truncated) files stay out, so they are scraped again
+                    continue
+                contest_id = str(contest_data.get('contestId', path.stem.replace('contest_', '')))
+                entry = self.contests.get(contest_id)
+                if entry is None:
+                    entry = self.contests[contest_id] = {
+                        'contestId': contest_id,
+                        'title': contest_data.get('title'),
+                        'fetchedAt': round(path.stat().st_mtime, 3),
+                        'savedAt': round(path.stat().st_mtime, 3),
+                        'sourceHash': None,
+                        'parserVersion': None,
+                        'participants': len(contest_data.get('participants', {})),
+                        'files': {},
+                    }
+                    if 'type' in contest_data:
+                        entry['type'] = contest_data['type']
+                    added += 1
+                entry['files'][path.name] = {'bytes': len(data), 'sha256': hash_bytes(data)}
+            
+            stored_at = round(stored_at or time.time(), 3)
+            for contest_id, summary in (stored or {}).items():
+                contest_id = str(contest_id)
+                if contest_id not in self.contests:
+                    entry = self.contests[contest_id] = {
+                        'contestId': contest_id,
+                        'title': summary.get('title'),
+                        'fetchedAt': stored_at,
+                        'savedAt': stored_at,
+                        'sourceHash': None,
+                        'parserVersion': None,
+                        'participants': summary.get('participants'),
+                        'files': {},
+                    }
+                    if 'type' in summary:
+                        entry['type'] = summary['type']
+                    added += 1
+            
+            if added:
+                self.dirty = True
+            if flush and (self.dirty or self.exists):
+                self._flush()
+        return added
+
+
+_manifests: Dict[Path, Manifest] = {}
+_manifests_lock = threading.Lock()
+
+
+@atexit.register
+def _flush_all():
+    """Write out changes that no flush() call picked up (e.g. a one-off save_contest())."""
+    with _manifests_lock:
+        manifests = list(_manifests.values())
+    for manifest in manifests:
+        manifest.flush()
+
+
+def get_manifest(output_dir: str = None) -> Manifest:
+    """The shared Manifest of an output directory, loaded on first use."""
+    key = Path(output_dir or config.OUTPUT_DIR).resolve()
+    with _manifests_lock:
+        if key not in _manifests:
+            _manifests[key] = Manifest(output_dir)
+        return _manifests[key]
@@ -0,0 +1,248 @@
+"""
+Run metrics for the Clash of Codes scraper.
+
+A process-wide registry of counters, gauges and histograms fed by the
+session (per-request latency, bytes, status codes, retries, throttling,
+time spent waiting for the rate limiter), the HTTP cache and the pipeline
+(per-contest fetch, parse and write time, rows parsed). At the end of a run,
+and every METRICS_INTERVAL seconds during it, the registry is exported as a
+JSON run report and as a Prometheus textfile (for node_exporter's textfile
+collector), which shows whether a slow run was spent on the network, on
+throttling or in the parser.
+"""
+
+import json
+import time
+import asyncio
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import config
+from contest_io import atomic_write
+
+PREFIX = 'clash_scraper_'
+
+SECONDS_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+BYTES_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+# name -> (type, help, histogram buckets)
+METRICS = {
+    'requests': ('counter', "HTTP requests sent, by URL kind and status code", None),
+    'request_errors': ('counter', "HTTP requests that failed without a response", None),
+    'request_retries': ('counter', "Request attempts after the first one", None),
+    'throttled': ('counter', "429/503 responses and API call-limit errors", None),
+    'request_seconds': ('histogram', "Latency of one HTTP request", SECONDS_BUCKETS),
+    'response_bytes': ('histogram', "Size of one HTTP response body", BYTES_BUCKETS),
+    'rate_limit_wait_seconds': ('histogram', "Time a request waited for the rate limiter", SECONDS_BUCKETS),
+    'http_cache': ('counter', "HTTP cache lookups, by result", None),
+    'contest_seconds': ('histogram', "Per-contest time in a pipeline stage", SECONDS_BUCKETS),
+    'rows_parsed': ('counter', "Standings rows (participants) parsed", None),
+    'contests': ('counter', "Contests finished, by result", None),
+    'run_started': ('gauge', "Unix time the run started", None),
+    'rows_per_second': ('gauge', "Rows parsed per second of parse time", None),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def url_kind(url: str) -> str:
+    """Coarse label for a Codeforces URL, e.g. 'standings' or 'api'."""
+    for marker, kind in (('/api/', 'api'), ('/standings', 'standings'), ('/status', 'status'),
+                         ('/problem/', 'problem'), ('/enter', 'login'), ('/contests', 'contest_list')):
+        if marker in url:
+            return kind
+    return 'other'
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+    
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+    
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[position] += 1
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None if empty or beyond the last bucket)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, count in zip(self.buckets, self.counts):
+            if count >= rank:
+                return bound
+        return None
+
+
+class MetricsRegistry:
+    """Thread-safe store of every metric of the run."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        """Forget everything and start a new run."""
+        with self._lock:
+            self._values: Dict[str, Dict[Labels, Any]] = {name: {} for name in METRICS}
+            self.started_at = time.time()
+        self.set('run_started', round(self.started_at, 3))
+    
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._values[name]
+            series[key] = series.get(key, 0) + amount
+    
+    def set(self, name: str, value: float, **labels):
+        with self._lock:
+            self._values[name][tuple(sorted(labels.items()))] = value
+    
+    def observe(self, name: str, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._values[name]
+            if key not in series:
+                series[key] = Histogram(METRICS[name][2])
+            series[key].observe(value)
+    
+    def total(self, name: str, **labels) -> float:
+        """Sum of a counter (or of a histogram's observations) over the series matching labels."""
+        with self._lock:
+            total = 0
+            for key, value in self._values[name].items():
+                if all(dict(key).get(label) == wanted for label, wanted in labels.items()):
+                    total += value.sum if isinstance(value, Histogram) else value
+            return total
+    
+    def summary(self) -> Dict[str, Any]:
+        """Headline numbers: where the run's time went."""
+        parse_seconds = self.total('contest_seconds', stage='parse')
+        rows = self.total('rows_parsed')
+        return {
+            'durationSeconds': round(time.time() - self.started_at, 3),
+            'requests': int(self.total('requests')),
+            'requestErrors': int(self.total('request_errors')),
+            'retries': int(self.total('request_retries')),
+            'throttled': int(self.total('throttled')),
+            'bytes': int(self.total('response_bytes')),
+            'requestSeconds': round(self.total('request_seconds'), 3),
+            'rateLimitWaitSeconds': round(self.total('rate_limit_wait_seconds'), 3),
+            'fetchSeconds': round(self.total('contest_seconds', stage='fetch'), 3),
+            'parseSeconds': round(parse_seconds, 3),
+            'writeSeconds': round(self.total('contest_seconds', stage='write'), 3),
+            'rowsParsed': int(rows),
+            'rowsPerSecond': round(rows / parse_seconds, 1) if parse_seconds else None,
+        }
+    
+    def to_json(self) -> Dict[str, Any]:
+        """JSON run report: the summary plus every series."""
+        summary = self.summary()
+        metrics = {}
+        with self._lock:
+            for name, series in self._values.items():
+                entries = []
+                for key, value in sorted(series.items()):
+                    entry = {'labels': dict(key)}
+                    if isinstance(value, Histogram):
+                        entry.update({
+                            'count': value.count,
+                            'sum': round(value.sum, 6),
+                            'p50': value.quantile(0.5),
+                            'p95': value.quantile(0.95),
+                            'buckets': dict(zip(map(str, value.buckets), value.counts)),
+                        })
+                    else:
+                        entry['value'] = value
+                    entries.append(entry)
+                if entries:
+                    metrics[name] = entries
+        return {'startedAt': round(self.started_at, 3), 'generatedAt': round(time.time(), 3),
+                'summary': summary, 'metrics': metrics}
+    
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format."""
+        rows_per_second = self.summary()['rowsPerSecond']
+        if rows_per_second is not None:
+            self.set('rows_per_second', rows_per_second)
+        
+        def labels_text(key: Labels, extra: List[Tuple[str, str]] = ()) -> str:
+            pairs = list(key) + list(extra)
+            if not pairs:
+                return ''
+            return '{' + ','.join(f'{name}="{value}"' for name, value in pairs) + '}'
+        
+        lines = []
+        with self._lock:
+            for name, series in self._values.items():
+                if not series:
+                    continue
+                kind, help_text, _ = METRICS[name]
+                full_name = PREFIX + name + ('_total' if kind == 'counter' else '')
+                lines.append(f"# HELP {full_name} {help_text}")
+                lines.append(f"# TYPE {full_name} {kind}")
+                for key, value in sorted(series.items()):
+                    if isinstance(value, Histogram):
+                        for bound, count in zip(value.buckets, value.counts):
+                            lines.append(f"{full_name}_bucket{labels_text(key, [('le', str(bound))])} {count}")
+                        lines.append(f"{full_name}_bucket{labels_text(key, [('le', '+Inf')])} {value.count}")
+                        lines.append(f"{full_name}_sum{labels_text(key)} {value.sum:.6f}")
+                        lines.append(f"{full_name}_count{labels_text(key)} {value.count}")
+                    else:
+                        lines.append(f"{full_name}{labels_text(key)} {value}")
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+@contextmanager
+def timed(name: str, **labels):
+    """Observe the duration of the with-block into a seconds histogram."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.observe(name, time.perf_counter() - start, **labels)
+
+
+def export(report_path: str = None, textfile_path: str = None) -> List[Path]:
+    """
+    Write the JSON run report and the Prometheus textfile.
+    
+    Args:
+        report_path: Defaults to config.METRICS_REPORT ('' disables it)
+        textfile_path: Defaults to config.METRICS_TEXTFILE ('' disables it)
+    
+    Returns:
+        Paths written
+    """
+    report_path = config.METRICS_REPORT if report_path is None else report_path
+    textfile_path = config.METRICS_TEXTFILE if textfile_path is None else textfile_path
+    written = []
+    if report_path:
+        atomic_write(Path(report_path), json.dumps(registry.to_json(), indent=2).encode('utf-8'))
+        written.append(Path(report_path))
+    if textfile_path:
+        atomic_write(Path(textfile_path), registry.to_prometheus().encode('utf-8'))
+        written.append(Path(textfile_path))
+    return written
+
+
+async def export_periodically(interval: float = None):
+    """Export every interval seconds (config.METRICS_INTERVAL) until cancelled."""
+    interval = config.METRICS_INTERVAL if interval is None else interval
+    if interval <= 0:
+        return
+    while True:
+        await asyncio.sleep(interval)
+        await asyncio.to_thread(export)
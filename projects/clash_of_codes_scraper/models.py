@@ -0,0 +1,208 @@
+"""
+Compact in-memory model of contest snapshots.
+
+The JSON shape costs a dict per participant and per solve event, each
+with its own key table, and a fresh tags list per event. For jobs that
+hold a whole group's history in memory, Contest, Participant and
+SolveEvent keep the same data in slotted objects instead:
+
+- handles, problem indices and statuses are interned, so every contest
+  shares one copy of each string;
+- tag lists become interned tuples, so events share one per distinct set;
+- fields a record does not have cost one slot holding MISSING, and keys
+  this module does not know are carried in 'extra', like the compact
+  file format does.
+
+Contest.from_json(data).to_json() == data for every contest the scraper
+writes, key order included, so the JSON files stay the source of truth.
+"""
+
+import sys
+from typing import Any, Dict, Iterator, List, Tuple
+
+import utils
+
+
+class _Missing:
+    """Marks a field that is absent from the JSON (as opposed to null)."""
+    
+    __slots__ = ()
+    
+    def __repr__(self) -> str:
+        return 'MISSING'
+
+
+MISSING = _Missing()
+
+_TAG_SETS: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+def _tags(tags) -> Tuple[str, ...]:
+    """One shared tuple per distinct tag list."""
+    key = tuple(_intern(tag) for tag in tags)
+    return _TAG_SETS.setdefault(key, key)
+
+
+def _extra(data: Dict[str, Any], known: Tuple[str, ...]) -> Any:
+    extra = {key: value for key, value in data.items() if key not in known}
+    return extra or None
+
+
+class SolveEvent:
+    """One solveTimeline entry."""
+    
+    __slots__ = ('problem', 'time', 'status', 'tags', 'submission_id', 'extra')
+    
+    KEYS = ('problem', 'time', 'status', 'tags', 'submissionId')
+    
+    def __init__(self, problem: str, time: int, status: str, tags: Tuple[str, ...] = (),
+                 submission_id: Any = MISSING, extra: Dict[str, Any] = None):
+        self.problem = _intern(problem)
+        self.time = time
+        self.status = _intern(status)
+        self.tags = tags if tags is MISSING else _tags(tags)
+        self.submission_id = submission_id
+        self.extra = extra
+    
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> 'SolveEvent':
+        return cls(data['problem'], data['time'], data['status'], data.get('tags', MISSING),
+                   data.get('submissionId', MISSING), _extra(data, cls.KEYS))
+    
+    def to_json(self) -> Dict[str, Any]:
+        data = {'problem': self.problem, 'time': self.time, 'status': self.status}
+        if self.tags is not MISSING:
+            data['tags'] = list(self.tags)
+        if self.submission_id is not MISSING:
+            data['submissionId'] = self.submission_id
+        if self.extra:
+            data.update(self.extra)
+        return data
+    
+    def __repr__(self) -> str:
+        return f"SolveEvent({self.problem!r}, {self.time}, {self.status!r})"
+
+
+class Participant:
+    """One participant of a contest, with their solve events."""
+    
+    __slots__ = ('handle', 'rank', 'solved', 'attempted', 'timeline',
+                 'rating', 'rank_title', 'avatar', 'extra')
+    
+    KEYS = ('rank', 'solved', 'attempted', 'solveTimeline', 'rating', 'rankTitle', 'avatar')
+    
+    def __init__(self, handle: str, rank: int = 0, solved: int = 0, attempted: Any = MISSING,
+                 timeline: List[SolveEvent] = None, rating: Any = MISSING, rank_title: Any = MISSING,
+                 avatar: Any = MISSING, extra: Dict[str, Any] = None):
+        self.handle = _intern(handle)
+        self.rank = rank
+        self.solved = solved
+        self.attempted = attempted
+        self.timeline = timeline if timeline is not None else []
+        self.rating = rating
+        self.rank_title = _intern(rank_title)
+        self.avatar = avatar
+        self.extra = extra
+    
+    @classmethod
+    def from_json(cls, handle: str, data: Dict[str, Any]) -> 'Participant':
+        return cls(
+            handle,
+            data.get('rank', MISSING),
+            data.get('solved', MISSING),
+            data.get('attempted', MISSING),
+            [SolveEvent.from_json(event) for event in data.get('solveTimeline', [])],
+            data.get('rating', MISSING),
+            data.get('rankTitle', MISSING),
+            data.get('avatar', MISSING),
+            _extra(data, cls.KEYS),
+        )
+    
+    def to_json(self) -> Dict[str, Any]:
+        data = {}
+        for key, value in (('rank', self.rank), ('solved', self.solved), ('attempted', self.attempted)):
+            if value is not MISSING:
+                data[key] = value
+        data['solveTimeline'] = [event.to_json() for event in self.timeline]
+        for key, value in (('rating', self.rating), ('rankTitle', self.rank_title), ('avatar', self.avatar)):
+            if value is not MISSING:
+                data[key] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+    
+    def __repr__(self) -> str:
+        return f"Participant({self.handle!r}, rank={self.rank}, solved={self.solved})"
+
+
+class Contest:
+    """A contest snapshot: its participants in standings (file) order."""
+    
+    __slots__ = ('contest_id', 'title', 'participants', 'contest_type', 'keys', 'extra')
+    
+    KEYS = ('contestId', 'title', 'participants', 'type')
+    
+    def __init__(self, contest_id: str, title: str, participants: List[Participant] = None,
+                 contest_type: Any = MISSING, keys: Tuple[str, ...] = None, extra: Dict[str, Any] = None):
+        self.contest_id = contest_id
+        self.title = title
+        self.participants = participants if participants is not None else []
+        self.contest_type = _intern(contest_type)
+        # Key order of the source dict, only kept when it is not the usual one
+        self.keys = keys
+        self.extra = extra
+    
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> 'Contest':
+        keys = tuple(data)
+        contest = cls(
+            data.get('contestId'),
+            data.get('title'),
+            [Participant.from_json(handle, participant)
+             for handle, participant in data.get('participants', {}).items()],
+            data.get('type', MISSING),
+            extra=_extra(data, cls.KEYS),
+        )
+        if keys != tuple(contest._default_keys()):
+            contest.keys = tuple(_intern(key) for key in keys)
+        return contest
+    
+    def _default_keys(self) -> Iterator[str]:
+        yield from ('contestId', 'title', 'participants')
+        if self.contest_type is not MISSING:
+            yield 'type'
+        yield from self.extra or ()
+    
+    def to_json(self) -> Dict[str, Any]:
+        values = {'contestId': self.contest_id, 'title': self.title, 'type': self.contest_type}
+        values.update(self.extra or {})
+        data = {}
+        for key in self.keys or self._default_keys():
+            if key == 'participants':
+                data[key] = {participant.handle: participant.to_json() for participant in self.participants}
+            else:
+                data[key] = values[key]
+        return data
+    
+    def events(self) -> Iterator[Tuple[Participant, SolveEvent]]:
+        """Every (participant, solve event) pair of the contest."""
+        for participant in self.participants:
+            for event in participant.timeline:
+                yield participant, event
+    
+    def __repr__(self) -> str:
+        return f"Contest({self.contest_id!r}, {self.title!r}, {len(self.participants)} participants)"
+
+
+def load_all(output_dir: str = None) -> List[Contest]:
+    """Every saved contest as a Contest, one file in memory as dicts at a time."""
+    contests = []
+    for contest_id in sorted(utils.load_existing_contests(output_dir)):
+        data = utils.load_contest(contest_id, output_dir)
+        if data is not None:
+            contests.append(Contest.from_json(data))
+    return contests
@@ -0,0 +1,212 @@
+"""
+Problem metadata cache for the Clash of Codes scraper.
+
+Tags, rating and name of every problem, keyed by (contest ID, problem
+index). Lookups go through an in-memory LRU over one JSON file per contest
+under PROBLEM_CACHE_DIR, and only problems missing from both are fetched,
+so each problem costs one request (or one API call per contest) ever.
+utils.write_contest() joins the cached tags into the solve timelines.
+"""
+
+from __future__ import annotations
+
+import re
+import json
+import asyncio
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import config
+from contest_io import atomic_write
+from utils import logger
+
+if TYPE_CHECKING:
+    from cf_api import CodeforcesAPI
+    from fetcher import AsyncFetcher
+
+# Problem page fragments: the statement title ("A. Name") and the sidebar tag boxes
+PROBLEM_TITLE_PATTERN = re.compile(r'<div class="title">\s*(?:[A-Za-z0-9]+\.\s*)?([^<]*?)\s*</div>')
+TAG_BOX_PATTERN = re.compile(r'<span class="tag-box"[^>]*>\s*([^<]*?)\s*</span>')
+
+
+class ProblemCache:
+    """(contest ID, problem index) -> {'name', 'tags', 'rating'}, LRU over disk."""
+    
+    def __init__(self, cache_dir: str = None, capacity: int = None):
+        self.cache_dir = Path(cache_dir or config.PROBLEM_CACHE_DIR)
+        self.capacity = capacity or config.PROBLEM_CACHE_SIZE
+        self._memory: OrderedDict[Tuple[str, str], Dict[str, Any]] = OrderedDict()
+        self._absent: Set[str] = set()  # contests with no file on disk
+        self._lock = threading.Lock()
+        self.stats = {'memory': 0, 'disk': 0, 'misses': 0}
+    
+    def _path(self, contest_id: str) -> Path:
+        return self.cache_dir / f"contest_{contest_id}.json"
+    
+    def _load_contest(self, contest_id: str) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self._path(contest_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _remember(self, key: Tuple[str, str], meta: Dict[str, Any]):
+        self._memory[key] = meta
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+    
+    def get(self, contest_id: str, index: str) -> Optional[Dict[str, Any]]:
+        """Metadata of one problem, or None if it has not been fetched."""
+        key = (str(contest_id), index)
+        with self._lock:
+            meta = self._memory.get(key)
+            if meta is not None:
+                self._memory.move_to_end(key)
+                self.stats['memory'] += 1
+                return meta
+            
+            # One disk read brings in every problem of the contest
+            problems = {} if key[0] in self._absent else self._load_contest(key[0])
+            if not problems:
+                self._absent.add(key[0])
+            for problem_index, problem_meta in problems.items():
+                self._remember((key[0], problem_index), problem_meta)
+            if index in problems:
+                self.stats['disk'] += 1
+                return problems[index]
+            self.stats['misses'] += 1
+            return None
+    
+    def put(self, contest_id: str, problems: Dict[str, Dict[str, Any]]):
+        """Store metadata of some problems of a contest (index -> meta)."""
+        contest_id = str(contest_id)
+        with self._lock:
+            stored = self._load_contest(contest_id)
+            stored.update(problems)
+            self._absent.discard(contest_id)
+            atomic_write(self._path(contest_id), json.dumps(stored, ensure_ascii=False, sort_keys=True).encode('utf-8'))
+            for index, meta in problems.items():
+                self._remember((contest_id, index), meta)
+    
+    def missing(self, contest_id: str, indices: Iterable[str]) -> List[str]:
+        """The problem indices that have no cached metadata yet."""
+        return sorted(index for index in set(indices) if self.get(contest_id, index) is None)
+
+
+_cache: Optional[ProblemCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_problem_cache() -> ProblemCache:
+    """The shared ProblemCache, created on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ProblemCache()
+        return _cache
+
+
+def problem_indices(contest_data: Dict[str, Any]) -> Set[str]:
+    """Problems that appear in any timeline of a contest."""
+    return {
+        event['problem']
+        for participant in contest_data.get('participants', {}).values()
+        for event in participant.get('solveTimeline', [])
+    }
+
+
+def parse_problem_page(html: str) -> Dict[str, Any]:
+    """
+    Name, tags and rating from a problem page.
+    
+    The rating is the '*1500' tag box; it is not kept among the tags.
+    """
+    title = PROBLEM_TITLE_PATTERN.search(html)
+    tags = []
+    rating = None
+    for tag in TAG_BOX_PATTERN.findall(html):
+        if tag.startswith('*') and tag[1:].isdigit():
+            rating = int(tag[1:])
+        elif tag:
+            tags.append(tag)
+    return {'name': title.group(1) if title else None, 'tags': tags, 'rating': rating}
+
+
+def problem_page_url(contest: Dict[str, Any], index: str) -> str:
+    base_url = contest['url'].split('/standings')[0]
+    return f"{base_url}/problem/{index}"
+
+
+async def fetch_problems(fetcher: AsyncFetcher, contest: Dict[str, Any], indices: Iterable[str]) -> int:
+    """
+    Fetch the problem pages of the given problems that are not cached yet.
+    
+    Pages are fetched concurrently through the shared fetcher. Problems whose
+    page could not be fetched stay uncached and are tried again next run.
+    
+    Returns:
+        Number of problems fetched
+    """
+    cache = get_problem_cache()
+    missing = cache.missing(contest['id'], indices)
+    if not missing:
+        return 0
+    
+    responses = await asyncio.gather(*(fetcher.get(problem_page_url(contest, index)) for index in missing))
+    problems = {index: parse_problem_page(response.text) for index, response in zip(missing, responses) if response}
+    if len(problems) < len(missing):
+        logger.warning(f"✗ Failed to fetch {len(missing) - len(problems)} problem pages of contest {contest['id']}")
+    if problems:
+        cache.put(contest['id'], problems)
+    return len(problems)
+
+
+def fetch_problems_api(api: CodeforcesAPI, contest_id: str, indices: Iterable[str]) -> int:
+    """
+    API version of fetch_problems: one contest.standings call (count=1) lists
+    every problem of the contest with its tags and rating.
+    
+    Returns:
+        Number of problems fetched
+    """
+    from cf_api import CodeforcesAPIError
+    
+    cache = get_problem_cache()
+    if not cache.missing(contest_id, indices):
+        return 0
+    
+    try:
+        result = api.call('contest.standings', contestId=contest_id, **{'from': 1, 'count': 1})
+    except CodeforcesAPIError as e:
+        logger.warning(f"✗ Failed to fetch problems of contest {contest_id}: {e}")
+        return 0
+    
+    problems = {
+        problem['index']: {'name': problem.get('name'), 'tags': problem.get('tags', []), 'rating': problem.get('rating')}
+        for problem in result.get('problems', [])
+    }
+    if problems:
+        cache.put(contest_id, problems)
+    return len(problems)
+
+
+def join_tags(contest_data: Dict[str, Any], cache: ProblemCache = None) -> int:
+    """
+    Fill the 'tags' of every solve event from the cache (no requests).
+    
+    Returns:
+        Number of events that got tags
+    """
+    cache = cache or get_problem_cache()
+    contest_id = contest_data['contestId']
+    tagged = 0
+    for participant in contest_data.get('participants', {}).values():
+        for event in participant.get('solveTimeline', []):
+            meta = cache.get(contest_id, event['problem'])
+            if meta is not None and meta['tags']:
+                event['tags'] = list(meta['tags'])
+                tagged += 1
+    return tagged
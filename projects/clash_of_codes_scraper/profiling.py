@@ -0,0 +1,216 @@
+"""
+Opt-in per-phase profiling for the Clash of Codes scraper.
+
+With --profile, the discovery, login, fetch, parse and write phases each
+get a cProfile profile and tracemalloc allocation statistics. Sequential
+phases are measured as one block; pipeline phases are measured call by
+call in whichever thread or parser process runs them, and the calls are
+merged per phase. At the end every phase is written to <phase>.pstats
+and all of them to summary.txt (top functions and allocation sites)
+under PROFILE_DIR/<timestamp>/.
+
+When profiling is off nothing here runs: phase() returns a null context
+and the pipeline calls its functions directly.
+"""
+
+import io
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import config
+
+# Frames kept per allocation; one is enough to name the allocating line
+TRACE_FRAMES = 1
+# Allocation sites kept per measured call before merging
+ALLOCATION_SITES_PER_CALL = 50
+
+_IGNORED_TRACES = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+)
+
+
+class _RawStats:
+    """Lets pstats.Stats load a stats dict from another thread or process."""
+    
+    def __init__(self, stats: Dict):
+        self.stats = stats
+    
+    def create_stats(self):
+        pass
+
+
+@contextmanager
+def _measure(sample: Dict[str, Any]):
+    """
+    Profile the with-block in the current thread and fill sample with its
+    'stats', 'allocations' [(site, bytes, blocks)], 'peak' and 'seconds'.
+    
+    Tracing stays on once started, since other threads may be measuring
+    too; their allocations and peaks can overlap with this block's.
+    """
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(TRACE_FRAMES)
+    before = tracemalloc.take_snapshot().filter_traces(_IGNORED_TRACES)
+    tracemalloc.reset_peak()
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        # Python 3.12+ allows one active cProfile per process; time only
+        profile = None
+    start = time.perf_counter()
+    try:
+        yield sample
+    finally:
+        sample['seconds'] = time.perf_counter() - start
+        if profile is not None:
+            profile.disable()
+            profile.create_stats()
+        sample['stats'] = profile.stats if profile is not None else {}
+        sample['peak'] = tracemalloc.get_traced_memory()[1]
+        after = tracemalloc.take_snapshot().filter_traces(_IGNORED_TRACES)
+        sample['allocations'] = [
+            (str(stat.traceback[0]), stat.size_diff, stat.count_diff)
+            for stat in after.compare_to(before, 'lineno')[:ALLOCATION_SITES_PER_CALL]
+            if stat.size_diff > 0
+        ]
+
+
+def run_profiled(func: Callable, *args) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Call func(*args) under _measure. Module-level so parser processes can
+    run it; the sample is plain data and pickles back to the parent.
+    
+    Returns:
+        Tuple of (func's result, sample)
+    """
+    sample: Dict[str, Any] = {}
+    with _measure(sample):
+        result = func(*args)
+    return result, sample
+
+
+class _Phase:
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.peak = 0
+        self.stats: Optional[pstats.Stats] = None
+        self.allocations: Dict[str, List[int]] = {}
+
+
+class Profiler:
+    """Collects per-phase profiles and writes them out."""
+    
+    def __init__(self, output_dir: str = None, top_n: int = None):
+        self.output_dir = Path(output_dir or config.PROFILE_DIR) / time.strftime('%Y%m%d-%H%M%S')
+        self.top_n = top_n or config.PROFILE_TOP_N
+        self.phases: Dict[str, _Phase] = {}
+        self._lock = threading.Lock()
+    
+    def add(self, name: str, sample: Dict[str, Any]):
+        """Merge one measured call into a phase."""
+        with self._lock:
+            phase = self.phases.setdefault(name, _Phase())
+            phase.calls += 1
+            phase.seconds += sample['seconds']
+            phase.peak = max(phase.peak, sample['peak'])
+            if not sample['stats']:
+                pass  # timed only (see _measure)
+            elif phase.stats is None:
+                phase.stats = pstats.Stats(_RawStats(sample['stats']))
+            else:
+                phase.stats.add(_RawStats(sample['stats']))
+            for site, size, blocks in sample['allocations']:
+                totals = phase.allocations.setdefault(site, [0, 0])
+                totals[0] += size
+                totals[1] += blocks
+    
+    @contextmanager
+    def phase(self, name: str):
+        """Profile a block as (part of) a phase."""
+        sample: Dict[str, Any] = {}
+        try:
+            with _measure(sample):
+                yield
+        finally:
+            self.add(name, sample)
+    
+    def call(self, name: str, func: Callable, *args) -> Any:
+        """Call func(*args) in this thread as part of a phase."""
+        result, sample = run_profiled(func, *args)
+        self.add(name, sample)
+        return result
+    
+    def summary(self) -> str:
+        """Top functions and allocation sites of every phase."""
+        out = io.StringIO()
+        for name, phase in self.phases.items():
+            out.write(f"{'=' * 78}\n{name}: {phase.calls} call(s), {phase.seconds:.3f}s, "
+                      f"peak traced memory {phase.peak / 1e6:.1f} MB\n{'=' * 78}\n")
+            for sort_key, label in (('tottime', 'own time'), ('cumulative', 'cumulative time')):
+                if phase.stats is None:
+                    break
+                out.write(f"\nTop {self.top_n} functions by {label}:\n")
+                phase.stats.stream = out
+                phase.stats.sort_stats(sort_key).print_stats(self.top_n)
+            
+            out.write(f"Top {self.top_n} allocation sites (bytes still allocated when each call ended):\n")
+            top_sites = Counter({site: totals[0] for site, totals in phase.allocations.items()}).most_common(self.top_n)
+            for site, size in top_sites:
+                out.write(f"  {size / 1e3:>12,.1f} kB  {phase.allocations[site][1]:>8} blocks  {site}\n")
+            out.write('\n')
+        return out.getvalue()
+    
+    def write(self) -> Path:
+        """Write <phase>.pstats for every phase and summary.txt; returns the directory."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        for name, phase in self.phases.items():
+            if phase.stats is not None:
+                phase.stats.dump_stats(str(self.output_dir / f"{name}.pstats"))
+        (self.output_dir / 'summary.txt').write_text(self.summary(), encoding='utf-8')
+        return self.output_dir
+
+
+_active: Optional[Profiler] = None
+
+
+def start(output_dir: str = None, top_n: int = None) -> Profiler:
+    """Turn profiling on for the rest of the process."""
+    global _active
+    _active = Profiler(output_dir, top_n)
+    return _active
+
+
+def active() -> Optional[Profiler]:
+    """The running Profiler, or None when profiling is off."""
+    return _active
+
+
+def phase(name: str):
+    """Profile a block as a phase when profiling is on; a null context otherwise."""
+    return _active.phase(name) if _active is not None else nullcontext()
+
+
+class ProfiledSession:
+    """Session wrapper whose get() calls are profiled as the 'fetch' phase."""
+    
+    def __init__(self, session, profiler: Profiler, name: str = 'fetch'):
+        self._session = session
+        self._profiler = profiler
+        self._name = name
+    
+    def get(self, url: str, *args):
+        return self._profiler.call(self._name, self._session.get, url, *args)
+    
+    def __getattr__(self, attribute: str):
+        return getattr(self._session, attribute)
@@ -0,0 +1,107 @@
+"""
+Adaptive request pacing for the Clash of Codes scraper.
+A shared token bucket that slows down when Codeforces throttles us
+(429/503) and speeds back up once responses are healthy again.
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import config
+
+
+class RateLimiter:
+    """Thread-safe token bucket with multiplicative decrease / additive increase."""
+    
+    def __init__(self, rate: float = None, burst: int = None,
+                 min_rate: float = None, max_rate: float = None):
+        self.max_rate = max_rate or config.RATE_LIMIT_MAX_RPS
+        self.min_rate = min_rate or config.RATE_LIMIT_MIN_RPS
+        self.rate = min(rate or config.RATE_LIMIT_RPS, self.max_rate)
+        self.burst = max(1, burst or config.RATE_LIMIT_BURST)
+        self.tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._healthy_streak = 0
+        self._lock = threading.Lock()
+    
+    def _refill(self, now: float):
+        """Add tokens for the time elapsed since the last refill."""
+        elapsed = now - self._updated
+        self._updated = now
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+    
+    def acquire(self):
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+    
+    def on_success(self):
+        """Record a healthy response; raise the rate after a run of them."""
+        with self._lock:
+            self._healthy_streak += 1
+            if self._healthy_streak >= config.RATE_LIMIT_RECOVERY_STREAK:
+                self._healthy_streak = 0
+                self.rate = min(self.max_rate, self.rate + config.RATE_LIMIT_INCREASE_RPS)
+    
+    def on_throttle(self, retry_after: float = None):
+        """
+        Record a 429/503 response.
+        
+        Halves the request rate, drains the bucket and, if the server sent
+        Retry-After, pauses every caller until that moment.
+        """
+        with self._lock:
+            self._healthy_streak = 0
+            self.rate = max(self.min_rate, self.rate * config.RATE_LIMIT_DECREASE_FACTOR)
+            self.tokens = 0.0
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+
+def backoff_delay(attempt: int, base: float = None, cap: float = None) -> float:
+    """
+    Exponential backoff with jitter for the given (0-based) retry attempt.
+    
+    Returns a delay between half and the full value of min(cap, base * 2^attempt).
+    """
+    base = config.RETRY_DELAY if base is None else base
+    cap = config.BACKOFF_MAX if cap is None else cap
+    delay = min(cap, base * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP-date) into seconds.
+    
+    Returns None when the header is missing or malformed.
+    """
+    if not value:
+        return None
+    
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
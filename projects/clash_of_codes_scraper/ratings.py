@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Club rating for the Clash of Codes scraper.
+
+A Codeforces-style rating over every saved contest, in contest order. For
+each contest the rank table is loaded into NumPy arrays and every
+participant's seed (expected rank), the rating that would have made the
+actual rank expected, and the resulting delta are computed for all
+participants at once; see rating_deltas().
+
+The state (current rating and per-contest history of every handle, and
+the contests applied so far) is kept in RATINGS_PATH. update() applies
+only contests that are not in it yet; if an older contest was added or
+rewritten, the state is rewound to just before it and replayed from there,
+so the full history is recomputed only when it has to be.
+
+Usage:
+    python ratings.py                 # bring the ratings up to date
+    python ratings.py --full          # recompute from the first contest
+    python ratings.py --top 20        # print the leaderboard
+    python ratings.py --handle tourist
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+import config
+import utils
+from contest_io import atomic_write
+from manifest import get_manifest
+from utils import logger
+
+RATINGS_VERSION = 1
+
+# Bisection steps for the needed rating; 2^-20 of the search range is far below a rating point
+BISECTION_STEPS = 20
+SEARCH_RANGE = (-2000.0, 6000.0)
+
+# Rows of the participant x participant probability matrix built at once
+SEED_CHUNK = 1024
+
+
+def _seeds(points: np.ndarray, ratings: np.ndarray) -> np.ndarray:
+    """
+    1 + sum over j of P(participant j beats a player rated point), for each point.
+    
+    P(j beats p) = 1 / (1 + 10^((p - r_j) / 400)) is evaluated as
+    1 / (1 + 10^(p/400) * 10^(-r_j/400)), so the n x n block needs no powers.
+    """
+    point_scale = np.power(10.0, points / 400.0)
+    rating_scale = np.power(10.0, -ratings / 400.0)
+    seeds = np.empty(len(points))
+    for start in range(0, len(points), SEED_CHUNK):
+        block = np.multiply.outer(point_scale[start:start + SEED_CHUNK], rating_scale)
+        seeds[start:start + SEED_CHUNK] = 1.0 + (1.0 / (1.0 + block)).sum(axis=1)
+    return seeds
+
+
+def _win_probability(ratings: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """P(a player rated ratings[i] beats one rated points[i]), elementwise."""
+    return 1.0 / (1.0 + np.power(10.0, (points - ratings) / 400.0))
+
+
+def rating_deltas(ratings: np.ndarray, ranks: np.ndarray) -> np.ndarray:
+    """
+    Codeforces-style rating changes of one contest.
+    
+    For each participant: the seed is 1 + the expected number of others who
+    beat them; the target rank is the geometric mean of seed and actual
+    rank; the needed rating is the one whose seed (against everyone else)
+    equals the target rank, found by bisection for all participants at
+    once; the delta is half the way to it. Deltas are then shifted so they
+    sum to about zero, and so the top 4*sqrt(n) rated do not gain from
+    the shift.
+    
+    Args:
+        ratings: Rating of each participant before the contest
+        ranks: Rank of each participant in the contest (ties share a rank)
+    
+    Returns:
+        Integer rating change of each participant
+    """
+    ratings = np.asarray(ratings, dtype=np.float64)
+    ranks = np.asarray(ranks, dtype=np.float64)
+    n = len(ratings)
+    if n < 2:
+        return np.zeros(n, dtype=np.int64)
+    
+    # Each participant's own term of the sum is P(i beats i) = 0.5
+    seeds = _seeds(ratings, ratings) - 0.5
+    target_ranks = np.sqrt(seeds * ranks)
+    
+    low = np.full(n, SEARCH_RANGE[0])
+    high = np.full(n, SEARCH_RANGE[1])
+    for _ in range(BISECTION_STEPS):
+        middle = (low + high) / 2
+        # The seed falls as the rating rises; below the target rank means too high
+        too_high = _seeds(middle, ratings) - _win_probability(ratings, middle) < target_ranks
+        high = np.where(too_high, middle, high)
+        low = np.where(too_high, low, middle)
+    deltas = ((low + high) / 2 - ratings) / 2
+    
+    deltas += -deltas.sum() / n - 1
+    top_count = min(n, 4 * int(round(np.sqrt(n))))
+    top = np.argsort(-ratings, kind='stable')[:top_count]
+    deltas += min(max(-deltas[top].sum() / top_count, -10.0), 0.0)
+    return np.round(deltas).astype(np.int64)
+
+
+def rank_table(contest_data: Dict[str, Any]) -> Tuple[List[str], np.ndarray]:
+    """Handles and ranks of a contest's ranked participants (rank > 0)."""
+    handles = []
+    ranks = []
+    for handle, participant in contest_data.get('participants', {}).items():
+        if participant.get('rank', 0) > 0:
+            handles.append(handle)
+            ranks.append(participant['rank'])
+    return handles, np.array(ranks, dtype=np.int64)
+
+
+def contest_order(contest_id: str):
+    """Sort key placing contests in chronological (contest ID) order."""
+    contest_id = str(contest_id)
+    return (0, int(contest_id)) if contest_id.isdigit() else (1, contest_id)
+
+
+class RatingEngine:
+    """Ratings of every handle plus the history needed to rewind them."""
+    
+    def __init__(self, initial_rating: float = None):
+        self.initial_rating = config.RATING_INITIAL if initial_rating is None else initial_rating
+        self.index: Dict[str, int] = {}
+        self.handles: List[str] = []
+        self.rating = np.empty(0, dtype=np.int64)
+        self.max_rating = np.empty(0, dtype=np.int64)
+        self.contests = np.empty(0, dtype=np.int64)
+        # handle -> [[contestId, rank, old rating, new rating], ...] in contest order
+        self.history: Dict[str, List[List[Any]]] = {}
+        # [contestId, savedAt] of every applied contest, in contest order
+        self.applied: List[List[Any]] = []
+    
+    def _indices(self, handles: List[str]) -> np.ndarray:
+        """Array positions of handles, adding unseen ones at the initial rating."""
+        new = [handle for handle in dict.fromkeys(handles) if handle not in self.index]
+        if new:
+            for handle in new:
+                self.index[handle] = len(self.handles)
+                self.handles.append(handle)
+            self.rating = np.concatenate([self.rating, np.full(len(new), self.initial_rating, dtype=np.int64)])
+            self.max_rating = np.concatenate([self.max_rating, np.full(len(new), self.initial_rating, dtype=np.int64)])
+            self.contests = np.concatenate([self.contests, np.zeros(len(new), dtype=np.int64)])
+        return np.fromiter((self.index[handle] for handle in handles), dtype=np.int64, count=len(handles))
+    
+    def apply(self, contest_id: str, handles: List[str], ranks: np.ndarray, saved_at: float = None) -> np.ndarray:
+        """
+        Rate one contest, which must come after every contest applied so far.
+        
+        Returns:
+            Rating change of each handle
+        """
+        positions = self._indices(handles)
+        old = self.rating[positions]
+        deltas = rating_deltas(old, ranks)
+        new = old + deltas
+        self.rating[positions] = new
+        self.max_rating[positions] = np.maximum(self.max_rating[positions], new)
+        self.contests[positions] += 1
+        for handle, rank, before, after in zip(handles, ranks.tolist(), old.tolist(), new.tolist()):
+            self.history.setdefault(handle, []).append([str(contest_id), rank, before, after])
+        self.applied.append([str(contest_id), saved_at])
+        return deltas
+    
+    def rewind(self, position: int):
+        """Forget the applied contests from position on, restoring earlier ratings."""
+        dropped = {contest_id for contest_id, _ in self.applied[position:]}
+        self.applied = self.applied[:position]
+        if not dropped:
+            return
+        history = {}
+        for handle, entries in self.history.items():
+            kept = [entry for entry in entries if entry[0] not in dropped]
+            if kept:
+                history[handle] = kept
+        self._load_history(history)
+    
+    def _load_history(self, history: Dict[str, List[List[Any]]]):
+        self.history = history
+        self.handles = list(history)
+        self.index = {handle: position for position, handle in enumerate(self.handles)}
+        self.rating = np.array([entries[-1][3] for entries in history.values()], dtype=np.int64)
+        self.max_rating = np.array([max(max(entry[3] for entry in entries), self.initial_rating)
+                                    for entries in history.values()], dtype=np.int64)
+        self.contests = np.array([len(entries) for entries in history.values()], dtype=np.int64)
+    
+    def leaderboard(self) -> List[Dict[str, Any]]:
+        """Every rated handle, best first."""
+        order = np.lexsort((self.handles, -self.rating)) if self.handles else []
+        return [
+            {'handle': self.handles[position], 'rating': int(self.rating[position]),
+             'maxRating': int(self.max_rating[position]), 'contests': int(self.contests[position])}
+            for position in order
+        ]
+    
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            'version': RATINGS_VERSION,
+            'initialRating': self.initial_rating,
+            'applied': self.applied,
+            'handles': {
+                entry['handle']: dict(entry, history=self.history[entry['handle']])
+                for entry in self.leaderboard()
+            },
+        }
+    
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> 'RatingEngine':
+        engine = cls(data['initialRating'])
+        engine.applied = data['applied']
+        engine._load_history({handle: entry['history'] for handle, entry in data['handles'].items()})
+        return engine
+
+
+def load(path: str = None) -> Optional[RatingEngine]:
+    """The stored ratings, or None if there are none (or they are from another version)."""
+    try:
+        with open(path or config.RATINGS_PATH, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get('version') != RATINGS_VERSION or data.get('initialRating') != config.RATING_INITIAL:
+        return None
+    return RatingEngine.from_json(data)
+
+
+def save(engine: RatingEngine, path: str = None):
+    atomic_write(Path(path or config.RATINGS_PATH),
+                 json.dumps(engine.to_json(), ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def update(output_dir: str = None, path: str = None, full: bool = False) -> Dict[str, int]:
+    """
+    Bring the stored ratings up to date with the saved contests.
+    
+    Contests are compared with the applied list through the manifest
+    (contest ID and savedAt), without opening any contest file. Only the
+    contests from the first difference on are loaded and rated.
+    
+    Returns:
+        {'applied': contests rated now, 'kept': contests whose ratings were reused}
+    """
+    output_dir = output_dir or config.OUTPUT_DIR
+    manifest = get_manifest(output_dir)
+    saved = sorted(utils.load_existing_contests(output_dir), key=contest_order)
+    wanted = [[contest_id, (manifest.get(contest_id) or {}).get('savedAt')] for contest_id in saved]
+    
+    engine = None if full else load(path)
+    if engine is None:
+        engine = RatingEngine()
+    previous = len(engine.applied)
+    start = 0
+    while start < min(len(wanted), len(engine.applied)) and engine.applied[start] == wanted[start]:
+        start += 1
+    engine.rewind(start)
+    
+    for contest_id, saved_at in wanted[start:]:
+        contest_data = utils.load_contest(contest_id, output_dir)
+        if contest_data is None:
+            continue
+        handles, ranks = rank_table(contest_data)
+        engine.apply(contest_id, handles, ranks, saved_at)
+    
+    if start < len(wanted) or start < previous:
+        save(engine, path)
+    applied = len(wanted) - start
+    if applied:
+        logger.info(f"✓ Ratings: rated {applied} contests"
+                    + (f", kept {start} already rated" if start else "")
+                    + f" ({len(engine.handles)} handles)")
+    return {'applied': applied, 'kept': start}
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Club rating over the saved contests")
+    parser.add_argument('--full', action='store_true', help="Recompute from the first contest")
+    parser.add_argument('--top', type=int, metavar='N', help="Print the N best rated handles")
+    parser.add_argument('--handle', help="Print one handle's rating history")
+    args = parser.parse_args(argv)
+    utils.setup_logging()
+    
+    update(full=args.full)
+    engine = load()
+    if engine is None:
+        print("No contests to rate")
+        return 0
+    
+    if args.handle:
+        if args.handle not in engine.index:
+            print(f"{args.handle} is not rated")
+            return 1
+        for contest_id, rank, before, after in engine.history[args.handle]:
+            print(f"{contest_id:>10}  rank {rank:>4}  {before:>5} → {after:>5}  ({after - before:+d})")
+    else:
+        for place, entry in enumerate(engine.leaderboard()[:args.top or 20], 1):
+            print(f"{place:>4}. {entry['handle']:<24} {entry['rating']:>5}  "
+                  f"(max {entry['maxRating']}, {entry['contests']} contests)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Per-handle Rewind index for the Clash of Codes scraper.
+Aggregates every saved contest into one small file per handle with
+precomputed totals, so a Rewind page is a single read.
+
+Usage:
+    python rewind_index.py            # rebuild the index from saved contests
+    python rewind_index.py <handle>   # print one handle's entry
+"""
+
+import re
+import sys
+import json
+import hashlib
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import config
+import utils
+import user_info
+from contest_io import atomic_write
+from utils import logger
+
+
+def _contest_order(contest: Dict[str, Any]):
+    """Sort key placing contests in chronological (contest ID) order."""
+    contest_id = str(contest.get('contestId', ''))
+    return (0, int(contest_id)) if contest_id.isdigit() else (1, contest_id)
+
+
+def build_handle_index(contests: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Aggregate contests into a handle -> Rewind entry map.
+    
+    Args:
+        contests: Contest dicts in the normalized JSON shape
+    
+    Returns:
+        Dict keyed by handle with 'handle', 'profile' (rating, rankTitle and
+        avatar, or None), 'totals' and 'contests' (oldest first)
+    """
+    contests = sorted(contests, key=_contest_order)
+    index: Dict[str, Dict[str, Any]] = {}
+    last_seen: Dict[str, int] = {}
+    
+    for position, contest in enumerate(contests):
+        for handle, data in contest.get('participants', {}).items():
+            entry = index.get(handle)
+            if entry is None:
+                entry = index[handle] = {
+                    'handle': handle,
+                    'profile': None,
+                    'totals': {
+                        'contestsPlayed': 0,
+                        'totalSolved': 0,
+                        'bestRank': None,
+                        'averageSolveTime': None,
+                        'longestStreak': 0,
+                        'currentStreak': 0,
+                        'mostSolvedTag': None,
+                    },
+                    'contests': [],
+                    '_solveTimes': [],
+                    '_tags': Counter(),
+                    '_streak': 0,
+                }
+            
+            # Contests are oldest first, so the newest joined profile wins
+            profile = {field: data[field] for field in user_info.USER_FIELDS if field in data}
+            if profile:
+                entry['profile'] = profile
+            
+            totals = entry['totals']
+            totals['contestsPlayed'] += 1
+            totals['totalSolved'] += data.get('solved', 0)
+            rank = data.get('rank', 0)
+            if rank > 0 and (totals['bestRank'] is None or rank < totals['bestRank']):
+                totals['bestRank'] = rank
+            solves = [event for event in data.get('solveTimeline', []) if event.get('status') == 'AC']
+            entry['_solveTimes'].extend(event['time'] for event in solves)
+            entry['_tags'].update(tag for event in solves for tag in event.get('tags', []))
+            
+            # A streak is a run of consecutive group contests the handle took part in
+            entry['_streak'] = entry['_streak'] + 1 if last_seen.get(handle) == position - 1 else 1
+            last_seen[handle] = position
+            totals['longestStreak'] = max(totals['longestStreak'], entry['_streak'])
+            
+            contest_entry = {
+                'contestId': contest.get('contestId'),
+                'title': contest.get('title'),
+                'rank': rank,
+                'solved': data.get('solved', 0),
+                'attempted': data.get('attempted', 0),
+            }
+            if 'type' in contest:
+                contest_entry['type'] = contest['type']
+            entry['contests'].append(contest_entry)
+    
+    last_position = len(contests) - 1
+    for handle, entry in index.items():
+        solve_times = entry.pop('_solveTimes')
+        streak = entry.pop('_streak')
+        tags = entry.pop('_tags')
+        totals = entry['totals']
+        if tags:
+            totals['mostSolvedTag'] = tags.most_common(1)[0][0]
+        if solve_times:
+            totals['averageSolveTime'] = round(sum(solve_times) / len(solve_times), 1)
+        totals['currentStreak'] = streak if last_seen[handle] == last_position else 0
+    
+    return index
+
+
+def shard_for(handle: str) -> str:
+    """Two-character shard directory for a handle."""
+    return hashlib.sha1(handle.lower().encode('utf-8')).hexdigest()[:2]
+
+
+# Names that are safe as file names as they are: Codeforces handles
+# (letters, digits, '_', '-', '.'), not starting with a dot
+_PLAIN_NAME = re.compile(r'[A-Za-z0-9_-][A-Za-z0-9_.-]{0,63}')
+
+
+def file_name(handle: str) -> str:
+    """
+    File name of a handle's Rewind file.
+    
+    Handles are used as they are. Anything else, such as a team name with
+    '/' or spaces, gets '~' and its SHA-1 instead, so no name can leave its
+    shard directory; '~' never appears in a handle, so the two kinds cannot
+    collide.
+    """
+    if _PLAIN_NAME.fullmatch(handle):
+        return f"{handle}.json"
+    return f"~{hashlib.sha1(handle.encode('utf-8')).hexdigest()}.json"
+
+
+def handle_path(handle: str, index_dir: str = None) -> Path:
+    """Path of a handle's Rewind file."""
+    index_dir = Path(index_dir or config.REWIND_DIR)
+    return index_dir / 'handles' / shard_for(handle) / file_name(handle)
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def write_handle_index(index: Dict[str, Dict[str, Any]], index_dir: str = None) -> int:
+    """
+    Write one file per handle plus a small directory file listing all handles,
+    then delete the files of handles that are no longer in the index.
+    
+    Returns:
+        Number of handle files written
+    """
+    index_dir = Path(index_dir or config.REWIND_DIR)
+    
+    written = set()
+    for handle, entry in index.items():
+        path = handle_path(handle, index_dir)
+        atomic_write(path, _dumps(entry))
+        written.add(path)
+    
+    directory = {
+        'handles': {
+            handle: {
+                'path': str(handle_path(handle, index_dir).relative_to(index_dir)),
+                'contestsPlayed': entry['totals']['contestsPlayed'],
+            }
+            for handle, entry in sorted(index.items())
+        }
+    }
+    atomic_write(index_dir / 'index.json', _dumps(directory))
+    
+    # Only after index.json stops listing them, so readers never follow a dangling path
+    removed = 0
+    for path in (index_dir / 'handles').glob('*/*.json'):
+        if path not in written:
+            path.unlink(missing_ok=True)
+            removed += 1
+    if removed:
+        logger.info(f"Removed {removed} Rewind files of handles no longer indexed")
+    
+    return len(index)
+
+
+def load_handle(handle: str, index_dir: str = None) -> Optional[Dict[str, Any]]:
+    """Read one handle's Rewind entry, or None if the handle is not indexed."""
+    try:
+        with open(handle_path(handle, index_dir), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def rebuild(output_dir: str = None, index_dir: str = None) -> int:
+    """
+    Rebuild the Rewind index from every saved contest.
+    
+    Returns:
+        Number of handles indexed
+    """
+    contests = utils.load_all_contests(output_dir)
+    count = write_handle_index(build_handle_index(contests), index_dir)
+    logger.info(f"✓ Indexed {count} handles across {len(contests)} contests")
+    return count
+
+
+def main():
+    utils.setup_logging()
+    if len(sys.argv) > 1:
+        entry = load_handle(sys.argv[1])
+        if entry is None:
+            print(f"Handle {sys.argv[1]} is not in the Rewind index")
+            return 1
+        print(json.dumps(entry, indent=2, ensure_ascii=False))
+        return 0
+    
+    rebuild()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,53 +6,71 @@ This script scrapes contest data from a private Codeforces group
 and generates JSON snapshots for participant performance analysis.
 
 Usage:
-    python scraper.py
+    python scraper.py [--source {html,api}] [--parser {lxml,bs4}] [--no-cache]
+                      [--refresh IDS | --refresh-recent N | --resume] [--enrich-submissions]
+                      [--profile]
 
 Environment variables should be set in .env file.
 See .env.example for required configuration.
 """
 
+import os
 import sys
-import time
+import json
+import asyncio
+import argparse
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional, Set, Tuple
 from tqdm import tqdm
 
 import config
 import utils
+import discovery
+import journal as run_journal
+import metrics
+import problem_meta
+import profiling
+import submissions
+import user_info
+import rewind_index
+from cf_api import CodeforcesAPI
+from fetcher import AsyncFetcher
+from manifest import get_manifest, hash_source
 from utils import logger
 
 
-def extract_group_id(group_url: str) -> str:
-    """Extract group ID from the group URL."""
-    # Example: https://codeforces.com/group/ABC123/contests -> ABC123
-    parts = group_url.split('/group/')
-    if len(parts) > 1:
-        return parts[1].split('/')[0]
-    return None
-
-
-def scrape_all_contests(session: utils.CodeforcesSession, group_id: str = None) -> List[Dict]:
+def scrape_all_contests(session: utils.CodeforcesSession, group_id: str = None,
+                        wanted_ids: Set[str] = None) -> List[Dict]:
     """
     Scrape all available contests from the group.
     
     Args:
         session: Authenticated session
         group_id: Group ID for URL construction
+        wanted_ids: IDs the caller needs from the list (e.g. refresh
+            targets); together with CONTEST_IDS they let discovery stop
+            paging once all of them are found
     
     Returns:
-        List of contest information dicts
+        List of contest information dicts, newest first
     """
     logger.info(f"Fetching contest list from: {config.GROUP_URL}")
     
-    response = session.get(config.GROUP_URL)
+    if config.CONTEST_IDS:
+        wanted_ids = set(config.CONTEST_IDS) | set(wanted_ids or ())
+    
+    contests = discovery.discover_contests(
+        session, config.GROUP_URL, group_id, wanted_ids,
+        use_cache=config.HTTP_CACHE_ENABLED
+    )
     
-    if not response:
+    if contests is None:
         logger.error("Failed to fetch contest list")
         return []
     
-    contests = utils.extract_contest_list(response.text, group_id)
-    
     # Filter contests if CONTEST_IDS is specified
     if config.CONTEST_IDS:
         contests = [c for c in contests if c['id'] in config.CONTEST_IDS]
@@ -61,48 +79,428 @@ def scrape_all_contests(session: utils.CodeforcesSession, group_id: str = None)
     return contests
 
 
-def scrape_contest(session: utils.CodeforcesSession, contest: Dict) -> bool:
+async def fetch_contest_pages(fetcher: AsyncFetcher, contest: Dict) -> Optional[List[str]]:
     """
-    Scrape a single contest and save its data.
+    Fetch every standings page of a contest.
     
     Args:
-        session: Authenticated session
+        fetcher: Async fetch engine wrapping the authenticated session
         contest: Contest info dict with 'id', 'title', 'url'
     
     Returns:
-        True if successful, False otherwise
+        HTML of each standings page in page order, or None on failure
     """
     contest_id = contest['id']
     contest_url = contest['url']
     
     logger.info(f"Scraping contest {contest_id}: {contest['title']}")
     
-    # Fetch standings page
-    response = session.get(contest_url)
+    # Fetch the first standings page
+    response = await fetcher.get(contest_url)
     
     if not response:
         logger.error(f"✗ Failed to fetch standings for contest {contest_id}")
+        return None
+    
+    # Fetch any further standings pages in parallel
+    page_urls = utils.extract_standings_page_urls(response.text, contest_url)
+    responses = [response]
+    if page_urls:
+        logger.info(f"Contest {contest_id} has {len(page_urls) + 1} standings pages")
+        responses += await asyncio.gather(*(fetcher.get(url) for url in page_urls))
+    
+    if not all(responses):
+        logger.error(f"✗ Failed to fetch every standings page for contest {contest_id}")
+        return None
+    
+    return [page.text for page in responses]
+
+
+async def scrape_contests(session: utils.CodeforcesSession, contests: List[Dict],
+                          max_concurrency: int = None, refresh: bool = False,
+                          journal: run_journal.Journal = None,
+                          pool: ProcessPoolExecutor = None) -> Tuple[int, int]:
+    """
+    Scrape many contests through a bounded fetch -> parse -> write pipeline.
+    
+    Fetch workers download standings pages and push the raw HTML onto a
+    bounded queue. Parse workers hand it to a process pool (config.PARSE_WORKERS
+    processes, or a thread when 0) and push the parsed contest onto a second
+    bounded queue, which a single writer drains. Full queues block the stage
+    before them, so at most a few contests' HTML is held in memory at once.
+    With config.DATA_SOURCE == 'api' the fetch workers get already structured
+    standings from the Codeforces API and skip the parse stage.
+    
+    With config.SUBMISSIONS_ENABLED the fetch workers also bring each
+    contest's submission log up to date (see submissions.py), and the
+    timelines are rebuilt from it before writing. With
+    config.PROBLEM_TAGS_ENABLED the metadata of problems not seen before is
+    fetched into the problem cache, from which the writer joins the tags.
+    With config.USER_INFO_ENABLED the handles of every contest waiting to be
+    written are looked up with user.info in shared batches just before the
+    first of them is written (see user_info.py).
+    
+    Every stage records its per-contest time in the metrics registry, which
+    is exported every config.METRICS_INTERVAL seconds while the run lasts.
+    With --profile, every fetch, parse and write call is also profiled (see
+    profiling.py) where it runs: in a fetch thread, a parser process or the
+    writer thread.
+    
+    When refreshing, a contest whose source hashes the same as recorded in
+    the manifest, and which the same parser version produced, is not parsed
+    or written again; only its fetch time is updated.
+    
+    With a journal, every contest's progress (fetched, parsed, written or
+    failed with a reason) is appended to it as it happens, so an interrupted
+    run can be resumed (see journal.py).
+    
+    Args:
+        session: Authenticated session
+        contests: Contest info dicts to scrape
+        max_concurrency: Contests fetched at once (defaults to config.MAX_CONCURRENCY)
+        refresh: Diff against stored snapshots instead of overwriting blindly
+        journal: Run journal to record contest states in
+        pool: Parser process pool to use instead of starting one for this
+            call (see create_parse_pool); the caller shuts it down
+    
+    Returns:
+        Tuple of (successful, failed) counts
+    """
+    max_concurrency = max_concurrency or config.MAX_CONCURRENCY
+    api = CodeforcesAPI() if config.DATA_SOURCE == 'api' else None
+    parse_workers = config.PARSE_WORKERS if api is None else 0
+    engine = config.PARSER_ENGINE
+    parser = utils.parser_version('api' if api is not None else engine)
+    manifest = get_manifest(config.OUTPUT_DIR)
+    users = user_info.UserInfoResolver(api or CodeforcesAPI()) if config.USER_INFO_ENABLED else None
+    profiler = profiling.active()
+    loop = asyncio.get_running_loop()
+    
+    contest_queue: asyncio.Queue = asyncio.Queue()
+    parse_queue: asyncio.Queue = asyncio.Queue(maxsize=config.PIPELINE_QUEUE_SIZE)
+    write_queue: asyncio.Queue = asyncio.Queue(maxsize=config.PIPELINE_QUEUE_SIZE)
+    for contest in contests:
+        contest_queue.put_nowait(contest)
+    
+    counts = {'successful': 0, 'failed': 0}
+    progress = tqdm(total=len(contests), desc="Scraping contests", unit="contest")
+    
+    def mark(contest_id: str, state: str, reason: str = None):
+        if journal is not None:
+            journal.record(contest_id, state, reason)
+    
+    def finish(contest_id: str, ok: bool, reason: str = None):
+        counts['successful' if ok else 'failed'] += 1
+        metrics.registry.inc('contests', result='ok' if ok else 'failed')
+        mark(contest_id, 'written' if ok else 'failed', reason)
+        progress.update(1)
+    
+    def in_phase(name: str, func):
+        # func itself when not profiling, so the default run pays nothing
+        return func if profiler is None else functools.partial(profiler.call, name, func)
+    
+    def unchanged(contest_id: str, source_hash: str) -> bool:
+        if refresh and manifest.source_unchanged(contest_id, source_hash, parser):
+            logger.info(f"Contest {contest_id}: source unchanged, skipping")
+            manifest.touch(contest_id)
+            return True
         return False
     
-    # Parse standings
-    contest_data = utils.parse_standings(response.text, contest_id)
+    async def fetch_worker(fetcher: AsyncFetcher):
+        while True:
+            contest = await contest_queue.get()
+            try:
+                if api is not None:
+                    logger.info(f"Fetching contest {contest['id']} from the API: {contest['title']}")
+                    with metrics.timed('contest_seconds', stage='fetch'):
+                        contest_data = await asyncio.to_thread(in_phase('fetch', api.contest_standings), contest['id'])
+                    if contest_data is None:
+                        finish(contest['id'], False, "API standings unavailable")
+                    else:
+                        mark(contest['id'], 'fetched')
+                        if config.SUBMISSIONS_ENABLED:
+                            with metrics.timed('contest_seconds', stage='submissions'):
+                                log = await asyncio.to_thread(submissions.refresh_log_api, api, contest)
+                            if log is not None:
+                                submissions.apply_log(contest_data, log)
+                        if config.PROBLEM_TAGS_ENABLED:
+                            with metrics.timed('contest_seconds', stage='problems'):
+                                await asyncio.to_thread(problem_meta.fetch_problems_api, api, contest['id'],
+                                                        problem_meta.problem_indices(contest_data))
+                        source_hash = hash_source([json.dumps(contest_data, sort_keys=True)])
+                        if unchanged(contest['id'], source_hash):
+                            finish(contest['id'], True)
+                        else:
+                            if users is not None:
+                                users.add(contest_data['participants'])
+                            await write_queue.put((contest_data, source_hash))
+                else:
+                    with metrics.timed('contest_seconds', stage='fetch'):
+                        pages = await fetch_contest_pages(fetcher, contest)
+                    if pages is None:
+                        finish(contest['id'], False, "standings pages could not be fetched")
+                    else:
+                        log = None
+                        if config.SUBMISSIONS_ENABLED:
+                            with metrics.timed('contest_seconds', stage='submissions'):
+                                log = await submissions.refresh_log(fetcher, contest)
+                        mark(contest['id'], 'fetched')
+                        await parse_queue.put((contest, pages, log))
+            except Exception as e:
+                logger.error(f"✗ Error fetching contest {contest['id']}: {e}")
+                finish(contest['id'], False, f"fetch: {e}")
+            finally:
+                contest_queue.task_done()
+    
+    async def parse_worker(fetcher: AsyncFetcher, pool: Optional[ProcessPoolExecutor]):
+        while True:
+            contest, pages, log = await parse_queue.get()
+            try:
+                # New submissions change the output even when the standings did not
+                source_hash = hash_source(pages + ([str(log['lastSubmissionId'])] if log else []))
+                if unchanged(contest['id'], source_hash):
+                    finish(contest['id'], True)
+                else:
+                    with metrics.timed('contest_seconds', stage='parse'):
+                        if profiler is None:
+                            contest_data = await loop.run_in_executor(
+                                pool, utils.parse_contest_pages, pages, contest['id'], engine
+                            )
+                        else:
+                            contest_data, sample = await loop.run_in_executor(
+                                pool, profiling.run_profiled, utils.parse_contest_pages, pages, contest['id'], engine
+                            )
+                            profiler.add('parse', sample)
+                    metrics.registry.inc('rows_parsed', len(contest_data['participants']))
+                    mark(contest['id'], 'parsed')
+                    if log is not None:
+                        submissions.apply_log(contest_data, log)
+                    if config.PROBLEM_TAGS_ENABLED:
+                        with metrics.timed('contest_seconds', stage='problems'):
+                            await problem_meta.fetch_problems(fetcher, contest, problem_meta.problem_indices(contest_data))
+                    if users is not None:
+                        users.add(contest_data['participants'])
+                    await write_queue.put((contest_data, source_hash))
+            except Exception as e:
+                logger.error(f"✗ Error parsing contest {contest['id']}: {e}")
+                finish(contest['id'], False, f"parse: {e}")
+            finally:
+                parse_queue.task_done()
+    
+    async def writer():
+        while True:
+            contest_data, source_hash = await write_queue.get()
+            try:
+                if users is not None:
+                    with metrics.timed('contest_seconds', stage='users'):
+                        await asyncio.to_thread(users.resolve, contest_data['participants'])
+                with metrics.timed('contest_seconds', stage='write'):
+                    ok = await asyncio.to_thread(in_phase('write', utils.write_contest),
+                                                 contest_data, refresh, source_hash, parser)
+                finish(contest_data['contestId'], ok, None if ok else "write failed")
+            except Exception as e:
+                logger.error(f"✗ Error saving contest {contest_data.get('contestId')}: {e}")
+                finish(contest_data['contestId'], False, f"write: {e}")
+            finally:
+                if write_queue.empty():
+                    # One manifest write per drain of the queue rather than per contest
+                    try:
+                        await asyncio.to_thread(manifest.flush, config.MANIFEST_FLUSH_INTERVAL)
+                    except OSError as e:
+                        logger.error(f"✗ Could not write {manifest.path}: {e}")
+                write_queue.task_done()
+    
+    owns_pool = pool is None
+    if api is not None:
+        pool = None
+    elif owns_pool:
+        pool = create_parse_pool(parse_workers)
+    
+    if profiler is not None:
+        session = profiling.ProfiledSession(session, profiler)
     
-    # Add contest type if configured
-    contest_type = utils.determine_contest_type(contest_id)
-    if contest_type != 'unknown':
-        contest_data['type'] = contest_type
+    try:
+        async with AsyncFetcher(session, max_concurrency) as fetcher:
+            workers = [asyncio.create_task(fetch_worker(fetcher)) for _ in range(max_concurrency)]
+            workers += [asyncio.create_task(parse_worker(fetcher, pool)) for _ in range(max(1, parse_workers))]
+            workers.append(asyncio.create_task(writer()))
+            workers.append(asyncio.create_task(metrics.export_periodically()))
+            
+            try:
+                # Each stage hands its item on before marking it done, so the
+                # joins complete in order once everything has been written
+                await contest_queue.join()
+                await parse_queue.join()
+                await write_queue.join()
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+    finally:
+        progress.close()
+        manifest.flush()
+        if owns_pool and pool is not None:
+            pool.shutdown()
+    
+    return counts['successful'], counts['failed']
+
+
+def create_parse_pool(workers: int = None) -> Optional[ProcessPoolExecutor]:
+    """
+    Parser process pool for scrape_contests, or None when parsing runs in a
+    thread (PARSE_WORKERS=0 or DATA_SOURCE=api).
     
-    # Save to JSON
-    success = utils.save_contest_json(contest_data, config.OUTPUT_DIR)
+    Long-running callers create it once and pass it to every
+    scrape_contests call instead of paying for a process start each time.
+    """
+    workers = config.PARSE_WORKERS if workers is None else workers
+    if workers <= 0 or config.DATA_SOURCE == 'api':
+        return None
+    # 'spawn' keeps the children clear of the fetch threads' locks
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Clash of Codes contest scraper")
+    parser.add_argument(
+        '--source',
+        choices=['html', 'api'],
+        help=f"Where standings come from (default: {config.DATA_SOURCE})"
+    )
+    parser.add_argument(
+        '--parser',
+        choices=['lxml', 'bs4'],
+        help=f"Standings parser engine (default: {config.PARSER_ENGINE})"
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help="Bypass the on-disk HTTP response cache and the cached contest list"
+    )
+    refresh = parser.add_mutually_exclusive_group()
+    refresh.add_argument(
+        '--refresh',
+        metavar='IDS',
+        help="Re-scrape these already saved contests (comma-separated IDs) and rewrite only what changed"
+    )
+    refresh.add_argument(
+        '--refresh-recent',
+        metavar='N',
+        type=int,
+        help="Re-scrape the N most recent contests and rewrite only what changed"
+    )
+    refresh.add_argument(
+        '--resume',
+        action='store_true',
+        help="Finish the last run: scrape only the contests it did not write, without rediscovering"
+    )
+    parser.add_argument(
+        '--enrich-submissions',
+        action='store_true',
+        help="Rebuild timelines attempt by attempt from the contests' status pages"
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help=f"Profile each phase with cProfile and tracemalloc (reports under {config.PROFILE_DIR})"
+    )
+    return parser.parse_args(argv)
+
+
+def create_session() -> utils.CodeforcesSession:
+    """Session for the configured credentials, preferring cookies over a password."""
+    if config.CODEFORCES_SESSION and config.CODEFORCES_39CE7:
+        session = utils.CodeforcesSession(
+            session_cookie=config.CODEFORCES_SESSION,
+            cookie_39ce7=config.CODEFORCES_39CE7,
+            cf_clearance=config.CODEFORCES_CF_CLEARANCE
+        )
+        logger.info("Using cookie-based authentication")
+    else:
+        session = utils.CodeforcesSession(
+            username=config.USERNAME,
+            password=config.PASSWORD
+        )
+        logger.info("Using password-based authentication")
+    return session
+
+
+def login(session: utils.CodeforcesSession) -> bool:
+    """Log in, explaining how to get fresh cookies if that fails."""
+    if session.login():
+        return True
+    logger.error("Failed to authenticate. Please check your cookies/credentials.")
+    logger.error("\nTo get cookies from your browser:")
+    logger.error("1. Login to Codeforces in your browser")
+    logger.error("2. Open DevTools (F12)")
+    logger.error("3. Go to Application/Storage → Cookies → codeforces.com")
+    logger.error("4. Copy the values of 'JSESSIONID' and '39ce7' cookies")
+    logger.error("5. Add them to your .env file")
+    return False
+
+
+def select_contests(args: argparse.Namespace, session: utils.CodeforcesSession,
+                     group_id: str) -> Tuple[List[Dict], bool]:
+    """
+    Discover the group's contests and pick the ones this run scrapes.
     
-    # Small delay to avoid overwhelming the server
-    time.sleep(1)
+    Returns:
+        Tuple of (contests to scrape, whether this is a refresh)
+    """
+    # Load existing contests to avoid re-scraping
+    existing_contests = utils.load_existing_contests(config.OUTPUT_DIR)
+    refresh_ids = {id.strip() for id in (args.refresh or '').split(',') if id.strip()}
+    
+    # Get contest list
+    with profiling.phase('discovery'):
+        contests = scrape_all_contests(session, group_id, refresh_ids or None)
     
-    return success
+    if not contests:
+        logger.warning("No contests found to scrape")
+        sys.exit(0)
+    
+    refresh = bool(args.refresh or args.refresh_recent)
+    if refresh:
+        # Refresh mode: re-fetch the selected contests even if they exist
+        if args.refresh:
+            contests_to_scrape = [c for c in contests if c['id'] in refresh_ids]
+        else:
+            # The group contest list is ordered newest first
+            contests_to_scrape = contests[:args.refresh_recent]
+        
+        if not contests_to_scrape:
+            logger.warning("None of the requested contests were found in the group")
+            sys.exit(0)
+        logger.info(f"Refreshing {len(contests_to_scrape)} contests")
+    else:
+        # Filter out already scraped contests
+        contests_to_scrape = [c for c in contests if c['id'] not in existing_contests]
+        
+        if len(contests_to_scrape) < len(contests):
+            logger.info(f"Skipping {len(contests) - len(contests_to_scrape)} already scraped contests")
+        
+        if not contests_to_scrape:
+            logger.info("All contests already scraped!")
+            sys.exit(0)
+    
+    return contests_to_scrape, refresh
 
 
-def main():
+def main(argv: List[str] = None):
     """Main scraper execution."""
+    utils.setup_logging()
+    metrics.registry.reset()
+    args = parse_args(argv)
+    if args.source:
+        config.DATA_SOURCE = args.source
+    if args.parser:
+        config.PARSER_ENGINE = args.parser
+    if args.no_cache:
+        config.HTTP_CACHE_ENABLED = False
+    if args.enrich_submissions:
+        config.SUBMISSIONS_ENABLED = True
+    profiler = profiling.start() if args.profile else None
     
     print("=" * 60)
     print("Clash of Codes Contest Scraper")
@@ -118,75 +516,87 @@ def main():
         logger.error("See .env.example for reference.")
         sys.exit(1)
     
+    os.makedirs(config.OUTPUT_DIR, exist_ok=True)
     logger.info(f"Output directory: {config.OUTPUT_DIR}")
     logger.info(f"Group URL: {config.GROUP_URL}")
+    if config.DATA_SOURCE == 'api':
+        logger.info(f"Data source: Codeforces API ({config.CF_API_BASE_URL}, "
+                    f"{'signed' if config.CF_API_KEY else 'anonymous'})")
+    else:
+        logger.info(f"Parser engine: {config.PARSER_ENGINE}")
     
     # Extract group ID
-    group_id = extract_group_id(config.GROUP_URL)
+    group_id = utils.extract_group_id(config.GROUP_URL)
     if group_id:
         logger.info(f"Group ID: {group_id}")
     
     # Create session and login
-    # Prefer cookie-based authentication if available
-    if config.CODEFORCES_SESSION and config.CODEFORCES_39CE7:
-        session = utils.CodeforcesSession(
-            session_cookie=config.CODEFORCES_SESSION,
-            cookie_39ce7=config.CODEFORCES_39CE7,
-            cf_clearance=config.CODEFORCES_CF_CLEARANCE
-        )
-        logger.info("Using cookie-based authentication")
-    else:
-        session = utils.CodeforcesSession(
-            username=config.USERNAME,
-            password=config.PASSWORD
-        )
-        logger.info("Using password-based authentication")
-    
-    if not session.login():
-        logger.error("Failed to authenticate. Please check your cookies/credentials.")
-        logger.error("\nTo get cookies from your browser:")
-        logger.error("1. Login to Codeforces in your browser")
-        logger.error("2. Open DevTools (F12)")
-        logger.error("3. Go to Application/Storage → Cookies → codeforces.com")
-        logger.error("4. Copy the values of 'JSESSIONID' and '39ce7' cookies")
-        logger.error("5. Add them to your .env file")
+    session = create_session()
+    with profiling.phase('login'):
+        logged_in = login(session)
+    if not logged_in:
         sys.exit(1)
     
     print()
     
-    # Load existing contests to avoid re-scraping
-    existing_contests = utils.load_existing_contests(config.OUTPUT_DIR)
-    
-    # Get contest list
-    contests = scrape_all_contests(session, group_id)
-    
-    if not contests:
-        logger.warning("No contests found to scrape")
-        sys.exit(0)
+    journal = run_journal.Journal()
+    if args.resume:
+        # The journal's header has the contest list; no discovery needed
+        run = run_journal.load()
+        if run is None:
+            logger.warning(f"No run journal at {config.JOURNAL_PATH} to resume")
+            sys.exit(0)
+        contests_to_scrape = run_journal.unfinished(run)
+        refresh = run['refresh']
+        if not args.source:
+            config.DATA_SOURCE = run['source']
+        written = len(run['contests']) - len(contests_to_scrape)
+        failed_before = sum(1 for contest in contests_to_scrape if run['states'].get(contest['id']) == 'failed')
+        logger.info(f"Resuming run {run['runId']}: {written} contests already written, {failed_before} failed, "
+                    f"{len(contests_to_scrape) - failed_before} not finished")
+        for contest_id, reason in run['reasons'].items():
+            if run['states'].get(contest_id) == 'failed':
+                logger.info(f"  Retrying contest {contest_id} (failed: {reason})")
+        if not contests_to_scrape:
+            logger.info("Nothing left to resume!")
+            sys.exit(0)
+        journal.resume()
+    else:
+        contests_to_scrape, refresh = select_contests(args, session, group_id)
+        journal.start(contests_to_scrape, refresh)
     
-    # Filter out already scraped contests
-    contests_to_scrape = [c for c in contests if c['id'] not in existing_contests]
+    print()
+    logger.info(f"Starting to scrape {len(contests_to_scrape)} contests "
+                f"({config.MAX_CONCURRENCY} at a time)...")
+    print()
     
-    if len(contests_to_scrape) < len(contests):
-        logger.info(f"Skipping {len(contests) - len(contests_to_scrape)} already scraped contests")
+    # Scrape contests concurrently
+    try:
+        successful, failed = asyncio.run(
+            scrape_contests(session, contests_to_scrape, refresh=refresh, journal=journal)
+        )
+    except KeyboardInterrupt:
+        logger.warning("\n✗ Interrupted; run with --resume to scrape only what is left")
+        sys.exit(130)
+    finally:
+        journal.close()
     
-    if not contests_to_scrape:
-        logger.info("All contests already scraped!")
-        sys.exit(0)
+    if failed:
+        logger.info("Run with --resume to retry the failed contests")
     
-    print()
-    logger.info(f"Starting to scrape {len(contests_to_scrape)} contests...")
-    print()
+    # Aggregate the per-handle Rewind index
+    if config.REWIND_INDEX_ENABLED and successful:
+        rewind_index.rebuild(config.OUTPUT_DIR)
     
-    # Scrape each contest
-    successful = 0
-    failed = 0
+    # Club rating (NumPy is only needed when it is on)
+    if config.RATINGS_ENABLED and successful:
+        import ratings
+        ratings.update(config.OUTPUT_DIR)
     
-    for contest in tqdm(contests_to_scrape, desc="Scraping contests", unit="contest"):
-        if scrape_contest(session, contest):
-            successful += 1
-        else:
-            failed += 1
+    # Precomputed stats files for the frontend
+    if config.ANALYTICS_ENABLED and successful:
+        import analytics
+        analytics.rebuild(config.OUTPUT_DIR)
     
     # Summary
     print()
@@ -197,6 +607,18 @@ def main():
     if failed > 0:
         print(f"✗ Failed: {failed}")
     print(f"📁 Output directory: {config.OUTPUT_DIR}")
+    if session.cache:
+        print(f"🗄  HTTP cache: {session.cache.summary()}")
+    run = metrics.registry.summary()
+    print(f"⏱  Network: {run['requests']} requests, {run['bytes'] / 1e6:.1f} MB in {run['requestSeconds']}s, "
+          f"{run['rateLimitWaitSeconds']}s waiting for the rate limiter, "
+          f"{run['throttled']} throttled, {run['retries']} retries")
+    if run['rowsParsed']:
+        print(f"⏱  Parser: {run['rowsParsed']} rows in {run['parseSeconds']}s ({run['rowsPerSecond']} rows/s)")
+    for path in metrics.export():
+        print(f"📈 Metrics: {path}")
+    if profiler is not None:
+        print(f"🔬 Profile: {profiler.write()}/summary.txt")
     print("=" * 60)
     
     # List generated files
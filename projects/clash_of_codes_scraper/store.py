@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed contest store for the Clash of Codes scraper.
+Keeps contests, participants and solve events in indexed tables so
+cross-contest questions are answered without scanning data/.
+
+Usage:
+    python store.py migrate [--data-dir ./data/]   # import existing JSON files
+    python store.py handle <handle>                # all results of a handle
+    python store.py problem <index> [--contest ID] # all solvers of a problem
+    python store.py verify [--data-dir ./data/]    # check the store against the contest files
+"""
+
+import sys
+import json
+import sqlite3
+import argparse
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+import config
+import contest_io
+
+SCHEMA_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contests (
+    contest_id  TEXT PRIMARY KEY,
+    title       TEXT NOT NULL,
+    type        TEXT
+);
+
+CREATE TABLE IF NOT EXISTS participants (
+    contest_id  TEXT NOT NULL REFERENCES contests(contest_id) ON DELETE CASCADE,
+    handle      TEXT NOT NULL,
+    position    INTEGER NOT NULL,
+    rank        INTEGER NOT NULL,
+    solved      INTEGER NOT NULL,
+    attempted   INTEGER NOT NULL,
+    extra       TEXT,
+    PRIMARY KEY (contest_id, handle)
+);
+CREATE INDEX IF NOT EXISTS idx_participants_handle ON participants(handle);
+
+CREATE TABLE IF NOT EXISTS solve_events (
+    contest_id  TEXT NOT NULL,
+    handle      TEXT NOT NULL,
+    seq         INTEGER NOT NULL,
+    problem     TEXT NOT NULL,
+    time        INTEGER NOT NULL,
+    status      TEXT NOT NULL,
+    tags        TEXT NOT NULL DEFAULT '[]',
+    extra       TEXT,
+    PRIMARY KEY (contest_id, handle, seq),
+    FOREIGN KEY (contest_id, handle) REFERENCES participants(contest_id, handle) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_solve_events_problem ON solve_events(problem, status);
+CREATE INDEX IF NOT EXISTS idx_solve_events_handle ON solve_events(handle);
+"""
+
+# Statements that bring a database from the previous version to each version
+MIGRATIONS = {
+    2: "ALTER TABLE participants ADD COLUMN extra TEXT;",
+    3: "ALTER TABLE solve_events ADD COLUMN extra TEXT;",
+}
+
+# Fields with their own column; any other field (a participant's rating,
+# rankTitle and avatar, an event's submissionId, ...) is kept in the row's
+# 'extra' JSON
+PARTICIPANT_COLUMNS = ('rank', 'solved', 'attempted', 'solveTimeline')
+EVENT_COLUMNS = ('problem', 'time', 'status', 'tags')
+
+
+def _extra_json(data: Dict[str, Any], columns) -> Optional[str]:
+    extra = {key: value for key, value in data.items() if key not in columns}
+    return json.dumps(extra, ensure_ascii=False) if extra else None
+
+
+class ContestStore:
+    """Indexed SQLite storage and query API for scraped contests."""
+    
+    def __init__(self, db_path: str = None):
+        self.db_path = Path(db_path or config.SQLITE_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Contests are saved from the async engine's worker threads
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA foreign_keys = ON')
+        self._conn.execute('PRAGMA journal_mode = WAL')
+        self._lock = threading.Lock()
+        self._migrate()
+    
+    def _migrate(self):
+        version = self._conn.execute('PRAGMA user_version').fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        with self._conn:
+            if version == 0:
+                self._conn.executescript(SCHEMA)
+            else:
+                for step in range(version + 1, SCHEMA_VERSION + 1):
+                    self._conn.executescript(MIGRATIONS[step])
+            self._conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    
+    def close(self):
+        self._conn.close()
+    
+    def __enter__(self) -> 'ContestStore':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def save_contest(self, contest_data: Dict[str, Any]):
+        """Insert or replace one contest with all of its participants and solve events."""
+        contest_id = str(contest_data['contestId'])
+        participants = []
+        events = []
+        for position, (handle, data) in enumerate(contest_data.get('participants', {}).items()):
+            participants.append((contest_id, handle, position, data['rank'], data['solved'], data['attempted'],
+                                 _extra_json(data, PARTICIPANT_COLUMNS)))
+            for seq, event in enumerate(data.get('solveTimeline', [])):
+                events.append((contest_id, handle, seq, event['problem'], event['time'],
+                               event['status'], json.dumps(event.get('tags', [])),
+                               _extra_json(event, EVENT_COLUMNS)))
+        
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM contests WHERE contest_id = ?', (contest_id,))
+            self._conn.execute(
+                'INSERT INTO contests (contest_id, title, type) VALUES (?, ?, ?)',
+                (contest_id, contest_data.get('title', ''), contest_data.get('type'))
+            )
+            self._conn.executemany(
+                'INSERT INTO participants (contest_id, handle, position, rank, solved, attempted, extra) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)', participants)
+            self._conn.executemany(
+                'INSERT INTO solve_events (contest_id, handle, seq, problem, time, status, tags, extra) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', events)
+    
+    def contest_ids(self) -> Set[str]:
+        """IDs of every stored contest."""
+        with self._lock:
+            rows = self._conn.execute('SELECT contest_id FROM contests').fetchall()
+        return {row['contest_id'] for row in rows}
+    
+    def contest_summaries(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Title, type and participant count of every stored contest.
+        
+        Returns:
+            Contest ID -> {'title', 'participants'} plus 'type' when set
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT c.contest_id, c.title, c.type, COUNT(p.handle) AS participants '
+                'FROM contests c LEFT JOIN participants p ON p.contest_id = c.contest_id '
+                'GROUP BY c.contest_id').fetchall()
+        summaries = {}
+        for row in rows:
+            summary = summaries[row['contest_id']] = {'title': row['title'], 'participants': row['participants']}
+            if row['type'] is not None:
+                summary['type'] = row['type']
+        return summaries
+    
+    def get_contest(self, contest_id: str) -> Optional[Dict[str, Any]]:
+        """Rebuild a contest in the same dict shape as the JSON output."""
+        with self._lock:
+            contest = self._conn.execute(
+                'SELECT * FROM contests WHERE contest_id = ?', (str(contest_id),)
+            ).fetchone()
+            if contest is None:
+                return None
+            participant_rows = self._conn.execute(
+                'SELECT * FROM participants WHERE contest_id = ? ORDER BY position', (str(contest_id),)
+            ).fetchall()
+            event_rows = self._conn.execute(
+                'SELECT * FROM solve_events WHERE contest_id = ? ORDER BY handle, seq', (str(contest_id),)
+            ).fetchall()
+        
+        timelines: Dict[str, List[Dict]] = {}
+        for row in event_rows:
+            event = {
+                'problem': row['problem'],
+                'time': row['time'],
+                'status': row['status'],
+                'tags': json.loads(row['tags'])
+            }
+            if row['extra']:
+                event.update(json.loads(row['extra']))
+            timelines.setdefault(row['handle'], []).append(event)
+        
+        participants = {}
+        for row in participant_rows:
+            participant = {
+                'rank': row['rank'],
+                'solved': row['solved'],
+                'attempted': row['attempted'],
+                'solveTimeline': timelines.get(row['handle'], [])
+            }
+            if row['extra']:
+                participant.update(json.loads(row['extra']))
+            participants[row['handle']] = participant
+        
+        result = {
+            'contestId': contest['contest_id'],
+            'title': contest['title'],
+            'participants': participants
+        }
+        if contest['type']:
+            result['type'] = contest['type']
+        return result
+    
+    def results_for_handle(self, handle: str) -> List[Dict[str, Any]]:
+        """Every contest result of a handle, oldest contest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT c.contest_id, c.title, c.type, p.rank, p.solved, p.attempted '
+                'FROM participants p JOIN contests c USING (contest_id) '
+                'WHERE p.handle = ? ORDER BY CAST(c.contest_id AS INTEGER)',
+                (handle,)
+            ).fetchall()
+        return [
+            {'contestId': row['contest_id'], 'title': row['title'], 'type': row['type'],
+             'rank': row['rank'], 'solved': row['solved'], 'attempted': row['attempted']}
+            for row in rows
+        ]
+    
+    def solvers_of_problem(self, problem: str, contest_id: str = None) -> List[Dict[str, Any]]:
+        """Every accepted solve of a problem index, optionally within one contest."""
+        query = ('SELECT contest_id, handle, time FROM solve_events '
+                 "WHERE problem = ? AND status = 'AC'")
+        params: List[Any] = [problem]
+        if contest_id is not None:
+            query += ' AND contest_id = ?'
+            params.append(str(contest_id))
+        query += ' ORDER BY CAST(contest_id AS INTEGER), time'
+        
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [{'contestId': row['contest_id'], 'handle': row['handle'], 'time': row['time']} for row in rows]
+    
+    def import_json_dir(self, data_dir: str = None) -> int:
+        """
+        Import every contest file (JSON or compact) from a directory.
+        
+        Returns:
+            Number of contests imported
+        """
+        data_dir = Path(data_dir or config.OUTPUT_DIR)
+        imported = 0
+        paths = sorted(data_dir.glob('contest_*.json')) + sorted(data_dir.glob(f'contest_*{contest_io.COMPACT_SUFFIX}'))
+        for path in paths:
+            self.save_contest(contest_io.read_contest_file(path))
+            imported += 1
+        return imported
+    
+    def verify_json_dir(self, data_dir: str = None) -> Dict[str, str]:
+        """
+        Check every contest file of a directory against this store, without
+        writing to it.
+        
+        Each file first goes through a temporary in-memory store, which
+        shows whether the store keeps it losslessly and gives the rows it
+        should have; those are then compared with the stored contest.
+        
+        Returns:
+            Contest ID -> what is wrong, for every contest that does not match
+        """
+        data_dir = Path(data_dir or config.OUTPUT_DIR)
+        mismatches = {}
+        paths = sorted(data_dir.glob('contest_*.json')) + sorted(data_dir.glob(f'contest_*{contest_io.COMPACT_SUFFIX}'))
+        with ContestStore(':memory:') as scratch:
+            for path in paths:
+                contest_data = contest_io.read_contest_file(path)
+                contest_id = str(contest_data['contestId'])
+                scratch.save_contest(contest_data)
+                expected = scratch.get_contest(contest_id)
+                stored = self.get_contest(contest_id)
+                if expected != contest_data:
+                    mismatches[contest_id] = f"{path.name} changes on a save and load"
+                elif stored is None:
+                    mismatches[contest_id] = "not in the store"
+                elif stored != expected:
+                    mismatches[contest_id] = f"stored contest differs from {path.name}"
+        return mismatches
+
+
+_default_store: Optional[ContestStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_store() -> ContestStore:
+    """The process-wide store at config.SQLITE_PATH, opened on first use."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = ContestStore()
+        return _default_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query or populate the SQLite contest store")
+    parser.add_argument('--db', default=None, help=f"Database path (default: {config.SQLITE_PATH})")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    migrate = commands.add_parser('migrate', help="Import existing contest JSON files")
+    migrate.add_argument('--data-dir', default=None, help=f"Directory to import (default: {config.OUTPUT_DIR})")
+    
+    handle = commands.add_parser('handle', help="Show every result of a handle")
+    handle.add_argument('handle')
+    
+    problem = commands.add_parser('problem', help="Show every solver of a problem index")
+    problem.add_argument('problem')
+    problem.add_argument('--contest', default=None, help="Restrict to one contest ID")
+    
+    verify = commands.add_parser('verify', help="Check the stored contests against the contest files (read-only)")
+    verify.add_argument('--data-dir', default=None, help=f"Directory to check (default: {config.OUTPUT_DIR})")
+    
+    args = parser.parse_args()
+    
+    with ContestStore(args.db) as store:
+        if args.command == 'migrate':
+            count = store.import_json_dir(args.data_dir)
+            print(f"✓ Imported {count} contests into {store.db_path}")
+        elif args.command == 'handle':
+            for result in store.results_for_handle(args.handle):
+                print(f"{result['contestId']}  rank {result['rank']:>4}  solved {result['solved']}  {result['title']}")
+        elif args.command == 'problem':
+            for solve in store.solvers_of_problem(args.problem, args.contest):
+                print(f"{solve['contestId']}  {solve['handle']:<24} {solve['time']}")
+        elif args.command == 'verify':
+            mismatches = store.verify_json_dir(args.data_dir)
+            for contest_id, problem in mismatches.items():
+                print(f"✗ {contest_id}: {problem}")
+            if mismatches:
+                print(f"✗ {len(mismatches)} contests do not match the store")
+                return 1
+            print("✓ Every contest file matches the store")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,325 @@
+"""
+Per-submission timeline enrichment for the Clash of Codes scraper.
+
+Standings cells only say when a problem was accepted and how many attempts
+were rejected before that. This module reads the contest's status pages
+(or contest.status with DATA_SOURCE=api) to rebuild every participant's
+timeline attempt by attempt, with the real verdict and time of each one.
+
+Submissions are kept in a per-contest log under SUBMISSIONS_DIR together
+with the highest submission ID seen. Status pages are newest first, so a
+refresh stops at the first page that reaches that ID and only new
+submissions are fetched.
+"""
+
+from __future__ import annotations
+
+import re
+import json
+import asyncio
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+import config
+import utils
+from contest_io import atomic_write
+from utils import logger
+
+if TYPE_CHECKING:
+    from cf_api import CodeforcesAPI
+    from fetcher import AsyncFetcher
+
+# Pagination links on a status page, e.g. /group/X/contest/123/status/page/2
+STATUS_PAGE_PATTERN = re.compile(r'/status/page/(\d+)')
+PROBLEM_LINK_PATTERN = re.compile(r'/problem/([A-Za-z0-9]+)')
+
+# Codeforces verdicts -> timeline status codes (unlisted verdicts are kept as is)
+VERDICTS = {
+    'OK': 'AC',
+    'WRONG_ANSWER': 'WA',
+    'TIME_LIMIT_EXCEEDED': 'TLE',
+    'MEMORY_LIMIT_EXCEEDED': 'MLE',
+    'IDLENESS_LIMIT_EXCEEDED': 'ILE',
+    'RUNTIME_ERROR': 'RE',
+    'COMPILATION_ERROR': 'CE',
+    'PRESENTATION_ERROR': 'PE',
+    'CHALLENGED': 'HACKED',
+}
+
+# Verdicts of submissions that are still being judged
+PENDING_VERDICTS = (None, '', 'TESTING')
+
+# API participant types whose submissions belong in the contest timeline
+CONTEST_PARTICIPANT_TYPES = ('CONTESTANT', 'OUT_OF_COMPETITION', 'VIRTUAL')
+
+
+def status_page_url(contest: Dict[str, Any], page: int) -> str:
+    """URL of one page of a contest's submissions, newest first."""
+    base_url = contest['url'].split('/standings')[0]
+    return f"{base_url}/status/page/{page}?order=BY_ARRIVED_DESC"
+
+
+def log_path(contest_id: str) -> Path:
+    return Path(config.SUBMISSIONS_DIR) / f"contest_{contest_id}.json"
+
+
+def load_log(contest_id: str) -> Dict[str, Any]:
+    """The stored submission log of a contest, or an empty one."""
+    try:
+        with open(log_path(contest_id), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'contestId': str(contest_id), 'lastSubmissionId': 0, 'submissions': []}
+
+
+def save_log(log: Dict[str, Any]):
+    atomic_write(log_path(log['contestId']), json.dumps(log, ensure_ascii=False).encode('utf-8'))
+
+
+def _extract_status_rows_bs4(html: str) -> List[tuple]:
+    """(submission id, time text, handle, problem href, verdict) for each status row."""
+    from bs4 import BeautifulSoup
+    
+    soup = BeautifulSoup(html, 'html.parser')
+    rows = []
+    for row in soup.select('tr[data-submission-id]'):
+        when = row.select_one('.format-time')
+        party = row.select_one('td.status-party-cell a')
+        problem = row.select_one('td[data-problemid] a')
+        verdict = row.select_one('[submissionverdict]')
+        rows.append((
+            row['data-submission-id'],
+            when.get_text(strip=True) if when else None,
+            party.get_text(strip=True) if party else None,
+            problem.get('href') if problem else None,
+            verdict.get('submissionverdict') if verdict else None,
+        ))
+    return rows
+
+
+def _extract_status_rows_lxml(html: str) -> List[tuple]:
+    """lxml version of _extract_status_rows_bs4 with the same output."""
+    # lxml refuses an empty document; bs4 just finds nothing in it
+    if not html.strip():
+        return []
+    tree = utils._load_lxml().fromstring(html)
+    rows = []
+    for row in tree.iterfind('.//tr[@data-submission-id]'):
+        when = row.xpath(".//*[contains(concat(' ', @class, ' '), ' format-time ')]")
+        party = row.xpath(".//td[contains(concat(' ', @class, ' '), ' status-party-cell ')]//a")
+        problem = row.xpath('.//td[@data-problemid]//a')
+        verdict = row.xpath('.//*[@submissionverdict]')
+        rows.append((
+            row.get('data-submission-id'),
+            when[0].text_content().strip() if when else None,
+            party[0].text_content().strip() if party else None,
+            problem[0].get('href') if problem else None,
+            verdict[0].get('submissionverdict') if verdict else None,
+        ))
+    return rows
+
+
+def parse_status_page(html: str, engine: str = None) -> List[Dict[str, Any]]:
+    """
+    Extract the submissions listed on a status page.
+    
+    Args:
+        html: HTML of the status page
+        engine: 'lxml' or 'bs4' (defaults to config.PARSER_ENGINE)
+    
+    Returns:
+        List of {'id', 'handle', 'problem', 'verdict', 'submittedAt'} dicts,
+        newest first; 'verdict' is None while a submission is being judged
+        and 'submittedAt' is in utils.parse_cf_time() seconds
+    """
+    engine = engine or config.PARSER_ENGINE
+    if engine == 'lxml' and utils._load_lxml() is None:
+        engine = 'bs4'
+    
+    if engine == 'lxml':
+        rows = _extract_status_rows_lxml(html)
+    elif engine == 'bs4':
+        rows = _extract_status_rows_bs4(html)
+    else:
+        raise ValueError(f"Unknown parser engine: {engine}")
+    
+    submissions = []
+    for submission_id, when, handle, problem_href, verdict in rows:
+        problem = PROBLEM_LINK_PATTERN.search(problem_href or '')
+        submitted_at = utils.parse_cf_time(when) if when else None
+        if not submission_id.isdigit() or not handle or not problem or submitted_at is None:
+            continue
+        submissions.append({
+            'id': int(submission_id),
+            'handle': handle,
+            'problem': problem.group(1),
+            'verdict': verdict or None,
+            'submittedAt': submitted_at,
+        })
+    return submissions
+
+
+def status_page_count(html: str) -> int:
+    """Number of status pages, from the pagination links."""
+    return max((int(n) for n in STATUS_PAGE_PATTERN.findall(html)), default=1)
+
+
+def _merge_new(log: Dict[str, Any], fetched: List[Dict[str, Any]]) -> int:
+    """
+    Add fetched submissions newer than the log's cursor and move the cursor.
+    
+    The cursor stops below the oldest submission still being judged, so that
+    submission is fetched again (with its verdict) next time. Submissions
+    made outside the contest (time None) only move the cursor.
+    
+    Returns:
+        Number of submissions added
+    """
+    last_id = log['lastSubmissionId']
+    new = {submission['id']: submission for submission in fetched if submission['id'] > last_id}
+    pending = [submission_id for submission_id, submission in new.items()
+               if submission['verdict'] in PENDING_VERDICTS]
+    final = {submission_id: submission for submission_id, submission in new.items()
+             if submission_id not in pending and (not pending or submission_id < min(pending))}
+    
+    added = sorted((submission for submission in final.values() if submission['time'] is not None),
+                   key=lambda submission: submission['id'])
+    log['submissions'].extend(added)
+    if final:
+        log['lastSubmissionId'] = max(final)
+    return len(added)
+
+
+async def refresh_log(fetcher: AsyncFetcher, contest: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Fetch a contest's new submissions from its status pages into its log.
+    
+    Page 1 gives the page count; further pages are fetched
+    config.MAX_CONCURRENCY at a time, until a page reaches the last
+    submission already in the log.
+    
+    Args:
+        fetcher: Async fetch engine wrapping the authenticated session
+        contest: Contest info dict with 'id' and 'url', and 'startTime' and
+            'duration' from the contest list on the first run
+    
+    Returns:
+        The updated log, or None if the status pages could not be read
+    """
+    contest_id = contest['id']
+    log = load_log(contest_id)
+    for key in ('startTime', 'duration'):
+        if contest.get(key) is not None:
+            log[key] = contest[key]
+    if log.get('startTime') is None:
+        logger.warning(f"Start time of contest {contest_id} is unknown, skipping submission enrichment")
+        return None
+    
+    last_id = log['lastSubmissionId']
+    response = await fetcher.get(status_page_url(contest, 1))
+    if not response:
+        logger.warning(f"✗ Failed to fetch submissions of contest {contest_id}")
+        return None
+    
+    fetched = parse_status_page(response.text)
+    last_page = status_page_count(response.text)
+    page = 2
+    pages_fetched = 1
+    while page <= last_page and not any(submission['id'] <= last_id for submission in fetched):
+        batch = range(page, min(last_page, page + config.MAX_CONCURRENCY - 1) + 1)
+        responses = await asyncio.gather(*(fetcher.get(status_page_url(contest, n)) for n in batch))
+        if not all(responses):
+            logger.warning(f"✗ Failed to fetch every status page of contest {contest_id}")
+            return None
+        for page_response in responses:
+            fetched += parse_status_page(page_response.text)
+        pages_fetched += len(batch)
+        page += len(batch)
+    
+    # Status pages show wall-clock times; practice submissions fall outside the contest window
+    duration = log.get('duration')
+    for submission in fetched:
+        elapsed = submission.pop('submittedAt') - log['startTime']
+        in_contest = elapsed >= 0 and (duration is None or elapsed <= duration)
+        submission['time'] = elapsed if in_contest else None
+    
+    added = _merge_new(log, fetched)
+    logger.info(f"Contest {contest_id}: {added} new submissions from {pages_fetched} status page(s)")
+    save_log(log)
+    return log
+
+
+def refresh_log_api(api: CodeforcesAPI, contest: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    API version of refresh_log: pages through contest.status, newest first,
+    config.SUBMISSIONS_API_PAGE_SIZE at a time. Times are exact
+    (relativeTimeSeconds) and practice submissions only move the cursor.
+    """
+    from cf_api import CodeforcesAPIError, _party_handle
+    
+    contest_id = contest['id']
+    log = load_log(contest_id)
+    last_id = log['lastSubmissionId']
+    page_size = config.SUBMISSIONS_API_PAGE_SIZE
+    fetched = []
+    first = 1
+    
+    try:
+        while True:
+            page = api.contest_status(contest_id, first, page_size)
+            for submission in page:
+                author = submission.get('author', {})
+                in_contest = author.get('participantType') in CONTEST_PARTICIPANT_TYPES
+                fetched.append({
+                    'id': submission['id'],
+                    'handle': _party_handle(author),
+                    'problem': submission['problem']['index'],
+                    'verdict': submission.get('verdict'),
+                    'time': submission['relativeTimeSeconds'] if in_contest else None,
+                })
+            if len(page) < page_size or any(submission['id'] <= last_id for submission in page):
+                break
+            first += page_size
+    except CodeforcesAPIError as e:
+        logger.warning(f"✗ Failed to fetch submissions of contest {contest_id}: {e}")
+        return None
+    
+    added = _merge_new(log, [submission for submission in fetched if submission['handle']])
+    logger.info(f"Contest {contest_id}: {added} new submissions from the API")
+    save_log(log)
+    return log
+
+
+def apply_log(contest_data: Dict[str, Any], log: Dict[str, Any]) -> int:
+    """
+    Replace standings-derived timelines with per-attempt ones from a log.
+    
+    Each participant with logged submissions gets one event per attempt, in
+    submission order, up to and including the first accepted one on each
+    problem (later attempts do not count in the standings either). Other
+    participants keep their timeline.
+    
+    Returns:
+        Number of participants whose timeline was replaced
+    """
+    participants = contest_data['participants']
+    timelines: Dict[str, List[Dict[str, Any]]] = {}
+    solved: Dict[str, set] = {}
+    
+    for submission in sorted(log['submissions'], key=lambda submission: (submission['time'], submission['id'])):
+        handle = submission['handle']
+        if handle not in participants or submission['problem'] in solved.setdefault(handle, set()):
+            continue
+        timelines.setdefault(handle, []).append({
+            'problem': submission['problem'],
+            'time': submission['time'],
+            'status': VERDICTS.get(submission['verdict'], submission['verdict']),
+            'tags': [],
+            'submissionId': submission['id'],
+        })
+        if submission['verdict'] == 'OK':
+            solved[handle].add(submission['problem'])
+    
+    for handle, timeline in timelines.items():
+        participants[handle]['solveTimeline'] = timeline
+    return len(timelines)
@@ -0,0 +1,31 @@
+"""
+Shared fixtures: every test runs against settings built from an empty
+environment (no .env) with OUTPUT_DIR in a fresh temp directory, so nothing
+is ever written to the real data directory.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config
+
+
+@pytest.fixture(autouse=True)
+def output_dir(tmp_path):
+    """OUTPUT_DIR of the test, with the caches beside it."""
+    cache = tmp_path / '.cache'
+    config.configure(
+        config.Settings.from_env({}),
+        OUTPUT_DIR=str(tmp_path / 'data'),
+        CONTEST_LIST_CACHE_PATH=str(cache / 'contest_list.json'),
+        HTTP_CACHE_DIR=str(cache / 'http'),
+        USER_INFO_CACHE=str(cache / 'users.json'),
+        METRICS_REPORT='',
+        METRICS_TEXTFILE='',
+        JOURNAL_PATH=str(cache / 'journal.jsonl'),
+    )
+    return tmp_path / 'data'
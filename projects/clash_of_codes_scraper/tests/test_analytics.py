@@ -0,0 +1,59 @@
+import json
+from pathlib import Path
+
+import analytics
+import config
+import utils
+
+MULTI = {
+    'contestId': '2',
+    'title': 'Multi',
+    'participants': {
+        'a': {'rank': 1, 'solveTimeline': [
+            {'problem': 'A', 'time': 0, 'status': 'WA'},
+            {'problem': 'A', 'time': 400, 'status': 'AC'},
+            {'problem': 'A', 'time': 900, 'status': 'AC'},
+            {'problem': 'B', 'time': 100, 'status': 'AC'},
+        ]},
+        'b': {'rank': 2, 'solveTimeline': [
+            {'problem': 'A', 'time': 400, 'status': 'AC'},
+            {'problem': 'C', 'time': 0, 'status': 'WA'},
+        ]},
+        'c': {'rank': 0, 'solveTimeline': []},
+    },
+}
+
+
+def test_contest_stats_per_problem():
+    stats = analytics.contest_stats(MULTI, bin_seconds=300)
+    problems = {problem['problem']: problem for problem in stats['problems']}
+    
+    assert stats['participants'] == 3
+    assert problems['A']['solved'] == 2 and problems['A']['tried'] == 2
+    # Both solved A at 400; the better rank is the first solve
+    assert problems['A']['firstSolve'] == {'handle': 'a', 'time': 400}
+    assert problems['C']['solved'] == 0 and problems['C']['firstSolve'] is None
+    assert problems['C']['meanTime'] is None
+    assert stats['solvedDistribution'] == [1, 1, 1, 0]
+    assert stats['solvesOverTime']['total'] == [1, 2]
+
+
+def test_contest_stats_empty_contest():
+    stats = analytics.contest_stats({'contestId': '3', 'title': 'Empty', 'participants': {}})
+    assert stats['participants'] == 0 and stats['problems'] == []
+    assert stats['solveTimes'] == {'solves': 0, 'meanTime': None,
+                                   'percentiles': {'p25': None, 'p50': None, 'p75': None, 'p90': None}}
+
+
+def test_rebuild_writes_under_output_dir_and_reuses(output_dir):
+    utils.write_contest(MULTI)
+    utils.write_contest({'contestId': '3', 'title': 'Empty', 'participants': {}})
+    
+    assert analytics.rebuild() == {'computed': 2, 'reused': 0}
+    assert analytics.rebuild() == {'computed': 0, 'reused': 2}
+    
+    analytics_dir = Path(config.ANALYTICS_DIR)
+    assert analytics_dir.parent == output_dir
+    assert sorted(path.name for path in analytics_dir.iterdir()) == ['contest_2.json', 'contest_3.json', 'group.json']
+    group = json.loads((analytics_dir / 'group.json').read_text(encoding='utf-8'))
+    assert group['contests'] == 2 and group['participantEntries'] == 3
@@ -0,0 +1,35 @@
+import argparse
+
+import cli
+import contest_io
+import utils
+from manifest import get_manifest
+
+
+def _status(**options):
+    return cli.cmd_status(argparse.Namespace(**dict({'list': False, 'verify': False, 'deep': False}, **options)))
+
+
+def test_status_without_manifest_writes_nothing(output_dir, capsys):
+    output_dir.mkdir(parents=True)
+    (output_dir / 'contest_7.json').write_bytes(contest_io.encode_json(
+        {'contestId': '7', 'title': 'Old', 'participants': {}}))
+    before = sorted(path.name for path in output_dir.iterdir())
+    
+    assert _status(list=True, verify=True) == 0
+    
+    assert sorted(path.name for path in output_dir.iterdir()) == before
+    out = capsys.readouterr().out
+    assert 'Contests saved:   1' in out and 'none yet' in out
+
+
+def test_status_reads_existing_manifest(output_dir, capsys):
+    utils.write_contest({'contestId': '8', 'title': 'New', 'participants': {}})
+    get_manifest(str(output_dir)).flush()
+    manifest = (output_dir / 'manifest.json').read_bytes()
+    
+    assert _status() == 0
+    
+    assert (output_dir / 'manifest.json').read_bytes() == manifest
+    out = capsys.readouterr().out
+    assert 'Contests saved:   1' in out and 'none yet' not in out
@@ -0,0 +1,26 @@
+import os
+
+import config
+
+
+def test_derived_paths_follow_configured_output_dir(tmp_path):
+    config.configure(OUTPUT_DIR=str(tmp_path))
+    for name in config.DERIVED_PATHS:
+        path = getattr(config, name)
+        assert os.path.commonpath([path, str(tmp_path)]) == str(tmp_path), name
+
+
+def test_derived_paths_follow_assigned_output_dir(tmp_path):
+    config.OUTPUT_DIR = str(tmp_path)
+    assert config.RATINGS_PATH == os.path.join(str(tmp_path), 'ratings.json')
+    assert config.ANALYTICS_DIR == os.path.join(str(tmp_path), 'analytics')
+
+
+def test_explicit_derived_path_wins(tmp_path):
+    config.configure(config.Settings.from_env({'OUTPUT_DIR': str(tmp_path), 'SQLITE_PATH': '/srv/contests.db'}))
+    assert config.SQLITE_PATH == '/srv/contests.db'
+    assert config.REWIND_DIR == os.path.join(str(tmp_path), 'rewind')
+    
+    # A later configure() without it goes back to the derived default
+    config.configure(config.Settings.from_env({'OUTPUT_DIR': str(tmp_path)}))
+    assert config.SQLITE_PATH == os.path.join(str(tmp_path), 'contests.db')
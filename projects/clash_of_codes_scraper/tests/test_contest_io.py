@@ -0,0 +1,50 @@
+import json
+
+import contest_io
+
+
+def _round_trip(contest):
+    return contest_io.decode_compact(contest_io.encode_compact(contest))
+
+
+def test_compact_round_trip_full_records():
+    contest = {
+        'contestId': '1', 'title': 'Full', 'participants': {
+            'a': {'rank': 1, 'solved': 1, 'attempted': 2, 'solveTimeline': [
+                {'problem': 'A', 'time': 60, 'status': 'AC', 'tags': ['dp'], 'submissionId': 10},
+                {'problem': 'B', 'time': 0, 'status': 'WA', 'tags': []},
+            ], 'rating': 1500, 'rankTitle': 'specialist', 'avatar': None},
+        },
+        'type': 'weekly',
+    }
+    decoded = _round_trip(contest)
+    assert decoded == contest
+    assert json.dumps(decoded) == json.dumps(contest)
+
+
+def test_compact_round_trip_sparse_records():
+    contest = {
+        'contestId': '2', 'title': 'Sparse', 'participants': {
+            'no-columns': {'solveTimeline': []},
+            'no-timeline': {'rank': 3, 'solved': 0},
+            'reordered': {'solved': 1, 'rank': 2, 'solveTimeline': [
+                {'problem': 'A', 'status': 'AC'},
+                {'time': 5, 'problem': 'B', 'status': 'WA', 'tags': ['math']},
+                {'status': 'AC', 'tags': []},
+            ], 'attempted': 2},
+            'empty': {},
+        },
+    }
+    decoded = _round_trip(contest)
+    # Key order too, not just equality
+    assert json.dumps(decoded) == json.dumps(contest)
+
+
+def test_compact_round_trip_non_integer_values():
+    contest = {'contestId': '3', 'title': 'IOI', 'participants': {
+        'a': {'rank': 1, 'solved': 2.5, 'attempted': None, 'solveTimeline': [
+            {'problem': 'A', 'time': 2 ** 40, 'status': 'AC', 'tags': []},
+            {'problem': 'B', 'time': None, 'status': 'PARTIAL', 'tags': []},
+        ]},
+    }}
+    assert json.dumps(_round_trip(contest)) == json.dumps(contest)
@@ -0,0 +1,49 @@
+import json
+
+import config
+import contest_io
+import store
+import utils
+from manifest import Manifest
+
+CONTEST = {'contestId': '1', 'title': 'Round 1', 'participants': {
+    'a': {'rank': 1, 'solved': 0, 'attempted': 0, 'solveTimeline': []}}}
+
+
+def test_changes_are_written_on_flush(output_dir):
+    manifest = Manifest(str(output_dir))
+    for contest_id in ('1', '2', '3'):
+        manifest.record(dict(CONTEST, contestId=contest_id), {})
+    manifest.touch('1')
+    manifest.remove('3')
+    
+    assert not manifest.path.exists()
+    assert manifest.flush()
+    assert set(json.loads(manifest.path.read_text())['contests']) == {'1', '2'}
+    # Nothing pending, and a recent write holds back the next one
+    assert not manifest.flush()
+    manifest.record(dict(CONTEST, contestId='4'), {})
+    assert not manifest.flush(min_interval=3600)
+    assert manifest.flush()
+    assert Manifest(str(output_dir)).contest_ids() == ['1', '2', '4']
+
+
+def test_bootstrap_fills_every_entry(output_dir, monkeypatch):
+    config.STORAGE_BACKEND = 'both'
+    output_dir.mkdir(parents=True)
+    (output_dir / 'contest_1.json').write_bytes(contest_io.encode_json(CONTEST))
+    with store.ContestStore(config.SQLITE_PATH) as contests:
+        contests.save_contest(dict(CONTEST, contestId='2', title='Only in SQLite', type='weekly'))
+    monkeypatch.setattr(store, '_default_store', None)
+    
+    try:
+        assert utils.load_existing_contests(str(output_dir)) == {'1', '2'}
+    finally:
+        store.get_default_store().close()
+    
+    entries = json.loads((output_dir / 'manifest.json').read_text())['contests']
+    assert set(entries['1']) == set(entries['2']) - {'type'}
+    for entry in entries.values():
+        assert entry['fetchedAt'] == entry['savedAt'] > 0
+    assert entries['2']['title'] == 'Only in SQLite' and entries['2']['participants'] == 1
+    assert entries['2']['type'] == 'weekly'
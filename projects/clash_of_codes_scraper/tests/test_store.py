@@ -0,0 +1,62 @@
+import json
+import sqlite3
+
+import contest_io
+import store
+
+ENRICHED = {
+    'contestId': '1', 'title': 'Enriched', 'participants': {
+        'a': {'rank': 1, 'solved': 1, 'attempted': 1, 'solveTimeline': [
+            {'problem': 'A', 'time': 5, 'status': 'WA', 'tags': ['dp'], 'submissionId': 111},
+            {'problem': 'A', 'time': 9, 'status': 'AC', 'tags': ['dp'], 'submissionId': 112},
+        ], 'rating': 1500, 'rankTitle': 'specialist', 'avatar': 'https://example.com/a.jpg'},
+        'b': {'rank': 2, 'solved': 0, 'attempted': 0, 'solveTimeline': [],
+              'rating': None, 'rankTitle': None, 'avatar': None},
+    },
+    'type': 'weekly',
+}
+
+
+def test_save_get_round_trip(tmp_path):
+    with store.ContestStore(str(tmp_path / 'contests.db')) as contests:
+        contests.save_contest(ENRICHED)
+        assert json.dumps(contests.get_contest('1')) == json.dumps(ENRICHED)
+
+
+def test_verify_does_not_write(output_dir, tmp_path):
+    output_dir.mkdir(parents=True)
+    (output_dir / 'contest_1.json').write_bytes(contest_io.encode_json(ENRICHED))
+    changed = dict(ENRICHED, title='Renamed')
+    (output_dir / 'contest_2.json').write_bytes(contest_io.encode_json(dict(ENRICHED, contestId='2')))
+    
+    with store.ContestStore(str(tmp_path / 'contests.db')) as contests:
+        contests.save_contest(changed)
+        
+        mismatches = contests.verify_json_dir(str(output_dir))
+        
+        assert set(mismatches) == {'1', '2'}
+        assert 'differs' in mismatches['1'] and mismatches['2'] == 'not in the store'
+        # The stored rows are left as they were
+        assert contests.get_contest('1') == changed
+        assert contests.contest_ids() == {'1'}
+        
+        contests.save_contest(ENRICHED)
+        contests.save_contest(dict(ENRICHED, contestId='2'))
+        assert contests.verify_json_dir(str(output_dir)) == {}
+
+
+def test_schema_upgrade_from_version_1(tmp_path):
+    path = str(tmp_path / 'old.db')
+    conn = sqlite3.connect(path)
+    conn.executescript(store.SCHEMA.replace('    extra       TEXT,\n', ''))
+    conn.execute("INSERT INTO contests VALUES ('9', 'Old', NULL)")
+    conn.execute("INSERT INTO participants VALUES ('9', 'z', 0, 1, 0, 0)")
+    conn.execute('PRAGMA user_version = 1')
+    conn.commit()
+    conn.close()
+    
+    with store.ContestStore(path) as contests:
+        assert contests.get_contest('9')['participants'] == {
+            'z': {'rank': 1, 'solved': 0, 'attempted': 0, 'solveTimeline': []}}
+        contests.save_contest(ENRICHED)
+        assert contests.get_contest('1') == ENRICHED
@@ -0,0 +1,207 @@
+"""
+Participant profile enrichment for the Clash of Codes scraper.
+
+Rating, rank title and avatar of every handle, from the Codeforces
+user.info API method, which takes many handles per call. Handles of the
+contests on their way to the writer are collected by a UserInfoResolver
+and the ones missing from the cache are looked up USER_INFO_BATCH_SIZE at
+a time, so a run costs about one call per few hundred new handles. Results
+are kept in USER_INFO_CACHE for USER_INFO_TTL seconds, and
+utils.write_contest() joins them into the participants.
+"""
+
+from __future__ import annotations
+
+import re
+import json
+import time
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set
+
+import config
+from contest_io import atomic_write
+from utils import logger
+
+if TYPE_CHECKING:
+    from cf_api import CodeforcesAPI
+
+# Participant fields filled from the cache
+USER_FIELDS = ('rating', 'rankTitle', 'avatar')
+
+# Names that can be Codeforces handles; team names and the like are never looked up
+HANDLE_PATTERN = re.compile(r'^[A-Za-z0-9_.\-]{1,24}$')
+
+# user.info fails the whole call when one handle does not exist
+NOT_FOUND_PATTERN = re.compile(r'handles: User with handle (\S+) not found')
+
+
+class UserInfoCache:
+    """handle -> {'rating', 'rankTitle', 'avatar', 'fetchedAt'} in one JSON file."""
+    
+    def __init__(self, path: str = None, ttl: int = None):
+        self.path = Path(path or config.USER_INFO_CACHE)
+        self.ttl = config.USER_INFO_TTL if ttl is None else ttl
+        self._users: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+    
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._users is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._users = json.load(f)
+            except (OSError, ValueError):
+                self._users = {}
+        return self._users
+    
+    def get(self, handle: str) -> Optional[Dict[str, Any]]:
+        """Cached entry of a handle, fresh or not, or None."""
+        with self._lock:
+            return self._load().get(handle)
+    
+    def missing(self, handles: Iterable[str]) -> Set[str]:
+        """Handles that can be looked up and have no fresh entry."""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            users = self._load()
+            return {
+                handle for handle in handles
+                if HANDLE_PATTERN.match(handle)
+                and (handle not in users or users[handle]['fetchedAt'] < cutoff)
+            }
+    
+    def put(self, entries: Dict[str, Dict[str, Any]]):
+        """Store looked-up handles and rewrite the cache file."""
+        with self._lock:
+            users = self._load()
+            users.update(entries)
+            atomic_write(self.path, json.dumps(users, ensure_ascii=False, sort_keys=True).encode('utf-8'))
+
+
+_cache: Optional[UserInfoCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_user_cache() -> UserInfoCache:
+    """The shared UserInfoCache, created on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = UserInfoCache()
+        return _cache
+
+
+def _entry(user: Dict[str, Any], fetched_at: float) -> Dict[str, Any]:
+    avatar = user.get('titlePhoto') or user.get('avatar')
+    if avatar and avatar.startswith('//'):
+        avatar = 'https:' + avatar
+    return {'rating': user.get('rating'), 'rankTitle': user.get('rank'), 'avatar': avatar,
+            'fetchedAt': round(fetched_at)}
+
+
+def lookup(api: CodeforcesAPI, handles: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Look up handles with user.info, config.USER_INFO_BATCH_SIZE per call.
+    
+    A handle the API does not know (renamed or deleted accounts) is cached
+    as {'notFound': True} and the rest of its batch is asked again. A batch
+    that fails for another reason is left out and retried next run.
+    
+    Returns:
+        handle -> cache entry for every handle resolved
+    """
+    from cf_api import CodeforcesAPIError
+    
+    batch_size = config.USER_INFO_BATCH_SIZE
+    entries: Dict[str, Dict[str, Any]] = {}
+    for start in range(0, len(handles), batch_size):
+        batch = handles[start:start + batch_size]
+        while batch:
+            try:
+                users = api.call('user.info', handles=';'.join(batch))
+            except CodeforcesAPIError as e:
+                not_found = NOT_FOUND_PATTERN.search(str(e))
+                unknown = not_found and next((h for h in batch if h.lower() == not_found.group(1).lower()), None)
+                if not unknown:
+                    logger.warning(f"✗ Failed to look up {len(batch)} handles: {e}")
+                    break
+                entries[unknown] = {'notFound': True, 'fetchedAt': round(time.time())}
+                batch = [handle for handle in batch if handle != unknown]
+                continue
+            
+            # Results come back in request order, under the canonical capitalization
+            by_handle = {user['handle'].lower(): user for user in users}
+            for handle in batch:
+                user = by_handle.get(handle.lower())
+                if user is not None:
+                    entries[handle] = _entry(user, time.time())
+            break
+    return entries
+
+
+class UserInfoResolver:
+    """
+    Batches user.info lookups across the contests of a run.
+    
+    add() queues the uncached handles of a contest as soon as it is parsed;
+    resolve() is called just before a contest is written and, if any of its
+    handles are still queued, looks up everything queued so far, including
+    the handles of the contests behind it.
+    """
+    
+    def __init__(self, api: CodeforcesAPI, cache: UserInfoCache = None):
+        self.api = api
+        self.cache = cache or get_user_cache()
+        self._pending: Set[str] = set()
+        self._in_flight: Set[str] = set()
+        self._lock = threading.Lock()
+        self.resolved = 0
+    
+    def add(self, handles: Iterable[str]):
+        missing = self.cache.missing(handles)
+        with self._lock:
+            self._pending |= missing - self._in_flight
+    
+    def resolve(self, handles: Iterable[str]) -> int:
+        """
+        Make sure the given handles have been looked up.
+        
+        Returns:
+            Number of handles resolved by this call
+        """
+        with self._lock:
+            if self._pending.isdisjoint(handles):
+                return 0
+            batch = sorted(self._pending)
+            self._in_flight = set(batch)
+            self._pending.clear()
+        
+        try:
+            entries = lookup(self.api, batch)
+            if entries:
+                self.cache.put(entries)
+        finally:
+            with self._lock:
+                self._in_flight = set()
+        self.resolved += len(entries)
+        logger.info(f"Looked up {len(entries)}/{len(batch)} handles with user.info")
+        return len(entries)
+
+
+def join_users(contest_data: Dict[str, Any], cache: UserInfoCache = None) -> int:
+    """
+    Fill rating, rankTitle and avatar of every participant from the cache
+    (no requests). Stale entries are still joined; unknown handles are left
+    as they are.
+    
+    Returns:
+        Number of participants that got a profile
+    """
+    cache = cache or get_user_cache()
+    joined = 0
+    for handle, participant in contest_data.get('participants', {}).items():
+        entry = cache.get(handle)
+        if entry is not None and not entry.get('notFound'):
+            participant.update({field: entry[field] for field in USER_FIELDS})
+            joined += 1
+    return joined
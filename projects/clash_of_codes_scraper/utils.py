@@ -1,37 +1,73 @@
 """
 Utility functions for the Clash of Codes scraper.
 Handles authentication, HTML parsing, data normalization, and file operations.
+
+Importing this module has no side effects: requests, BeautifulSoup and lxml
+are imported by the functions that use them, and logging is only configured
+when an entry point calls setup_logging().
 """
 
-import requests
+from __future__ import annotations
+
+import re
 import time
 import json
 import logging
-from bs4 import BeautifulSoup
-from typing import Dict, List, Optional, Any
+import calendar
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, List, Optional, Any
 from pathlib import Path
+from zoneinfo import ZoneInfo
 
 import config
+import contest_io
+import metrics
+import store
+from manifest import get_manifest, hash_bytes
+from rate_limiter import RateLimiter, backoff_delay, parse_retry_after
+
+if TYPE_CHECKING:
+    import requests
+    from http_cache import ResponseCache
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
 logger = logging.getLogger(__name__)
 
 
+def setup_logging(level: int = logging.INFO):
+    """Configure console logging; called by the command-line entry points."""
+    logging.basicConfig(
+        level=level,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+
+def _load_lxml():
+    """lxml.html, or None when lxml is not installed (parsers fall back to bs4)."""
+    try:
+        from lxml import html as lxml_html
+    except ImportError:
+        return None
+    return lxml_html
+
+
 class CodeforcesSession:
     """Handles authentication and session management for Codeforces."""
     
-    def __init__(self, username: str = None, password: str = None, session_cookie: str = None, cookie_39ce7: str = None, cf_clearance: str = None):
+    def __init__(self, username: str = None, password: str = None, session_cookie: str = None, cookie_39ce7: str = None, cf_clearance: str = None, rate_limiter: RateLimiter = None, cache: ResponseCache = None):
+        import requests
+        from http_cache import ResponseCache
+        
         self.username = username
         self.password = password
         self.session_cookie = session_cookie
         self.cookie_39ce7 = cookie_39ce7
         self.cf_clearance = cf_clearance
         self.session = requests.Session()
+        # Size the connection pool for concurrent fetches from the async engine
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(config.MAX_CONCURRENCY, 10))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
@@ -44,9 +80,30 @@ class CodeforcesSession:
             'Sec-Fetch-Site': 'none',
             'Sec-Fetch-User': '?1',
         })
+        self.rate_limiter = rate_limiter or RateLimiter()
+        if cache is None and config.HTTP_CACHE_ENABLED:
+            cache = ResponseCache()
+        self.cache = cache
         self.logged_in = False
         self.auth_method = None  # 'cookies' or 'password'
     
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request once the shared rate limiter allows it, recording its metrics."""
+        kind = metrics.url_kind(url)
+        with metrics.timed('rate_limit_wait_seconds', source='html'):
+            self.rate_limiter.acquire()
+        
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception:
+            metrics.registry.inc('request_errors', kind=kind)
+            raise
+        metrics.registry.observe('request_seconds', time.perf_counter() - start, kind=kind)
+        metrics.registry.inc('requests', kind=kind, status=str(response.status_code))
+        metrics.registry.observe('response_bytes', len(response.content), kind=kind)
+        return response
+    
     def login(self) -> bool:
         """
         Authenticate with Codeforces using cookies or username/password.
@@ -79,7 +136,8 @@ class CodeforcesSession:
                 self.session.cookies.set('cf_clearance', self.cf_clearance, domain='.codeforces.com')
             
             # Verify cookies work by accessing a protected page
-            test_response = self.session.get(
+            test_response = self._request(
+                'get',
                 'https://codeforces.com/',
                 timeout=config.REQUEST_TIMEOUT
             )
@@ -94,7 +152,7 @@ class CodeforcesSession:
                 logger.error("✗ Cookies are invalid or expired")
                 logger.error("Please update your cookies from browser")
                 return False
-                
+        
         except Exception as e:
             logger.error(f"Cookie authentication error: {e}")
             return False
@@ -108,7 +166,8 @@ class CodeforcesSession:
             logger.info(f"Attempting to login as {self.username}...")
             
             # Get the login page to extract CSRF token
-            login_page = self.session.get(
+            login_page = self._request(
+                'get',
                 'https://codeforces.com/enter',
                 timeout=config.REQUEST_TIMEOUT
             )
@@ -117,6 +176,7 @@ class CodeforcesSession:
                 logger.error(f"Failed to load login page: {login_page.status_code}")
                 return False
             
+            from bs4 import BeautifulSoup
             soup = BeautifulSoup(login_page.text, 'lxml')
             
             # Extract CSRF token
@@ -139,7 +199,8 @@ class CodeforcesSession:
             }
             
             # Submit login form
-            login_response = self.session.post(
+            login_response = self._request(
+                'post',
                 'https://codeforces.com/enter',
                 data=login_data,
                 timeout=config.REQUEST_TIMEOUT,
@@ -155,86 +216,141 @@ class CodeforcesSession:
             else:
                 logger.error("✗ Login failed - incorrect credentials or CSRF issue")
                 return False
-                
+        
         except Exception as e:
             logger.error(f"Password authentication error: {e}")
             return False
     
     def get(self, url: str, max_retries: int = None) -> Optional[requests.Response]:
         """
-        Make a GET request with retry logic.
+        Make a GET request with caching and retry logic.
+        
+        Fresh cached responses are returned without a request; stale ones are
+        revalidated with If-None-Match/If-Modified-Since and a 304 counts as
+        a cache hit. Every attempt goes through the shared rate limiter.
+        429/503 responses slow the limiter down and honor Retry-After; other
+        failures are retried with exponential backoff plus jitter.
         """
+        import requests
+        
         max_retries = max_retries or config.MAX_RETRIES
         
+        entry = self.cache.lookup(url) if self.cache else None
+        headers = {}
+        if entry:
+            if self.cache.is_fresh(url, entry):
+                cached = self.cache.to_response(url, entry)
+                if cached is not None:
+                    self.cache.record('hits')
+                    return cached
+            headers = self.cache.conditional_headers(entry)
+        
         for attempt in range(max_retries):
+            if attempt:
+                metrics.registry.inc('request_retries', kind=metrics.url_kind(url))
             try:
-                response = self.session.get(url, timeout=config.REQUEST_TIMEOUT)
+                response = self._request('get', url, headers=headers, timeout=config.REQUEST_TIMEOUT)
                 
                 if response.status_code == 200:
+                    self.rate_limiter.on_success()
+                    if self.cache:
+                        self.cache.record('misses')
+                        self.cache.store(url, response)
                     return response
+                elif response.status_code == 304 and entry:
+                    self.rate_limiter.on_success()
+                    cached = self.cache.to_response(url, self.cache.refresh(url, entry, response))
+                    if cached is not None:
+                        self.cache.record('revalidated')
+                        return cached
+                    # Cached body is unreadable - fetch it again unconditionally
+                    entry, headers = None, {}
+                    continue
                 elif response.status_code == 403:
                     logger.warning(f"Access forbidden - may need to re-login")
                     return None
+                elif response.status_code in (429, 503):
+                    metrics.registry.inc('throttled', source='html')
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    self.rate_limiter.on_throttle(retry_after)
+                    logger.warning(
+                        f"Throttled with status {response.status_code}, "
+                        f"slowing down to {self.rate_limiter.rate:.2f} req/s"
+                    )
                 else:
                     logger.warning(f"Request failed with status {response.status_code}")
-                    
+            
             except requests.RequestException as e:
                 logger.warning(f"Request error (attempt {attempt + 1}/{max_retries}): {e}")
             
             if attempt < max_retries - 1:
-                time.sleep(config.RETRY_DELAY)
+                time.sleep(backoff_delay(attempt))
         
         return None
 
 
-def extract_contest_list(html: str, group_id: str = None) -> List[Dict[str, Any]]:
+def extract_group_id(group_url: str) -> Optional[str]:
+    """Extract group ID from the group URL."""
+    # Example: https://codeforces.com/group/ABC123/contests -> ABC123
+    parts = group_url.split('/group/')
+    if len(parts) > 1:
+        return parts[1].split('/')[0]
+    return None
+
+
+# Pagination links on the group contest list, e.g. /group/X/contests/page/2
+CONTEST_LIST_PAGE_PATTERN = re.compile(r'/contests/page/(\d+)')
+
+# Contest links that are not the contest itself
+_SKIPPED_CONTEST_LINKS = ('/virtual', '/standings', '/problems')
+
+
+def extract_contest_list(html: str, group_id: str = None, engine: str = None) -> List[Dict[str, Any]]:
     """
     Extract contest IDs and titles from the contests listing page.
     
+    Makes a single pass over the page's links; the first link to each
+    contest wins and its title is the first text of the enclosing cell.
+    
     Args:
         html: HTML content of the contests page
         group_id: Optional group ID for constructing URLs
+        engine: 'lxml' or 'bs4' (defaults to config.PARSER_ENGINE)
     
     Returns:
         List of dicts with contest info: [{'id': '1234', 'title': 'Contest Name', 'url': '...'}, ...]
     """
-    soup = BeautifulSoup(html, 'html.parser')  # Use html.parser for better compatibility
+    engine = engine or config.PARSER_ENGINE
+    if engine == 'lxml' and _load_lxml() is None:
+        engine = 'bs4'
+    
+    if engine == 'lxml':
+        links = _extract_contest_links_lxml(html)
+    elif engine == 'bs4':
+        links = _extract_contest_links_bs4(html)
+    else:
+        raise ValueError(f"Unknown parser engine: {engine}")
+    
     contests = []
     seen_ids = set()
     
-    # Find all links that point to contests
-    contest_links = soup.find_all('a', href=lambda x: x and '/contest/' in x and 'Enter' in soup.get_text())
-    
-    for link in contest_links:
+    for href, cell_text in links:
         try:
-            href = link.get('href')
-            if not href or '/contest/' not in href:
-                continue
-            
             # Skip virtual participation and standings links
-            if '/virtual' in href or '/standings' in href or '/problems' in href:
+            if any(part in href for part in _SKIPPED_CONTEST_LINKS):
                 continue
             
             # Extract contest ID from URL like /group/ABC/contest/123456 or /contest/123456
-            parts = href.split('/contest/')
-            if len(parts) < 2:
-                continue
-            
-            contest_id = parts[1].split('/')[0].split('?')[0]
+            contest_id = href.split('/contest/')[1].split('/')[0].split('?')[0]
             
             # Skip if we've already seen this contest
             if contest_id in seen_ids or not contest_id.isdigit():
                 continue
             seen_ids.add(contest_id)
             
-            # Try to find the title - it's usually in the parent element or nearby text
-            # Look for the parent td or nearby text
-            parent = link.find_parent('td')
-            if parent:
-                # Get the first text node (before the link)
-                title_text = parent.get_text(separator='|', strip=True).split('|')[0]
-                # Clean up the title
-                title = title_text.replace('Enter »', '').replace('Enter', '').strip()
+            # The title is the first text in the enclosing cell, before the "Enter »" link
+            if cell_text is not None:
+                title = cell_text.replace('Enter »', '').replace('Enter', '').strip()
             else:
                 title = f"Contest {contest_id}"
             
@@ -257,36 +373,325 @@ def extract_contest_list(html: str, group_id: str = None) -> List[Dict[str, Any]
     return contests
 
 
-def parse_standings(html: str, contest_id: str) -> Dict[str, Any]:
+def _extract_contest_links_bs4(html: str) -> List[tuple]:
+    """
+    (href, first text of the enclosing td or None) for every contest link.
+    
+    Pages without an "Enter" link anywhere are not contest lists and yield
+    nothing; the text is serialized once for that check.
+    """
+    from bs4 import BeautifulSoup
+    
+    soup = BeautifulSoup(html, 'html.parser')
+    if 'Enter' not in soup.get_text():
+        return []
+    
+    links = []
+    for link in soup.find_all('a', href=True):
+        href = link['href']
+        if '/contest/' not in href:
+            continue
+        parent = link.find_parent('td')
+        cell_text = None
+        if parent:
+            cell_text = parent.get_text(separator='|', strip=True).split('|')[0]
+        links.append((href, cell_text))
+    return links
+
+
+def _extract_contest_links_lxml(html: str) -> List[tuple]:
+    """lxml version of _extract_contest_links_bs4 with the same output."""
+    # lxml refuses an empty document; bs4 just finds nothing in it
+    if not html.strip():
+        return []
+    tree = _load_lxml().fromstring(html)
+    if 'Enter' not in tree.text_content():
+        return []
+    
+    links = []
+    for link in tree.iterfind('.//a[@href]'):
+        href = link.get('href')
+        if '/contest/' not in href:
+            continue
+        parent = next(link.iterancestors('td'), None)
+        cell_text = None
+        if parent is not None:
+            cell_text = next((text.strip() for text in parent.xpath('.//text()') if text.strip()), '')
+        links.append((href, cell_text))
+    return links
+
+
+def extract_contest_list_page_count(html: str) -> int:
+    """Number of pages of the group contest list, from its pagination links."""
+    return max((int(n) for n in CONTEST_LIST_PAGE_PATTERN.findall(html)), default=1)
+
+
+def contest_list_page_url(group_url: str, page: int) -> str:
+    """URL of one page of the group contest list (page 1 is the group URL itself)."""
+    base_url = group_url.split('?')[0].rstrip('/')
+    if page == 1:
+        return group_url
+    return f"{base_url}/page/{page}"
+
+
+# Rows of the group contest list, e.g. <tr data-contestId="666730">...</tr>
+CONTEST_ROW_PATTERN = re.compile(r'<tr[^>]*data-contestId="(\d+)"(.*?)</tr>', re.S)
+FORMAT_TIME_PATTERN = re.compile(r'class="format-time[^"]*"[^>]*>([^<]+)<')
+DURATION_CELL_PATTERN = re.compile(r'<td>\s*(\d+(?::\d\d)+)\s*</td>')
+CF_TIME_FORMATS = ('%b/%d/%Y %H:%M:%S', '%b/%d/%Y %H:%M')
+
+# The contest list also links every start time to timeanddate.com in Moscow time (p1=166)
+MOSCOW_TIME_LINK_PATTERN = re.compile(
+    r'fixedtime\.html\?day=(\d+)&(?:amp;)?month=(\d+)&(?:amp;)?year=(\d+)&(?:amp;)?hour=(\d+)&(?:amp;)?min=(\d+)')
+MOSCOW_UTC_OFFSET = 3 * 3600
+
+_zone_warned = False
+
+
+def _parse_shown_time(text: str) -> Optional[datetime]:
+    """A Codeforces date as the naive wall-clock time it shows."""
+    for time_format in CF_TIME_FORMATS:
+        try:
+            return datetime.strptime(text.strip(), time_format)
+        except ValueError:
+            continue
+    return None
+
+
+def parse_cf_time(text: str) -> Optional[int]:
+    """
+    Convert a Codeforces date like 'Jan/25/2026 13:30' to Unix seconds.
+    
+    Codeforces renders dates in the logged-in account's time zone without
+    saying which; CF_TIMEZONE names it.
+    """
+    shown = _parse_shown_time(text)
+    if shown is None:
+        return None
+    return int(shown.replace(tzinfo=ZoneInfo(config.CF_TIMEZONE)).timestamp())
+
+
+def _check_time_zone(row: str, shown: str):
+    """Warn once if a row's Moscow-time link shows that CF_TIMEZONE is not the account's zone."""
+    global _zone_warned
+    link = MOSCOW_TIME_LINK_PATTERN.search(row)
+    if _zone_warned or not link or _parse_shown_time(shown) is None:
+        return
+    day, month, year, hour, minute = (int(part) for part in link.groups())
+    actual = calendar.timegm((year, month, day, hour, minute, 0)) - MOSCOW_UTC_OFFSET
+    if parse_cf_time(shown) != actual:
+        _zone_warned = True
+        shown_as_utc = calendar.timegm(_parse_shown_time(shown).timetuple())
+        zone = timezone(timedelta(seconds=shown_as_utc - actual))
+        logger.warning(f"Codeforces shows times in {zone.tzname(None)}, not CF_TIMEZONE={config.CF_TIMEZONE}; "
+                       f"set CF_TIMEZONE to the account's time zone")
+
+
+def extract_contest_schedule(html: str) -> Dict[str, Dict[str, int]]:
+    """
+    Start time and duration of each contest on a contest list page.
+    
+    Returns:
+        Dict of contest ID -> {'startTime': parse_cf_time() seconds,
+        'duration': seconds}, for the rows that show both
+    """
+    schedule = {}
+    for contest_id, row in CONTEST_ROW_PATTERN.findall(html):
+        start = FORMAT_TIME_PATTERN.search(row)
+        duration = DURATION_CELL_PATTERN.search(row)
+        if not start or not duration or parse_cf_time(start.group(1)) is None:
+            continue
+        # Durations are hh:mm, or dd:hh:mm for long contests
+        parts = [int(part) for part in duration.group(1).split(':')]
+        seconds = sum(part * unit for part, unit in zip(reversed(parts), (60, 3600, 86400)))
+        schedule[contest_id] = {'startTime': parse_cf_time(start.group(1)), 'duration': seconds}
+        _check_time_zone(row, start.group(1))
+    return schedule
+
+
+# Pagination links on a standings page, e.g. /group/X/contest/123/standings/page/2
+STANDINGS_PAGE_PATTERN = re.compile(r'/standings/page/(\d+)')
+
+
+def extract_standings_page_urls(html: str, standings_url: str) -> List[str]:
+    """
+    Find the URLs of the remaining pages of a paginated standings table.
+    
+    Codeforces links the other pages as ``.../standings/page/<n>``. Every page
+    from 2 up to the highest linked page number is returned, so gaps in the
+    pagination widget ("1 2 ... 9") are filled in.
+    
+    Args:
+        html: HTML content of the first standings page
+        standings_url: URL the first page was fetched from
+    
+    Returns:
+        List of URLs for pages 2..N (empty for single-page standings)
+    """
+    page_numbers = [int(n) for n in STANDINGS_PAGE_PATTERN.findall(html)]
+    last_page = max(page_numbers, default=1)
+    base_url = standings_url.split('?')[0].rstrip('/')
+    return [f"{base_url}/page/{page}" for page in range(2, last_page + 1)]
+
+
+def merge_standings(pages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge the parsed pages of one contest into a single contest dict.
+    
+    Pages must be parsed with include_participant_ids=True. Rows are
+    de-duplicated by participant ID (standings can shift between page
+    requests while a contest is running) and then by handle, since the
+    output is keyed by handle; the first occurrence wins.
+    
+    Args:
+        pages: Parsed standings pages in page order
+    
+    Returns:
+        Dict with normalized contest data for the whole contest
+    """
+    first = pages[0]
+    participants = {}
+    seen_ids = set()
+    
+    for page in pages:
+        participant_ids = page.get('participantIds', {})
+        for handle, data in page['participants'].items():
+            participant_id = participant_ids.get(handle)
+            if participant_id in seen_ids or handle in participants:
+                continue
+            if participant_id is not None:
+                seen_ids.add(participant_id)
+            participants[handle] = data
+    
+    return {
+        'contestId': first['contestId'],
+        'title': first['title'],
+        'participants': participants
+    }
+
+
+# Bump when a parser change alters the output, so saved contests can be re-parsed
+PARSER_VERSION = 1
+
+
+def parser_version(engine: str = None) -> str:
+    """Identifier of the parser that produces contest data, e.g. 'lxml/1'."""
+    return f"{engine or config.PARSER_ENGINE}/{PARSER_VERSION}"
+
+
+def parse_contest_pages(pages: List[str], contest_id: str, engine: str = None) -> Dict[str, Any]:
+    """
+    Parse and merge all standings pages of one contest.
+    
+    A module-level function so it can run in a ProcessPoolExecutor worker.
+    
+    Args:
+        pages: HTML of each standings page in page order
+        contest_id: Contest ID for reference
+        engine: Parser engine (defaults to config.PARSER_ENGINE)
+    
+    Returns:
+        Dict with normalized contest data for the whole contest
+    """
+    return merge_standings([
+        parse_standings(html, contest_id, include_participant_ids=True, engine=engine)
+        for html in pages
+    ])
+
+
+def parse_standings(html: str, contest_id: str, include_participant_ids: bool = False,
+                    engine: str = None) -> Dict[str, Any]:
     """
     Parse contest standings page and extract participant data.
     
     Args:
         html: HTML content of the standings page
         contest_id: Contest ID for reference
+        include_participant_ids: Also return a 'participantIds' map of
+            handle -> Codeforces participant ID (used by merge_standings)
+        engine: 'lxml' or 'bs4' (defaults to config.PARSER_ENGINE). Both
+            engines produce identical output; bs4 is the reference.
     
     Returns:
         Dict with normalized contest data
     """
-    soup = BeautifulSoup(html, 'html.parser')  # Use html.parser for better compatibility
+    engine = engine or config.PARSER_ENGINE
+    if engine == 'lxml' and _load_lxml() is None:
+        logger.warning("lxml is not installed, falling back to the bs4 parser")
+        engine = 'bs4'
     
-    # Extract contest title
-    title_element = soup.find('title')
-    title = title_element.text.strip() if title_element else f"Contest {contest_id}"
-    title = title.split(' - ')[0].strip()  # Remove "Codeforces" suffix
+    if engine == 'lxml':
+        title, problems, rows = _extract_standings_lxml(html, contest_id)
+    elif engine == 'bs4':
+        title, problems, rows = _extract_standings_bs4(html, contest_id)
+    else:
+        raise ValueError(f"Unknown parser engine: {engine}")
     
     participants = {}
+    participant_ids = {}
     
-    # Find the standings table
-    standings_table = soup.find('table', class_='standings')
-    
-    if not standings_table:
+    if rows is None:
         logger.warning(f"No standings table found for contest {contest_id}")
-        return {
+        result = {
             'contestId': contest_id,
             'title': title,
             'participants': {}
         }
+        if include_participant_ids:
+            result['participantIds'] = {}
+        return result
+    
+    for participant_id, cell_texts, handle_link_text in rows:
+        try:
+            parsed = _parse_participant_row(cell_texts, handle_link_text, problems)
+            if parsed is None:
+                continue
+            handle, participant = parsed
+            participants[handle] = participant
+            participant_ids[handle] = participant_id
+        except Exception as e:
+            logger.warning(f"Error parsing participant row: {e}")
+            continue
+    
+    logger.info(f"Parsed {len(participants)} participants for contest {contest_id}")
+    
+    result = {
+        'contestId': contest_id,
+        'title': title,
+        'participants': participants
+    }
+    if include_participant_ids:
+        result['participantIds'] = participant_ids
+    return result
+
+
+def _clean_title(title: Optional[str], contest_id: str) -> str:
+    """Turn the page <title> into a contest title."""
+    title = title.strip() if title is not None else f"Contest {contest_id}"
+    return title.split(' - ')[0].strip()  # Remove "Codeforces" suffix
+
+
+def _extract_standings_bs4(html: str, contest_id: str):
+    """
+    Reference extractor built on BeautifulSoup.
+    
+    Returns:
+        Tuple of (title, problem indices, rows). rows is None when the page
+        has no standings table, otherwise an iterable of
+        (participant_id, stripped td texts, first handle link text or None).
+    """
+    from bs4 import BeautifulSoup
+    
+    soup = BeautifulSoup(html, 'html.parser')  # Use html.parser for better compatibility
+    
+    # Extract contest title
+    title_element = soup.find('title')
+    title = _clean_title(title_element.text if title_element else None, contest_id)
+    
+    # Find the standings table
+    standings_table = soup.find('table', class_='standings')
+    if not standings_table:
+        return title, [], None
     
     # Extract problem list
     problem_headers = standings_table.find_all('th', class_='standings-cell_problem-header')
@@ -294,134 +699,183 @@ def parse_standings(html: str, contest_id: str) -> Dict[str, Any]:
     for header in problem_headers:
         problem_link = header.find('a')
         if problem_link:
-            problem_index = problem_link.text.strip()
-            problems.append(problem_index)
+            problems.append(problem_link.text.strip())
     
     # Parse participant rows - note: attribute is lowercase 'participantid' not 'participantId'
-    rows = standings_table.find_all('tr', attrs={'participantid': True})
+    rows = []
+    for row in standings_table.find_all('tr', attrs={'participantid': True}):
+        tds = row.find_all('td')
+        handle_link = tds[1].find('a') if len(tds) > 1 else None
+        rows.append((
+            row.get('participantid'),
+            [td.text.strip() for td in tds],
+            handle_link.text.strip() if handle_link else None
+        ))
     
-    for row in rows:
-        try:
-            # Get all TD elements
-            tds = row.find_all('td')
-            
-            if len(tds) < 3:
-                continue
-            
-            # TD[0] = rank (no class)
-            try:
-                rank = int(tds[0].text.strip())
-            except:
-                rank = 0
-            
-            # TD[1] = contestant cell with handle
-            contestant_cell = tds[1]
-            handle_link = contestant_cell.find('a')
-            if not handle_link:
-                # Try getting text directly (might be unlinked)
-                handle = contestant_cell.text.strip()
-                if not handle or handle == '#':
-                    continue
-            else:
-                handle = handle_link.text.strip()
-            
-            # Remove trailing # if present
-            handle = handle.rstrip('#')
-            
-            if not handle:
-                continue
-            
-            # TD[2] = solved count
-            try:
-                solved = int(tds[2].text.strip())
-            except:
-                solved = 0
-            
-            # TD[3] = penalty/points (skip)
-            # TD[4+] = problem cells (time submissions)
-            
-            solve_timeline = []
-            attempted = 0
-            
-            # Problems start from index 4 (0=rank, 1=name, 2=solved, 3=penalty, 4+=problems)
-            problem_cells = tds[4:] if len(tds) > 4 else []
+    return title, problems, rows
+
+
+def _extract_standings_lxml(html: str, contest_id: str):
+    """
+    Fast extractor built on lxml.
+    
+    Only touches table.standings and its tr[participantid] rows. Returns
+    the same tuple as _extract_standings_bs4.
+    """
+    # lxml refuses an empty document (empty 200, truncated cache entry)
+    if not html.strip():
+        return _clean_title(None, contest_id), [], None
+    tree = _load_lxml().fromstring(html)
+    
+    title_element = tree.find('.//title')
+    title = _clean_title(title_element.text_content() if title_element is not None else None, contest_id)
+    
+    tables = tree.xpath(_LXML_STANDINGS_TABLE)
+    if not tables:
+        return title, [], None
+    standings_table = tables[0]
+    
+    problems = []
+    for header in standings_table.xpath(_LXML_PROBLEM_HEADERS):
+        problem_link = header.find('.//a')
+        if problem_link is not None:
+            problems.append(problem_link.text_content().strip())
+    
+    rows = []
+    for row in standings_table.iterfind('.//tr[@participantid]'):
+        tds = row.findall('.//td')
+        handle_link = tds[1].find('.//a') if len(tds) > 1 else None
+        rows.append((
+            row.get('participantid'),
+            [td.text_content().strip() for td in tds],
+            handle_link.text_content().strip() if handle_link is not None else None
+        ))
+    
+    return title, problems, rows
+
+
+# XPath equivalents of BeautifulSoup's class_= matching (class token match)
+_LXML_STANDINGS_TABLE = "//table[contains(concat(' ', normalize-space(@class), ' '), ' standings ')]"
+_LXML_PROBLEM_HEADERS = ".//th[contains(concat(' ', normalize-space(@class), ' '), ' standings-cell_problem-header ')]"
+
+
+def _parse_participant_row(cell_texts: List[str], handle_link_text: Optional[str],
+                           problems: List[str]):
+    """
+    Turn the td texts of one standings row into a participant record.
+    
+    Returns:
+        Tuple of (handle, participant dict), or None to skip the row
+    """
+    if len(cell_texts) < 3:
+        return None
+    
+    # TD[0] = rank (no class)
+    try:
+        rank = int(cell_texts[0])
+    except:
+        rank = 0
+    
+    # TD[1] = contestant cell with handle
+    if handle_link_text is None:
+        # Try getting text directly (might be unlinked)
+        handle = cell_texts[1]
+        if not handle or handle == '#':
+            return None
+    else:
+        handle = handle_link_text
+    
+    # Remove trailing # if present
+    handle = handle.rstrip('#')
+    
+    if not handle:
+        return None
+    
+    # TD[2] = solved count
+    try:
+        solved = int(cell_texts[2])
+    except:
+        solved = 0
+    
+    # TD[3] = penalty/points (skip)
+    # TD[4+] = problem cells (time submissions)
+    
+    solve_timeline = []
+    attempted = 0
+    
+    # Problems start from index 4 (0=rank, 1=name, 2=solved, 3=penalty, 4+=problems)
+    problem_cells = cell_texts[4:] if len(cell_texts) > 4 else []
+    
+    for idx, cell_text in enumerate(problem_cells):
+        if idx >= len(problems):
+            break
+        
+        problem_index = problems[idx]
+        
+        # Skip empty cells
+        if not cell_text:
+            continue
+        
+        # Cell contains time like "+00:12" = accepted
+        # Cell contains negative penalty like "-1" = wrong answer
+        # Cell contains "?" = attempted but no result yet
+        
+        if cell_text and cell_text != '--':
+            attempted += 1
             
-            for idx, cell in enumerate(problem_cells):
-                if idx >= len(problems):
-                    break
-                
-                problem_index = problems[idx]
-                cell_text = cell.text.strip()
-                
-                # Skip empty cells
-                if not cell_text:
-                    continue
-                
-                # Cell contains time like "+00:12" = accepted
-                # Cell contains negative penalty like "-1" = wrong answer
-                # Cell contains "?" = attempted but no result yet
+            if cell_text.startswith('+'):
+                # Accepted - parse time
+                time_str = cell_text[1:]  # Remove '+'
+                try:
+                    # Format: "HH:MM" or "MM:SS"
+                    parts = time_str.split(':')
+                    if len(parts) == 2:
+                        hours_or_mins = int(parts[0])
+                        mins_or_secs = int(parts[1])
+                        # Assume format is MM:SS for contests
+                        solve_time = hours_or_mins * 60 + mins_or_secs
+                    else:
+                        solve_time = 0
+                except:
+                    solve_time = 0
                 
-                if cell_text and cell_text != '--':
-                    attempted += 1
-                    
-                    if cell_text.startswith('+'):
-                        # Accepted - parse time
-                        time_str = cell_text[1:]  # Remove '+'
-                        try:
-                            # Format: "HH:MM" or "MM:SS"
-                            parts = time_str.split(':')
-                            if len(parts) == 2:
-                                hours_or_mins = int(parts[0])
-                                mins_or_secs = int(parts[1])
-                                # Assume format is MM:SS for contests
-                                solve_time = hours_or_mins * 60 + mins_or_secs
-                            else:
-                                solve_time = 0
-                        except:
-                            solve_time = 0
-                        
-                        solve_timeline.append({
-                            'problem': problem_index,
-                            'time': solve_time,
-                            'status': 'AC',
-                            'tags': []
-                        })
-                    elif cell_text.startswith('-') or cell_text == '?':
-                        # Wrong answer or pending
-                        solve_timeline.append({
-                            'problem': problem_index,
-                            'time': 0,
-                            'status': 'WA' if cell_text.startswith('-') else 'PENDING',
-                            'tags': []
-                        })
-            
-            participants[handle] = {
-                'rank': rank,
-                'solved': solved,
-                'attempted': attempted,
-                'solveTimeline': solve_timeline
-            }
-            
-        except Exception as e:
-            logger.warning(f"Error parsing participant row: {e}")
-            continue
-    
-    logger.info(f"Parsed {len(participants)} participants for contest {contest_id}")
+                solve_timeline.append({
+                    'problem': problem_index,
+                    'time': solve_time,
+                    'status': 'AC',
+                    'tags': []
+                })
+            elif cell_text.startswith('-') or cell_text == '?':
+                # Wrong answer or pending
+                solve_timeline.append({
+                    'problem': problem_index,
+                    'time': 0,
+                    'status': 'WA' if cell_text.startswith('-') else 'PENDING',
+                    'tags': []
+                })
     
-    return {
-        'contestId': contest_id,
-        'title': title,
-        'participants': participants
+    return handle, {
+        'rank': rank,
+        'solved': solved,
+        'attempted': attempted,
+        'solveTimeline': solve_timeline
     }
 
 
-def save_contest_json(contest_data: Dict[str, Any], output_dir: str = None) -> bool:
+def save_contest_json(contest_data: Dict[str, Any], output_dir: str = None,
+                      written: Dict[str, Dict[str, Any]] = None) -> bool:
     """
-    Save contest data to a JSON file.
+    Save contest data to file(s) in the configured output format.
+    
+    config.OUTPUT_FORMAT selects 'json' (pretty-printed), 'compact' (columnar
+    binary, see contest_io) or 'both'. Every file is written atomically
+    through a temp file and rename.
     
     Args:
         contest_data: Normalized contest data
         output_dir: Directory to save the file (defaults to config.OUTPUT_DIR)
+        written: If given, receives file name -> {'bytes', 'sha256'} for
+            every file written (used for the manifest)
     
     Returns:
         True if successful, False otherwise
@@ -429,33 +883,147 @@ def save_contest_json(contest_data: Dict[str, Any], output_dir: str = None) -> b
     output_dir = output_dir or config.OUTPUT_DIR
     contest_id = contest_data.get('contestId', 'unknown')
     
-    output_path = Path(output_dir) / f"contest_{contest_id}.json"
+    outputs = []
+    if config.OUTPUT_FORMAT in ('json', 'both'):
+        outputs.append((contest_io.contest_path(output_dir, contest_id), contest_io.encode_json))
+    if config.OUTPUT_FORMAT in ('compact', 'both'):
+        outputs.append((contest_io.contest_path(output_dir, contest_id, compact=True), contest_io.encode_compact))
     
-    try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(contest_data, f, indent=2, ensure_ascii=False)
-        
-        logger.info(f"✓ Saved: {output_path}")
-        return True
-        
-    except Exception as e:
-        logger.error(f"Failed to save {output_path}: {e}")
-        return False
+    for output_path, encode in outputs:
+        try:
+            data = encode(contest_data)
+            contest_io.atomic_write(output_path, data)
+            if written is not None:
+                written[output_path.name] = {'bytes': len(data), 'sha256': hash_bytes(data)}
+            logger.info(f"✓ Saved: {output_path}")
+        except Exception as e:
+            logger.error(f"Failed to save {output_path}: {e}")
+            return False
+    
+    return True
+
+
+def save_contest(contest_data: Dict[str, Any], output_dir: str = None,
+                 source_hash: str = None, parser: str = None) -> bool:
+    """
+    Save contest data to the configured storage backend(s).
+    
+    config.STORAGE_BACKEND selects 'json' (one file per contest), 'sqlite'
+    (the consolidated store) or 'both'. Once everything is saved the
+    contest is recorded in the output directory's manifest.
+    
+    Args:
+        contest_data: Normalized contest data
+        output_dir: Directory to save files in (defaults to config.OUTPUT_DIR)
+        source_hash: Hash of the source pages, for the manifest
+        parser: parser_version() of the parser that produced the data
+    
+    Returns:
+        True if every backend saved successfully, False otherwise
+    """
+    output_dir = output_dir or config.OUTPUT_DIR
+    success = True
+    written: Dict[str, Dict[str, Any]] = {}
+    
+    if config.STORAGE_BACKEND in ('json', 'both'):
+        success = save_contest_json(contest_data, output_dir, written) and success
+    
+    if config.STORAGE_BACKEND in ('sqlite', 'both'):
+        contest_id = contest_data.get('contestId', 'unknown')
+        try:
+            store.get_default_store().save_contest(contest_data)
+            logger.info(f"✓ Stored contest {contest_id} in {config.SQLITE_PATH}")
+        except Exception as e:
+            logger.error(f"Failed to store contest {contest_id} in SQLite: {e}")
+            success = False
+    
+    if success:
+        get_manifest(output_dir).record(contest_data, written, source_hash, parser)
+    
+    return success
+
+
+def write_contest(contest_data: Dict[str, Any], refresh: bool = False,
+                  source_hash: str = None, parser: str = None) -> bool:
+    """
+    Classify, tag and persist a parsed contest.
+    
+    Problem tags come from the problem metadata cache and participant
+    profiles from the user.info cache (no requests); see problem_meta.py and
+    user_info.py.
+    
+    Args:
+        contest_data: Parsed contest data
+        refresh: Compare with the stored snapshot and only rewrite it
+            when something changed
+        source_hash: Hash of the source pages, for the manifest
+        parser: parser_version() of the parser that produced the data
+    
+    Returns:
+        True if successful, False otherwise
+    """
+    contest_id = contest_data['contestId']
+    
+    # Add contest type if configured
+    contest_type = determine_contest_type(contest_id)
+    if contest_type != 'unknown':
+        contest_data['type'] = contest_type
+    
+    # Join cached problem tags into the timelines
+    if config.PROBLEM_TAGS_ENABLED:
+        import problem_meta
+        problem_meta.join_tags(contest_data)
+    
+    # Join cached rating, rank title and avatar into the participants
+    if config.USER_INFO_ENABLED:
+        import user_info
+        user_info.join_users(contest_data)
+    
+    if refresh:
+        previous = load_contest(contest_id, config.OUTPUT_DIR)
+        if previous is not None:
+            diff = diff_contest(previous, contest_data)
+            for line in format_contest_diff(contest_id, diff):
+                logger.info(line)
+            if not diff['changed']:
+                get_manifest(config.OUTPUT_DIR).touch(contest_id, source_hash)
+                return True
+    
+    # Save to the configured backend(s)
+    return save_contest(contest_data, config.OUTPUT_DIR, source_hash, parser)
 
 
 def load_existing_contests(output_dir: str = None) -> set:
     """
     Load list of already scraped contest IDs.
     
+    Answered from the manifest: a contest counts as scraped when it is
+    recorded there and its files still have their recorded sizes, so
+    truncated or deleted files are scraped again. Contests saved before the
+    manifest existed are indexed once on first use.
+    
     Returns:
         Set of contest IDs that have been scraped
     """
     output_dir = output_dir or config.OUTPUT_DIR
-    existing = set()
+    manifest = get_manifest(output_dir)
+    
+    if not manifest.exists:
+        stored, stored_at = {}, None
+        if config.STORAGE_BACKEND in ('sqlite', 'both'):
+            stored = store.get_default_store().contest_summaries()
+            db_path = Path(config.SQLITE_PATH)
+            stored_at = db_path.stat().st_mtime if db_path.exists() else None
+        added = manifest.rebuild_from_files(stored, stored_at)
+        if added:
+            logger.info(f"Indexed {added} previously saved contests in {manifest.path}")
     
-    for file in Path(output_dir).glob('contest_*.json'):
-        # Extract contest ID from filename
-        contest_id = file.stem.replace('contest_', '')
+    existing = set()
+    for contest_id in manifest.contest_ids():
+        problems = manifest.verify(contest_id)
+        if problems:
+            logger.warning(f"Contest {contest_id} will be scraped again: {'; '.join(problems)}")
+            continue
         existing.add(contest_id)
     
     if existing:
@@ -464,6 +1032,126 @@ def load_existing_contests(output_dir: str = None) -> set:
     return existing
 
 
+def load_contest_file(contest_id: str, output_dir: str = None) -> Optional[Dict[str, Any]]:
+    """
+    Load a previously saved contest file (JSON or compact).
+    
+    Returns:
+        The stored contest dict, or None if it does not exist or is unreadable
+    """
+    output_dir = output_dir or config.OUTPUT_DIR
+    
+    for compact in (False, True):
+        path = contest_io.contest_path(output_dir, contest_id, compact=compact)
+        try:
+            return contest_io.read_contest_file(path)
+        except FileNotFoundError:
+            continue
+        except Exception as e:
+            logger.warning(f"Could not read {path}: {e}")
+    
+    return None
+
+
+def load_contest(contest_id: str, output_dir: str = None) -> Optional[Dict[str, Any]]:
+    """
+    Load a previously saved contest from whichever backend has it.
+    
+    Returns:
+        The stored contest dict, or None if no backend has it
+    """
+    contest_data = load_contest_file(contest_id, output_dir)
+    if contest_data is None and config.STORAGE_BACKEND in ('sqlite', 'both'):
+        contest_data = store.get_default_store().get_contest(contest_id)
+    return contest_data
+
+
+def load_all_contests(output_dir: str = None) -> List[Dict[str, Any]]:
+    """
+    Load every saved contest from the configured backend(s).
+    
+    Returns:
+        List of contest dicts (unordered)
+    """
+    contests = []
+    for contest_id in load_existing_contests(output_dir):
+        contest_data = load_contest(contest_id, output_dir)
+        if contest_data is not None:
+            contests.append(contest_data)
+    return contests
+
+
+def diff_contest(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compare a stored contest snapshot with a freshly scraped one.
+    
+    Args:
+        old: Previously saved contest data
+        new: Newly parsed contest data
+    
+    Returns:
+        Dict with 'changed' (bool), 'newParticipants', 'removedParticipants',
+        'rankChanges' ([{handle, from, to}]), 'newSolves' ([{handle, problem, time}])
+        and 'otherChanges' (handles whose record changed in any other way)
+    """
+    old_participants = old.get('participants', {})
+    new_participants = new.get('participants', {})
+    
+    diff = {
+        'changed': False,
+        'newParticipants': sorted(set(new_participants) - set(old_participants)),
+        'removedParticipants': sorted(set(old_participants) - set(new_participants)),
+        'rankChanges': [],
+        'newSolves': [],
+        'otherChanges': [],
+    }
+    
+    for handle, after in new_participants.items():
+        before = old_participants.get(handle)
+        if before is None or before == after:
+            continue
+        
+        explained = False
+        if before.get('rank') != after.get('rank'):
+            diff['rankChanges'].append({'handle': handle, 'from': before.get('rank'), 'to': after.get('rank')})
+            explained = True
+        
+        solved_before = {e['problem'] for e in before.get('solveTimeline', []) if e.get('status') == 'AC'}
+        for event in after.get('solveTimeline', []):
+            if event.get('status') == 'AC' and event['problem'] not in solved_before:
+                diff['newSolves'].append({'handle': handle, 'problem': event['problem'], 'time': event.get('time')})
+                explained = True
+        
+        if not explained:
+            diff['otherChanges'].append(handle)
+    
+    header_changed = any(old.get(key) != new.get(key) for key in ('title', 'type'))
+    diff['changed'] = header_changed or old_participants != new_participants
+    return diff
+
+
+def format_contest_diff(contest_id: str, diff: Dict[str, Any]) -> List[str]:
+    """Human-readable lines describing a diff from diff_contest."""
+    if not diff['changed']:
+        return [f"Contest {contest_id}: no changes"]
+    
+    lines = [
+        f"Contest {contest_id}: {len(diff['newSolves'])} new solves, "
+        f"{len(diff['rankChanges'])} rank moves, "
+        f"{len(diff['newParticipants'])} new / {len(diff['removedParticipants'])} removed participants, "
+        f"{len(diff['otherChanges'])} other updates"
+    ]
+    for solve in diff['newSolves']:
+        lines.append(f"  + {solve['handle']} solved {solve['problem']} at {solve['time']}")
+    for move in diff['rankChanges']:
+        lines.append(f"  ~ {move['handle']} rank {move['from']} → {move['to']}")
+    for handle in diff['newParticipants']:
+        lines.append(f"  + {handle} joined")
+    for handle in diff['removedParticipants']:
+        lines.append(f"  - {handle} left")
+    return lines
+
+
 def determine_contest_type(contest_id: str) -> str:
     """
     Determine if a contest is 'weekly' or 'battle' based on configuration.
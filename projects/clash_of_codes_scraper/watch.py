@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Watch daemon for the Clash of Codes scraper.
+
+Keeps one logged-in CodeforcesSession for its whole life and refreshes
+contests on a recency schedule instead of re-running the scraper from
+cron:
+
+    upcoming  first poll when the contest starts
+    live      every WATCH_LIVE_INTERVAL seconds while it runs and for
+              WATCH_LIVE_GRACE seconds after it ends (late judging, hacks)
+    recent    every WATCH_RECENT_INTERVAL seconds for WATCH_RECENT_DAYS
+    old       never, once saved (contests not saved yet are retried with
+              backoff, from WATCH_LIVE_INTERVAL up to WATCH_RETRY_MAX)
+
+The contest list is rediscovered every WATCH_DISCOVERY_INTERVAL seconds,
+which costs one page while nothing new was added (every page when the
+contest-list cache is disabled). Every rewritten snapshot is announced as
+a JSON line appended to WATCH_NOTIFY_FILE and/or a datagram sent to the
+Unix socket WATCH_NOTIFY_SOCKET.
+
+Usage:
+    python watch.py                          # run until Ctrl-C / SIGTERM
+    python watch.py --once                   # one discovery + poll cycle
+    python watch.py --notify-socket /run/clash.sock
+"""
+
+import sys
+import json
+import time
+import heapq
+import signal
+import socket
+import asyncio
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import config
+import utils
+import metrics
+import scraper
+import rewind_index
+from manifest import Manifest, get_manifest
+from utils import logger
+
+
+def tier(contest: Dict[str, Any], now: float) -> str:
+    """'upcoming', 'live', 'recent' or 'old' (also for contests with no known start time)."""
+    start = contest.get('startTime')
+    if start is None:
+        return 'old'
+    if now < start:
+        return 'upcoming'
+    end = start + (contest.get('duration') or 0)
+    if now <= end + config.WATCH_LIVE_GRACE:
+        return 'live'
+    if now <= end + config.WATCH_RECENT_DAYS * 86400:
+        return 'recent'
+    return 'old'
+
+
+def next_poll(contest: Dict[str, Any], now: float, last_polled: float) -> Optional[float]:
+    """When a contest should be polled next, or None for never."""
+    contest_tier = tier(contest, now)
+    if contest_tier == 'upcoming':
+        return contest['startTime']
+    if contest_tier == 'live':
+        return max(now, last_polled + config.WATCH_LIVE_INTERVAL)
+    if contest_tier == 'recent':
+        return max(now, last_polled + config.WATCH_RECENT_INTERVAL)
+    return None
+
+
+class PollScheduler:
+    """Min-heap of contests by next poll time."""
+    
+    def __init__(self):
+        self._heap: List[Tuple[float, str]] = []
+        self._due_at: Dict[str, float] = {}
+        self._contests: Dict[str, Dict[str, Any]] = {}
+        self._failures: Dict[str, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self._due_at)
+    
+    def schedule(self, contest: Dict[str, Any], at: Optional[float]):
+        """Poll a contest at a time (None: stop polling it)."""
+        self._contests[contest['id']] = contest
+        if at is None:
+            self._due_at.pop(contest['id'], None)
+            return
+        # Superseded heap entries are skipped when popped
+        self._due_at[contest['id']] = at
+        heapq.heappush(self._heap, (at, contest['id']))
+    
+    def update(self, contests: Iterable[Dict[str, Any]], manifest: Manifest, now: float) -> int:
+        """
+        Schedule newly discovered contests: unsaved ones right away, saved
+        ones by tier from their last fetch.
+        
+        Returns:
+            Number of contests added to the schedule
+        """
+        added = 0
+        for contest in contests:
+            if contest['id'] in self._contests:
+                self._contests[contest['id']] = contest
+                continue
+            entry = manifest.get(contest['id'])
+            at = now if entry is None else next_poll(contest, now, entry['fetchedAt'])
+            self.schedule(contest, at)
+            added += at is not None
+        return added
+    
+    def retry(self, contest: Dict[str, Any], now: float) -> float:
+        """
+        Schedule another attempt at a contest that could not be saved,
+        doubling the delay after every failure.
+        
+        Returns:
+            When it will be tried again
+        """
+        failures = self._failures[contest['id']] = self._failures.get(contest['id'], 0) + 1
+        at = now + min(config.WATCH_LIVE_INTERVAL * 2 ** (failures - 1), config.WATCH_RETRY_MAX)
+        self.schedule(contest, at)
+        return at
+    
+    def polled(self, contest: Dict[str, Any], now: float):
+        """Schedule a successfully saved contest by its tier."""
+        self._failures.pop(contest['id'], None)
+        self.schedule(contest, next_poll(contest, now, now))
+    
+    def _skip_stale(self):
+        while self._heap and self._due_at.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+    
+    def pop_due(self, now: float) -> List[Dict[str, Any]]:
+        """Take every contest due by now off the schedule."""
+        due = []
+        self._skip_stale()
+        while self._heap and self._heap[0][0] <= now:
+            _, contest_id = heapq.heappop(self._heap)
+            del self._due_at[contest_id]
+            due.append(self._contests[contest_id])
+            self._skip_stale()
+        return due
+    
+    def next_due(self) -> Optional[float]:
+        self._skip_stale()
+        return self._heap[0][0] if self._heap else None
+
+
+class Notifier:
+    """Announces updated snapshots through a JSON Lines file and/or a Unix datagram socket."""
+    
+    def __init__(self, file_path: str = None, socket_path: str = None):
+        self.file_path = config.WATCH_NOTIFY_FILE if file_path is None else file_path
+        self.socket_path = config.WATCH_NOTIFY_SOCKET if socket_path is None else socket_path
+        self._socket = None
+        if self.file_path:
+            Path(self.file_path).parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path and hasattr(socket, 'AF_UNIX'):
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self._socket.setblocking(False)
+    
+    def emit(self, event: Dict[str, Any]):
+        line = json.dumps(event, ensure_ascii=False).encode('utf-8')
+        if self.file_path:
+            with open(self.file_path, 'ab') as f:
+                f.write(line + b'\n')
+        if self._socket is not None:
+            try:
+                self._socket.sendto(line, self.socket_path)
+            except OSError as e:
+                # Nobody listening is not an error for the daemon
+                logger.debug(f"Notification socket {self.socket_path}: {e}")
+    
+    def close(self):
+        if self._socket is not None:
+            self._socket.close()
+
+
+async def poll(session: utils.CodeforcesSession, contests: List[Dict[str, Any]],
+               manifest: Manifest, notifier: Notifier, pool: ProcessPoolExecutor = None) -> Tuple[List[str], int]:
+    """
+    Refresh contests and announce the ones whose snapshot was rewritten.
+    
+    pool is the daemon's parser pool (scraper.create_parse_pool), reused by
+    every poll.
+    
+    Returns:
+        Tuple of (updated contest IDs, failed count)
+    """
+    known_before = {contest['id'] for contest in contests if contest['id'] in manifest}
+    saved_before = {contest['id']: (manifest.get(contest['id']) or {}).get('savedAt') for contest in contests}
+    _, failed = await scraper.scrape_contests(session, contests, refresh=True, pool=pool)
+    
+    updated = []
+    for contest in contests:
+        entry = manifest.get(contest['id'])
+        if entry is not None and entry.get('savedAt') != saved_before[contest['id']]:
+            updated.append(contest['id'])
+            notifier.emit({
+                'event': 'contest_updated' if contest['id'] in known_before else 'contest_added',
+                'contestId': contest['id'],
+                'title': entry.get('title'),
+                'tier': tier(contest, time.time()),
+                'savedAt': entry['savedAt'],
+                'files': sorted(entry['files']),
+            })
+    return updated, failed
+
+
+async def watch(session: utils.CodeforcesSession, group_id: str = None,
+                notifier: Notifier = None, once: bool = False):
+    """
+    Discover and poll contests until stopped (SIGINT/SIGTERM) or, with
+    once=True, after a single cycle.
+    """
+    notifier = notifier or Notifier()
+    manifest = get_manifest(config.OUTPUT_DIR)
+    utils.load_existing_contests(config.OUTPUT_DIR)  # bootstraps the manifest for old output dirs
+    scheduler = PollScheduler()
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signal_number, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # e.g. Windows, or not the main thread
+    
+    # One parser pool for the daemon's life rather than one per poll
+    pool = scraper.create_parse_pool()
+    try:
+        next_discovery = 0.0
+        while not stop.is_set():
+            now = time.time()
+            if now >= next_discovery:
+                contests = await asyncio.to_thread(scraper.scrape_all_contests, session, group_id)
+                added = scheduler.update(contests, manifest, now)
+                if added:
+                    logger.info(f"Scheduled {added} contests ({len(scheduler)} being watched)")
+                next_discovery = now + config.WATCH_DISCOVERY_INTERVAL
+            
+            due = scheduler.pop_due(now)
+            if due:
+                logger.info(f"Polling {len(due)} contests: "
+                            + ', '.join(f"{contest['id']} ({tier(contest, now)})" for contest in due))
+                updated, failed = await poll(session, due, manifest, notifier, pool)
+                polled_at = time.time()
+                for contest in due:
+                    if contest['id'] in manifest:
+                        scheduler.polled(contest, polled_at)
+                    else:
+                        # Nothing saved yet: try again later rather than dropping it
+                        scheduler.retry(contest, polled_at)
+                logger.info(f"✓ {len(updated)} snapshots updated, {len(due) - len(updated) - failed} unchanged"
+                            + (f", ✗ {failed} failed" if failed else ""))
+                
+                if updated and config.REWIND_INDEX_ENABLED:
+                    await asyncio.to_thread(rewind_index.rebuild, config.OUTPUT_DIR)
+                if updated and config.RATINGS_ENABLED:
+                    import ratings
+                    await asyncio.to_thread(ratings.update, config.OUTPUT_DIR)
+                if updated and config.ANALYTICS_ENABLED:
+                    import analytics
+                    await asyncio.to_thread(analytics.rebuild, config.OUTPUT_DIR)
+                if failed == len(due):
+                    # Everything failing usually means the session expired
+                    logger.warning("Every poll failed; logging in again")
+                    await asyncio.to_thread(session.login)
+                await asyncio.to_thread(metrics.export)
+            
+            if once:
+                break
+            wake_at = min(filter(None, (scheduler.next_due(), next_discovery)))
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=max(1.0, wake_at - time.time()))
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        notifier.close()
+    logger.info("Watch stopped")
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Keep Clash of Codes snapshots fresh with one long-lived session")
+    parser.add_argument('--once', action='store_true', help="Run one discovery and poll cycle, then exit")
+    parser.add_argument('--notify-file', metavar='PATH',
+                        help=f"Append change events here (default: {config.WATCH_NOTIFY_FILE or 'off'})")
+    parser.add_argument('--notify-socket', metavar='PATH',
+                        help="Also send each change event as a datagram to this Unix socket")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] = None) -> int:
+    utils.setup_logging()
+    args = parse_args(argv)
+    try:
+        config.validate_config()
+    except ValueError as e:
+        logger.error(str(e))
+        return 1
+    
+    session = scraper.create_session()
+    if not scraper.login(session):
+        return 1
+    
+    notifier = Notifier(args.notify_file, args.notify_socket)
+    asyncio.run(watch(session, utils.extract_group_id(config.GROUP_URL), notifier, once=args.once))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())